@@ -1,7 +1,15 @@
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.html import format_html
-from .models import User, StudentProfile, SupervisorProfile, AdminProfile
+from .models import User, StudentProfile, SupervisorProfile, AdminProfile, LoginToken
+
+
+class StudentImportForm(forms.Form):
+    csv_file = forms.FileField(label='CSV mahasiswa')
+    documents = forms.FileField(label='Zip dokumen PDF', help_text='Berisi file yang disebut di kolom konsultasi_mentor_doc dan sptjm_doc')
 
 
 @admin.register(User)
@@ -35,6 +43,7 @@ class StudentProfileAdmin(admin.ModelAdmin):
     list_filter = ['status', 'program', 'angkatan', 'gender']
     search_fields = ['nim', 'full_name', 'user__email']
     ordering = ['-created_at']
+    change_list_template = 'admin/accounts/studentprofile/change_list.html'
 
     fieldsets = (
         ('User Account', {'fields': ('user',)}),
@@ -72,10 +81,52 @@ class StudentProfileAdmin(admin.ModelAdmin):
     actions = ['mark_at_risk']
 
     def mark_at_risk(self, request, queryset):
-        updated = queryset.update(status='AT_RISK')
+        from core.dashboard import update_counted
+        updated = update_counted(queryset, status='AT_RISK')
         self.message_user(request, f'{updated} students marked as at-risk.')
     mark_at_risk.short_description = 'Mark as at-risk'
 
+    def get_urls(self):
+        return [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name='accounts_studentprofile_import',
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        """Bulk-register students from a CSV plus a zip of their documents"""
+        from .importers import ADMIN_MAX_ROWS, REQUIRED_COLUMNS, import_students
+
+        result = None
+        form = StudentImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            try:
+                # No process pool inside a request: small files only, hashed in this process
+                result = import_students(
+                    form.cleaned_data['csv_file'], form.cleaned_data['documents'], workers=1, max_rows=ADMIN_MAX_ROWS,
+                )
+            except ValueError as e:
+                form.add_error('csv_file', str(e))
+            else:
+                self.message_user(
+                    request,
+                    f"{result['created']} students imported ({result['login_links']} login links queued), "
+                    f"{len(result['errors'])} rows skipped.",
+                )
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Import Students',
+            'opts': self.model._meta,
+            'form': form,
+            'columns': REQUIRED_COLUMNS + ['password'],
+            'max_rows': ADMIN_MAX_ROWS,
+            'result': result,
+        }
+        return TemplateResponse(request, 'admin/accounts/studentprofile/import.html', context)
+
 
 @admin.register(SupervisorProfile)
 class SupervisorProfileAdmin(admin.ModelAdmin):
@@ -100,6 +151,14 @@ class SupervisorProfileAdmin(admin.ModelAdmin):
         return obj.user.email
     user_email.short_description = 'Email'
 
+    actions = ['send_login_link']
+
+    def send_login_link(self, request, queryset):
+        from .credentials import queue_credentials
+        queued = queue_credentials(queryset.filter(user__is_active=True).values_list('user_id', flat=True))
+        self.message_user(request, f'{queued} login links queued for sending.')
+    send_login_link.short_description = 'Send one-time login link'
+
 
 @admin.register(AdminProfile)
 class AdminProfileAdmin(admin.ModelAdmin):
@@ -110,3 +169,15 @@ class AdminProfileAdmin(admin.ModelAdmin):
     def user_email(self, obj):
         return obj.user.email
     user_email.short_description = 'Email'
+
+
+@admin.register(LoginToken)
+class LoginTokenAdmin(admin.ModelAdmin):
+    list_display = ['user', 'created_at', 'expires_at', 'used_at']
+    list_filter = ['used_at', 'expires_at']
+    search_fields = ['user__email']
+    ordering = ['-created_at']
+    readonly_fields = ['user', 'token_hash', 'created_at', 'expires_at', 'used_at']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from notifications.models import OutboundEmail
+from .models import LoginToken, SupervisorProfile, User
+
+
+# role -> (subject, opening line) of the login-link email
+CREDENTIALS_EMAILS = {
+    'SUPERVISOR': (
+        'Akun Supervisor COOP Prasetiya Mulya',
+        'Akun supervisor Anda di COOP Prasetiya Mulya telah dibuat untuk menilai mahasiswa magang Anda.',
+    ),
+    'STUDENT': (
+        'Akun Mahasiswa COOP Prasetiya Mulya',
+        'Akun mahasiswa Anda di COOP Prasetiya Mulya telah didaftarkan oleh admin.',
+    ),
+}
+
+
+def login_link(token):
+    return settings.SITE_URL.rstrip('/') + reverse('token_login', args=[token])
+
+
+def issue_login_links(user_ids):
+    """Issue one login token per user and return {user_id: login link} (used when an email is sent)"""
+    return {user_id: login_link(token) for user_id, token in LoginToken.issue_bulk(user_ids).items()}
+
+
+def build_credentials_email(user_id, email, name, role='SUPERVISOR'):
+    """Unsaved outbox email that gets a new account's one-time login link when it is sent"""
+    subject, opening = CREDENTIALS_EMAILS[role]
+    message = (
+        f'Yth. {name},\n\n'
+        f'{opening}\n'
+        f'Silakan masuk dan buat password melalui tautan berikut (berlaku {settings.LOGIN_TOKEN_TTL_HOURS} jam, '
+        f'hanya dapat digunakan sekali):\n\n{OutboundEmail.LOGIN_LINK}\n\n'
+        f'Email login: {email}\n'
+    )
+    return OutboundEmail.build(email, subject, message, login_user_id=user_id)
+
+
+def build_credentials_emails(user_ids):
+    """Login-link emails for new supervisor or student users, as (user_id, unsaved email) pairs"""
+    users = User.objects.filter(pk__in=user_ids, role__in=CREDENTIALS_EMAILS).values_list(
+        'pk', 'email', 'role', 'supervisorprofile__full_name', 'studentprofile__full_name',
+    )
+    return [
+        (user_id, build_credentials_email(user_id, email, supervisor_name or student_name or email, role))
+        for user_id, email, role, supervisor_name, student_name in users
+    ]
+
+
+def queue_credentials(user_ids):
+    """Queue the login-link emails in the outbox, in the caller's transaction
+
+    Inserts are batched, so this costs a fixed number of queries; the
+    send_emails worker issues the tokens and delivers the emails. For
+    supervisors, credentials_sent_at records when they were queued.
+    """
+    with transaction.atomic():
+        emails = build_credentials_emails(user_ids)
+        if emails:
+            OutboundEmail.enqueue_bulk([email for _, email in emails])
+            SupervisorProfile.objects.filter(
+                user_id__in=[user_id for user_id, _ in emails]
+            ).update(credentials_sent_at=timezone.now())
+    return len(emails)
@@ -0,0 +1,194 @@
+import csv
+import io
+import os
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from core.dashboard import record_created
+from .credentials import queue_credentials
+from .models import User, StudentProfile
+
+STUDENT_EMAIL_DOMAIN = '@student.prasetiyamulya.ac.id'
+MAX_DOCUMENT_SIZE = 5 * 1024 * 1024
+# Imports in the admin run inside the request without a process pool; larger files go through
+# manage.py import_students
+ADMIN_MAX_ROWS = 50
+REQUIRED_COLUMNS = ['email', 'full_name', 'nim', 'program', 'angkatan', 'gender', 'whatsapp',
+                    'konsultasi_mentor_doc', 'sptjm_doc']
+DOCUMENT_FIELDS = ['konsultasi_mentor_doc', 'sptjm_doc']
+
+NIM_RE = re.compile(r'^\d{8}$')
+ANGKATAN_RE = re.compile(r'^\d{4}$')
+
+
+def _setup_worker():
+    """Make Django settings available in pool processes started with spawn"""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coop_prasetiya_mulya.settings')
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """make_password for many passwords, spread over a process pool (PBKDF2 is CPU-bound)"""
+    if len(passwords) < 2 or workers == 1:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+        chunksize = max(1, len(passwords) // ((workers or os.cpu_count() or 1) * 4))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def validate_row(row, documents):
+    """Field-level errors for one CSV row (uniqueness is checked separately, for the whole file)"""
+    errors = []
+    for column in REQUIRED_COLUMNS:
+        if not row.get(column):
+            errors.append(f'{column} wajib diisi')
+    if errors:
+        return errors
+
+    if not row['email'].endswith(STUDENT_EMAIL_DOMAIN):
+        errors.append(f'Email harus menggunakan domain {STUDENT_EMAIL_DOMAIN}')
+    if not NIM_RE.match(row['nim']):
+        errors.append('NIM harus 8 digit')
+    if row['program'] not in dict(StudentProfile.PROGRAM_CHOICES):
+        errors.append(f"Program tidak dikenal: {row['program']}")
+    if row['gender'] not in dict(StudentProfile.GENDER_CHOICES):
+        errors.append(f"Gender harus L atau P: {row['gender']}")
+    if not ANGKATAN_RE.match(row['angkatan']):
+        errors.append('Angkatan harus 4 digit')
+    if row.get('password') and len(row['password']) < 8:
+        errors.append('Password minimal 8 karakter')
+
+    for field in DOCUMENT_FIELDS:
+        name = row[field]
+        info = documents.get(name)
+        if not name.lower().endswith('.pdf'):
+            errors.append(f'{field} harus PDF: {name}')
+        elif info is None:
+            errors.append(f'{field} tidak ada di zip: {name}')
+        elif info.file_size > MAX_DOCUMENT_SIZE:
+            errors.append(f'{field} lebih dari 5MB: {name}')
+    return errors
+
+
+def read_rows(csv_file):
+    """(line number, normalised row) pairs from an uploaded or opened (binary) CSV file"""
+    text = io.TextIOWrapper(csv_file, encoding='utf-8-sig', newline='')
+    for line, row in enumerate(csv.DictReader(text), start=2):
+        row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+        row['email'] = User.objects.normalize_email(row.get('email', ''))
+        row['program'] = row.get('program', '').upper()
+        row['gender'] = row.get('gender', '').upper()
+        yield line, row
+
+
+def import_students(csv_file, documents_zip, batch_size=500, workers=None, max_rows=None):
+    """Create students from a CSV and a zip of their PDFs, reporting per-row errors
+
+    Email and NIM uniqueness is checked against the database with one
+    query each, passwords are hashed in a process pool (``workers=1``
+    hashes in this process), and users and profiles are bulk-created in
+    chunks of ``batch_size``, each chunk in its own transaction so a
+    failing chunk does not undo the others. Rows without a password get an
+    unusable one and a one-time login link by email. Raises ValueError
+    when the file has more than ``max_rows`` rows. Returns
+    ``{'created': n, 'login_links': n, 'errors': [(line, message)]}``.
+    """
+    archive = zipfile.ZipFile(documents_zip)
+    documents = {}
+    for info in archive.infolist():
+        if not info.is_dir():
+            # Rows may refer to files by bare name or by their path inside the zip
+            documents.setdefault(info.filename, info)
+            documents.setdefault(posixpath.basename(info.filename), info)
+
+    errors = []
+    rows = []
+    seen_emails, seen_nims = set(), set()
+    for line, row in read_rows(csv_file):
+        if max_rows is not None and line - 1 > max_rows:
+            raise ValueError(
+                f'File berisi lebih dari {max_rows} baris; impor file besar dengan manage.py import_students'
+            )
+        row_errors = validate_row(row, documents)
+        if row['email'] in seen_emails:
+            row_errors.append(f"Email duplikat di file: {row['email']}")
+        if row['nim'] in seen_nims:
+            row_errors.append(f"NIM duplikat di file: {row['nim']}")
+        seen_emails.add(row['email'])
+        seen_nims.add(row['nim'])
+        if row_errors:
+            errors.append((line, '; '.join(row_errors)))
+        else:
+            rows.append((line, row))
+
+    existing_emails = set(
+        User.objects.filter(email__in=[row['email'] for _, row in rows]).values_list('email', flat=True)
+    )
+    existing_nims = set(
+        StudentProfile.objects.filter(nim__in=[row['nim'] for _, row in rows]).values_list('nim', flat=True)
+    )
+    valid = []
+    for line, row in rows:
+        if row['email'] in existing_emails:
+            errors.append((line, f"Email sudah terdaftar: {row['email']}"))
+        elif row['nim'] in existing_nims:
+            errors.append((line, f"NIM sudah terdaftar: {row['nim']}"))
+        else:
+            valid.append((line, row))
+
+    hashed = iter(hash_passwords([row['password'] for _, row in valid if row.get('password')], workers))
+    passwords = [next(hashed) if row.get('password') else make_password(None) for _, row in valid]
+
+    created = login_links = 0
+    now = timezone.now()
+    for start in range(0, len(valid), batch_size):
+        chunk = valid[start:start + batch_size]
+        saved_files = []
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(email=row['email'], role='STUDENT', password=password,
+                         force_password_change=not row.get('password'),
+                         first_name=row['full_name'].split()[0], last_name=' '.join(row['full_name'].split()[1:]))
+                    for (_, row), password in zip(chunk, passwords[start:start + batch_size])
+                ])
+
+                profiles = []
+                for (_, row), user in zip(chunk, users):
+                    profile = StudentProfile(
+                        user=user,
+                        full_name=row['full_name'],
+                        nim=row['nim'],
+                        program=row['program'],
+                        angkatan=row['angkatan'],
+                        gender=row['gender'],
+                        whatsapp=row['whatsapp'],
+                        status='APPROVED',
+                        approved_at=now,
+                    )
+                    for field in DOCUMENT_FIELDS:
+                        name = posixpath.basename(row[field])
+                        content = ContentFile(archive.read(documents[row[field]]), name=name)
+                        getattr(profile, field).save(name, content, save=False)
+                        saved_files.append(getattr(profile, field))
+                    profiles.append(profile)
+                StudentProfile.objects.bulk_create(profiles)
+                record_created(profiles)
+                # Students without a password set one through a login link, like new supervisors
+                sent = queue_credentials([user.pk for (_, row), user in zip(chunk, users) if not row.get('password')])
+            created += len(chunk)
+            login_links += sent
+        except DatabaseError as e:
+            for stored in saved_files:
+                stored.delete(save=False)
+            errors.extend((line, f'Gagal disimpan: {e}') for line, _ in chunk)
+
+    return {'created': created, 'login_links': login_links, 'errors': sorted(errors)}
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.credentials import queue_credentials
+from accounts.models import SupervisorProfile
+
+
+class Command(BaseCommand):
+    help = (
+        'Queue one-time login link emails for supervisors whose credentials were never sent '
+        '(or for the given emails). Tokens are issued in bulk; send_emails delivers the emails.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('emails', nargs='*', help='Only these supervisors (re-sends even if already sent)')
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        supervisors = SupervisorProfile.objects.filter(user__is_active=True)
+        if options['emails']:
+            supervisors = supervisors.filter(user__email__in=options['emails'])
+        else:
+            supervisors = supervisors.filter(credentials_sent_at__isnull=True)
+        user_ids = list(supervisors.order_by('pk').values_list('user_id', flat=True))
+
+        started = time.perf_counter()
+        sent = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(user_ids), batch_size):
+            sent += queue_credentials(user_ids[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Queued {sent} supervisor login links in {elapsed:.2f}s'))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import StudentProfile, AT_RISK_AFTER_DAYS
+
+
+class Command(BaseCommand):
+    help = (
+        f'Mark every APPROVED student without an ACTIVE placement after {AT_RISK_AFTER_DAYS} days '
+        'as at-risk and notify them. Meant to run daily (cron / scheduled machine).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per UPDATE and notification INSERT')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = StudentProfile.sweep_at_risk(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Marked {result['marked']} students at-risk and created {result['notified']} notifications "
+            f'in {elapsed:.2f}s'
+        ))
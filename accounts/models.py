@@ -3,6 +3,10 @@ from django.db import models
 from django.core.validators import RegexValidator, MinLengthValidator, FileExtensionValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from datetime import timedelta
+
+# Students approved this many days ago without an active placement are at risk
+AT_RISK_AFTER_DAYS = 60
 
 
 def validate_file_size(value):
@@ -141,6 +145,7 @@ class StudentProfile(models.Model):
     portfolio = models.FileField(upload_to='student_docs/portfolio/', blank=True)
     ipk = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    skill_tokens = models.JSONField(default=list, blank=True, editable=False, help_text="Tokenized skills (auto-generated)")
     linkedin_url = models.URLField(blank=True)
     github_url = models.URLField(blank=True)
 
@@ -177,12 +182,68 @@ class StudentProfile(models.Model):
 
             if not has_internship:
                 days_since_approval = (timezone.now() - self.approved_at).days
-                if days_since_approval > 60:
+                if days_since_approval > AT_RISK_AFTER_DAYS:
                     self.status = 'AT_RISK'
                     self.save()
                     return True
         return False
 
+    @classmethod
+    def sweep_at_risk(cls, batch_size=1000):
+        """Set-based version of check_at_risk_status for every student at once
+
+        Finds all APPROVED students past the at-risk threshold without an ACTIVE
+        placement in one query, flips exactly those rows with UPDATEs by id and
+        bulk-creates their AT_RISK notifications, all in one transaction.
+        Returns {'student_ids', 'marked', 'notified'}.
+        """
+        from django.db import transaction
+        from django.urls import reverse
+        from core.dashboard import update_counted
+        from notifications.models import Notification
+
+        now = timezone.now()
+        # check_at_risk_status compares whole days: (now - approved_at).days > AT_RISK_AFTER_DAYS
+        cutoff = now - timedelta(days=AT_RISK_AFTER_DAYS + 1)
+
+        with transaction.atomic():
+            at_risk = cls.objects.filter(
+                status='APPROVED',
+                approved_at__lte=cutoff,
+            ).exclude(placements__status='ACTIVE')
+
+            # The transaction holds the write lock from BEGIN on SQLite (transaction_mode
+            # IMMEDIATE) and row locks elsewhere, so these rows cannot change before the UPDATE
+            rows = list(at_risk.select_for_update().values_list('id', 'user_id'))
+            if not rows:
+                return {'student_ids': [], 'marked': 0, 'notified': 0}
+
+            # Update the ids that were read, not the subquery again, so the students
+            # notified are exactly the students marked
+            student_ids = [student_id for student_id, _ in rows]
+            marked = 0
+            for start in range(0, len(student_ids), batch_size):
+                marked += update_counted(
+                    cls.objects.filter(pk__in=student_ids[start:start + batch_size]),
+                    status='AT_RISK', updated_at=now,
+                )
+
+            link = reverse('student:dashboard')
+            notified = Notification.send_bulk([
+                Notification(
+                    recipient_id=user_id,
+                    title='Status At-Risk',
+                    message='Anda belum memiliki magang lebih dari 2 bulan sejak disetujui. '
+                            'Segera cari magang atau hubungi admin COOP.',
+                    notification_type='DANGER',
+                    category='AT_RISK',
+                    link=link,
+                )
+                for _, user_id in rows
+            ], batch_size=batch_size)
+
+        return {'student_ids': student_ids, 'marked': marked, 'notified': len(notified)}
+
     def get_skills_list(self):
         """Return skills as a list"""
         return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
@@ -229,3 +290,57 @@ class AdminProfile(models.Model):
 
     def __str__(self):
         return f"{self.full_name} (Admin)"
+
+
+class LoginToken(models.Model):
+    """One-time, expiring login link; only a SHA-256 digest of the token is stored"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='login_tokens')
+    token_hash = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Login Token'
+        verbose_name_plural = 'Login Tokens'
+
+    def __str__(self):
+        return f"Login token for {self.user.email}"
+
+    @staticmethod
+    def digest(token):
+        import hashlib
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def issue_bulk(cls, user_ids, ttl=None):
+        """Create one token per user with a single INSERT; returns {user_id: raw token}
+
+        Tokens are random 256-bit values, so a plain SHA-256 digest is enough
+        to store them safely; no password hashing is involved.
+        """
+        import secrets
+        from django.conf import settings
+
+        ttl = ttl or timedelta(hours=settings.LOGIN_TOKEN_TTL_HOURS)
+        expires_at = timezone.now() + ttl
+        tokens = {user_id: secrets.token_urlsafe(32) for user_id in user_ids}
+        cls.objects.bulk_create([
+            cls(user_id=user_id, token_hash=cls.digest(token), expires_at=expires_at)
+            for user_id, token in tokens.items()
+        ])
+        return tokens
+
+    @classmethod
+    def redeem(cls, token):
+        """Mark a valid token used and return its user, or None; each token works once"""
+        now = timezone.now()
+        token_hash = cls.digest(token)
+        claimed = cls.objects.filter(
+            token_hash=token_hash, used_at__isnull=True, expires_at__gt=now, user__is_active=True,
+        ).update(used_at=now)
+        if not claimed:
+            return None
+        return cls.objects.select_related('user').get(token_hash=token_hash).user
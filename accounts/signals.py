@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.cache import bump_student_pages
+
+from .models import StudentProfile
+from .skills import tokenize_skills
+
+
+@receiver(pre_save, sender=StudentProfile)
+def tokenize_student_skills(sender, instance, **kwargs):
+    instance.skill_tokens = tokenize_skills(instance.skills)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def student_profile_changed(sender, instance, **kwargs):
+    bump_student_pages([instance.user_id])
@@ -0,0 +1,15 @@
+import re
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'of', 'on', 'or',
+    'the', 'to', 'with', 'background', 'familiar', 'knowledge', 'student', 'students', 'skills',
+    'dan', 'atau', 'di', 'ke', 'dari', 'yang', 'untuk', 'dengan', 'mahasiswa',
+}
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize_skills(text):
+    """Lowercased, de-duplicated skill tokens from free text or a comma-separated list"""
+    tokens = {token for token in TOKEN_RE.findall((text or '').lower()) if token not in STOPWORDS}
+    return sorted(tokens)
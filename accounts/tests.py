@@ -1,3 +1,209 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import CohortSummary
+from core.testing import make_job, make_placement, make_student
+from internships.models import Application, Company
+from notifications.models import Notification, OutboundEmail
+
+from .importers import import_students
+from .models import AT_RISK_AFTER_DAYS, LoginToken, StudentProfile, User
+
+
+class SweepAtRiskTests(TestCase):
+    def setUp(self):
+        overdue = timezone.now() - timedelta(days=AT_RISK_AFTER_DAYS + 2)
+        self.overdue = make_student('overdue@student.prasetiyamulya.ac.id', approved_at=overdue)
+        self.placed = make_student('placed@student.prasetiyamulya.ac.id', approved_at=overdue)
+        make_placement(self.placed, status='ACTIVE')
+        self.recent = make_student('recent@student.prasetiyamulya.ac.id', approved_at=timezone.now())
+        self.pending = make_student('pending@student.prasetiyamulya.ac.id', approved_at=overdue, status='PENDING')
+
+    def test_marks_and_notifies_exactly_the_overdue_students(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = StudentProfile.sweep_at_risk()
+
+        self.assertEqual(result, {'student_ids': [self.overdue.pk], 'marked': 1, 'notified': 1})
+        self.assertEqual(
+            dict(StudentProfile.objects.values_list('pk', 'status')),
+            {self.overdue.pk: 'AT_RISK', self.placed.pk: 'APPROVED', self.recent.pk: 'APPROVED',
+             self.pending.pk: 'PENDING'},
+        )
+        notification = Notification.objects.get(category='AT_RISK')
+        self.assertEqual(notification.recipient, self.overdue.user)
+
+    def test_matches_check_at_risk_status(self):
+        StudentProfile.sweep_at_risk()
+        for student in StudentProfile.objects.exclude(status='AT_RISK'):
+            self.assertFalse(student.check_at_risk_status())
+
+    def test_second_run_changes_nothing(self):
+        StudentProfile.sweep_at_risk()
+        self.assertEqual(StudentProfile.sweep_at_risk(), {'student_ids': [], 'marked': 0, 'notified': 0})
+        self.assertEqual(Notification.objects.filter(category='AT_RISK').count(), 1)
+
+    def test_dashboard_counts_follow(self):
+        StudentProfile.sweep_at_risk()
+        counts = dict(CohortSummary.objects.filter(metric='student_status').values_list('key', 'value'))
+        self.assertEqual(counts['AT_RISK'], 1)
+        self.assertEqual(counts['APPROVED'], 2)
+
+
+CSV_HEADER = 'email,full_name,nim,program,angkatan,gender,whatsapp,konsultasi_mentor_doc,sptjm_doc,password\n'
+
+
+def csv_file(*lines):
+    return io.BytesIO((CSV_HEADER + ''.join(line + '\n' for line in lines)).encode())
+
+
+def documents_zip(*names):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name in names:
+            archive.writestr(name, b'%PDF-1.4')
+    buffer.seek(0)
+    return buffer
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportStudentsTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def run_import(self, *lines, documents=('a.pdf', 'b.pdf'), **kwargs):
+        return import_students(csv_file(*lines), documents_zip(*documents), workers=1, **kwargs)
+
+    def test_imports_valid_rows_and_emails_login_links(self):
+        result = self.run_import(
+            'ani@student.prasetiyamulya.ac.id,Ani Putri,22010001,mn,2022,P,0812,a.pdf,b.pdf,rahasia123',
+            'budi@student.prasetiyamulya.ac.id,Budi,22010002,MN,2022,L,0812,a.pdf,b.pdf,',
+        )
+
+        self.assertEqual(result, {'created': 2, 'login_links': 1, 'errors': []})
+        ani = User.objects.get(email='ani@student.prasetiyamulya.ac.id')
+        budi = User.objects.get(email='budi@student.prasetiyamulya.ac.id')
+        self.assertTrue(ani.check_password('rahasia123'))
+        self.assertFalse(budi.has_usable_password())
+        self.assertTrue(budi.force_password_change)
+        self.assertEqual(OutboundEmail.objects.get().to_email, budi.email)
+        self.assertEqual(budi.studentprofile.status, 'APPROVED')
+        self.assertTrue(budi.studentprofile.sptjm_doc.name.endswith('.pdf'))
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        User.objects.create_user(email='taken@student.prasetiyamulya.ac.id', role='STUDENT')
+        result = self.run_import(
+            'ani@gmail.com,Ani,22010001,MN,2022,P,0812,a.pdf,b.pdf,',
+            'budi@student.prasetiyamulya.ac.id,Budi,123,MN,2022,L,0812,a.pdf,b.pdf,',
+            'cici@student.prasetiyamulya.ac.id,Cici,22010003,MN,2022,P,0812,a.pdf,missing.pdf,',
+            'taken@student.prasetiyamulya.ac.id,Taken,22010004,MN,2022,L,0812,a.pdf,b.pdf,',
+            'dodi@student.prasetiyamulya.ac.id,Dodi,22010005,MN,2022,L,0812,a.pdf,b.pdf,pendek',
+            'eka@student.prasetiyamulya.ac.id,Eka,22010006,MN,2022,P,0812,a.pdf,b.pdf,',
+            'eka@student.prasetiyamulya.ac.id,Eka,22010007,MN,2022,P,0812,a.pdf,b.pdf,',
+            'fani@student.prasetiyamulya.ac.id,Fani,22010008,MN,2022,P,0812,,b.pdf,',
+        )
+
+        self.assertEqual(result['created'], 1)
+        errors = dict(result['errors'])
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6, 8, 9])
+        self.assertIn('domain', errors[2])
+        self.assertIn('NIM harus 8 digit', errors[3])
+        self.assertIn('tidak ada di zip', errors[4])
+        self.assertIn('sudah terdaftar', errors[5])
+        self.assertIn('minimal 8', errors[6])
+        self.assertIn('duplikat', errors[8])
+        self.assertIn('konsultasi_mentor_doc wajib diisi', errors[9])
+        self.assertTrue(User.objects.filter(email='eka@student.prasetiyamulya.ac.id').exists())
+
+    def test_max_rows(self):
+        line = 'ani@student.prasetiyamulya.ac.id,Ani,22010001,MN,2022,P,0812,a.pdf,b.pdf,'
+        with self.assertRaises(ValueError):
+            self.run_import(line, line.replace('ani', 'ana').replace('22010001', '22010002'), max_rows=1)
+        self.assertFalse(User.objects.filter(role='STUDENT').exists())
+
+
+class LoginTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='budi@contoh.co.id', role='SUPERVISOR')
+        self.token = LoginToken.issue_bulk([self.user.pk])[self.user.pk]
+
+    def test_only_a_digest_is_stored(self):
+        stored = LoginToken.objects.get()
+        self.assertNotEqual(stored.token_hash, self.token)
+        self.assertEqual(stored.token_hash, LoginToken.digest(self.token))
+
+    def test_token_works_once(self):
+        self.assertEqual(LoginToken.redeem(self.token), self.user)
+        self.assertIsNone(LoginToken.redeem(self.token))
+
+    def test_expired_or_unknown_tokens_fail(self):
+        LoginToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(LoginToken.redeem(self.token))
+        self.assertIsNone(LoginToken.redeem('not-a-token'))
+
+    def test_inactive_user_cannot_redeem(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(LoginToken.redeem(self.token))
+        self.assertIsNone(LoginToken.objects.get().used_at)
+
+
+class StudentJobPageETagTests(TestCase):
+    def setUp(self):
+        self.student = make_student('ani@student.prasetiyamulya.ac.id')
+        company = Company.objects.create(name='PT Contoh', industry='TECH', address='Jakarta')
+        self.job = make_job(company, 'Data Analyst')
+        self.url = reverse('student:job_detail', args=[self.job.pk])
+        self.client.force_login(self.student.user)
+        # The first response sets the CSRF cookie, which is part of the ETag
+        self.client.get(self.url)
+
+    def etag(self, url=None):
+        return self.client.get(url or self.url)['ETag']
+
+    def test_revalidation_costs_only_the_user_query(self):
+        for url in [self.url, reverse('student:job_list')]:
+            etag = self.etag(url)
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+    def test_junk_cursors_reuse_the_first_page_fragment(self):
+        url = reverse('student:job_list')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as first_page:
+            self.client.get(url)
+        for junk in ['a', 'b', '!!!']:
+            with self.assertNumQueries(len(first_page)):
+                self.client.get(url, {'cursor': junk})
+
+    def test_application_changes_the_etag(self):
+        etag = self.etag()
+        self.assertEqual(self.etag(), etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            application = Application.objects.create(
+                student=self.student, job_posting=self.job, cover_letter='Halo', cv='cv.pdf',
+            )
+        self.assertNotEqual(self.etag(), etag)
+
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            application.status = 'ACCEPTED'
+            application.save()
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_profile_change_changes_the_etag(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.full_name = 'Ani Putri'
+            self.student.save()
+        self.assertNotEqual(self.etag(), etag)
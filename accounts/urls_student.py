@@ -9,6 +9,7 @@ urlpatterns = [
     path('profile/edit/', views_student.edit_profile, name='edit_profile'),
     path('dashboard/', views_student.dashboard, name='dashboard'),
     path('jobs/', views_student.job_list, name='job_list'),
+    path('jobs/search/', views_student.job_search, name='job_search'),
     path('jobs/<int:job_id>/', views_student.job_detail, name='job_detail'),
     path('applications/', views_student.my_applications, name='applications'),
     path('reports/', views_student.reports, name='reports'),
@@ -1,13 +1,30 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect
+from django.http import Http404
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
 from django.contrib import messages
+from django.conf import settings
 from django.db import transaction
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
 from .models import User, StudentProfile
 from .forms import StudentRegistrationForm, StudentProfileForm
 from internships.models import JobPosting, Application, InternshipPlacement
 from internships.forms import JobApplicationForm, InternshipConfirmationForm
+from internships.search import JobSearch, FACET_COLUMNS
+from internships.recommendations import recommend_jobs
+from internships.cache import get_job_posting
+from internships.services import activate_placements
 from reports.models import MonthlyReport
+from core.cache import student_page_etag
+from core.db_router import replica_reads
+from core.pagination import normalize_cursor, paginate_keyset
+from notifications.models import OutboundEmail
+
+JOBS_PER_PAGE = 20
 
 
 def register(request):
@@ -81,6 +98,17 @@ def register(request):
                     approved_at=timezone.now()
                 )
 
+                # Queued in the same transaction; the send_emails worker delivers it
+                OutboundEmail.enqueue(
+                    user.email,
+                    'Registrasi COOP Prasetiya Mulya Berhasil',
+                    f'Halo {full_name},\n\n'
+                    'Registrasi Anda di COOP Prasetiya Mulya berhasil. Anda sudah bisa login dengan email '
+                    f'{user.email} dan mulai melamar lowongan magang.\n\n'
+                    f"{settings.SITE_URL.rstrip('/')}{reverse('login')}\n",
+                    dedup_key=f'registration:{user.pk}',
+                )
+
                 messages.success(request, 'Registrasi berhasil! Silakan login.')
                 return redirect('login')
 
@@ -91,6 +119,7 @@ def register(request):
 
 
 @login_required
+@replica_reads
 def dashboard(request):
     """Student dashboard"""
     if request.user.role != 'STUDENT':
@@ -110,16 +139,23 @@ def dashboard(request):
     ).first()
 
     # Get recent applications
-    applications = Application.objects.filter(student=student).order_by('-applied_at')[:5]
+    applications = Application.objects.filter(student=student).select_related(
+        'job_posting__company'
+    ).order_by('-applied_at')[:5]
 
     # Get available jobs
-    available_jobs = JobPosting.objects.filter(status='OPEN').order_by('-created_at')[:5]
+    available_jobs = JobPosting.objects.open()[:5]
+
+    # Skill-matched jobs, skipping the ones already applied to
+    applied_job_ids = Application.objects.filter(student=student).values_list('job_posting_id', flat=True)
+    recommended_jobs = recommend_jobs(student, limit=5, exclude_ids=applied_job_ids)
 
     context = {
         'student': student,
         'active_placement': active_placement,
         'applications': applications,
         'available_jobs': available_jobs,
+        'recommended_jobs': recommended_jobs,
     }
 
     return render(request, 'student/dashboard.html', context)
@@ -155,23 +191,78 @@ def edit_profile(request):
     return render(request, 'student/edit_profile.html', {'form': form, 'student': student})
 
 
+def job_list_etag(request):
+    return student_page_etag(request)
+
+
 @login_required
+@vary_on_cookie
+@condition(etag_func=job_list_etag)
+@replica_reads
 def job_list(request):
     """List of available jobs"""
     if request.user.role != 'STUDENT':
         return redirect('home')
 
-    jobs = JobPosting.objects.filter(status='OPEN').order_by('-created_at')
-    return render(request, 'student/job_list.html', {'jobs': jobs})
+    # Lazy: only read when the template fragment for this page is not cached. The fragment
+    # is keyed by the normalized cursor, so junk cursors all share the first page's entry
+    cursor = normalize_cursor(request.GET.get('cursor'))
+    jobs = SimpleLazyObject(lambda: paginate_keyset(JobPosting.objects.open(), cursor, JOBS_PER_PAGE))
+    return render(request, 'student/job_list.html', {'jobs': jobs, 'cursor': cursor})
 
 
 @login_required
+def job_search(request):
+    """Full-text job search with work type, industry and location facets"""
+    if request.user.role != 'STUDENT':
+        return redirect('home')
+
+    query = request.GET.get('q', '')
+    filters = {facet: request.GET.get(facet, '') for facet in FACET_COLUMNS}
+    results = JobSearch(query, filters)
+    page_obj = Paginator(results, JOBS_PER_PAGE).get_page(request.GET.get('page'))
+
+    # Facet links toggle their own value and reset the page
+    facets = results.facets()
+    for facet, options in facets.items():
+        for option in options:
+            params = request.GET.copy()
+            params.pop('page', None)
+            if option['selected']:
+                params.pop(facet, None)
+            else:
+                params[facet] = option['value']
+            option['querystring'] = params.urlencode()
+
+    params = request.GET.copy()
+    params.pop('page', None)
+
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'facets': facets,
+        'querystring': params.urlencode(),
+    }
+    return render(request, 'student/job_search.html', context)
+
+
+def job_detail_etag(request, job_id):
+    if request.method != 'GET':
+        return None
+    return student_page_etag(request)
+
+
+@login_required
+@vary_on_cookie
+@condition(etag_func=job_detail_etag)
 def job_detail(request, job_id):
     """Job detail and application"""
     if request.user.role != 'STUDENT':
         return redirect('home')
 
-    job = get_object_or_404(JobPosting, id=job_id)
+    job = get_job_posting(job_id)
+    if job is None:
+        raise Http404('Lowongan tidak ditemukan')
     student = request.user.studentprofile
 
     # Check if already applied
@@ -209,7 +300,9 @@ def my_applications(request):
         return redirect('home')
 
     student = request.user.studentprofile
-    applications = Application.objects.filter(student=student).order_by('-applied_at')
+    applications = Application.objects.filter(student=student).select_related(
+        'job_posting__company'
+    ).order_by('-applied_at')
     return render(request, 'student/applications.html', {'applications': applications})
 
 
@@ -243,15 +336,13 @@ def confirm_internship(request):
     if request.method == 'POST':
         form = InternshipConfirmationForm(request.POST, request.FILES)
         if form.is_valid():
-            placement = form.save(commit=False)
-            placement.student = student
-            placement.status = 'ACTIVE'
-            placement.confirmed_at = timezone.now()
-            placement.save()
-
-            # Update student status
-            student.status = 'ACTIVE'
-            student.save()
+            with transaction.atomic():
+                placement = form.save(commit=False)
+                placement.student = student
+                placement.save()
+
+                # Activates the placement and student, creates the supervisor account and evaluations
+                activate_placements([placement.pk])
 
             messages.success(request, 'Konfirmasi magang berhasil! Anda sudah bisa membuat laporan bulanan.')
             return redirect('student:dashboard')
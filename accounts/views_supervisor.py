@@ -3,9 +3,11 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from internships.models import InternshipPlacement
 from evaluations.models import Evaluation
+from core.db_router import replica_reads
 
 
 @login_required
+@replica_reads
 def dashboard(request):
     """Supervisor dashboard"""
     if request.user.role != 'SUPERVISOR':
@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coop_prasetiya_mulya.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# The notification stream is served outside Django's middleware (see notifications.sse).
+from django.urls import reverse  # noqa: E402
+from notifications.sse import route_stream  # noqa: E402
+
+application = route_stream(django_application, reverse('notifications:stream'))
@@ -7,11 +7,15 @@ from core import views as core_views
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', core_views.home, name='home'),
+    path('healthz', core_views.healthz, name='healthz'),
     path('login/', core_views.login_view, name='login'),
     path('logout/', core_views.logout_view, name='logout'),
+    path('login/token/<str:token>/', core_views.token_login, name='token_login'),
+    path('password/set/', core_views.set_password, name='set_password'),
     path('student/', include('accounts.urls_student')),
     path('supervisor/', include('accounts.urls_supervisor')),
     path('reports/', include('reports.urls')),
+    path('notifications/', include('notifications.urls')),
 ]
 
 if settings.DEBUG:
@@ -1 +1,51 @@
 from django.contrib import admin
+
+from .dashboard import get_dashboard
+from .models import CohortSummary
+
+
+def _labelled(counts, choices=()):
+    """Dashboard counts as (label, value) rows, largest first, with choice labels where known"""
+    labels = dict(choices)
+    return sorted(
+        ((labels.get(key, key), value) for key, value in counts.items() if value),
+        key=lambda row: -row[1],
+    )
+
+
+@admin.register(CohortSummary)
+class CohortSummaryAdmin(admin.ModelAdmin):
+    list_display = ['metric', 'key', 'value', 'updated_at']
+    list_filter = ['metric']
+    change_list_template = 'admin/core/cohortsummary/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        from accounts.models import StudentProfile
+        from internships.models import InternshipPlacement
+        from evaluations.models import Evaluation
+
+        dashboard = get_dashboard()
+        reports = dashboard['report_late']
+        report_total = sum(reports.values())
+        late = reports.get('True', 0)
+        evaluations = dashboard['evaluation_status']
+
+        extra_context = {
+            **(extra_context or {}),
+            'students': _labelled(dashboard['student_status'], StudentProfile.STATUS_CHOICES),
+            'student_total': sum(dashboard['student_status'].values()),
+            'placements': _labelled(dashboard['placement_status'], InternshipPlacement.STATUS_CHOICES),
+            'industries': _labelled(dashboard['placement_industry']),
+            'report_total': report_total,
+            'report_late': late,
+            'report_late_rate': round(late * 100 / report_total, 1) if report_total else 0,
+            'evaluations': _labelled(evaluations, Evaluation.STATUS_CHOICES),
+            'evaluation_pending': evaluations.get('PENDING', 0) + evaluations.get('DRAFT', 0),
+        }
+        return super().changelist_view(request, extra_context)
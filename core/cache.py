@@ -0,0 +1,138 @@
+import hashlib
+import os
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.messages.storage.session import SessionStorage
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+
+# Part of every cached page and ETag, so HTML rendered by a previous deploy is never served.
+# Fixed at deploy time (Fly sets FLY_IMAGE_REF), so every worker agrees on it; when neither
+# variable is set, pages are keyed by the job board version alone
+RELEASE = os.environ.get('FLY_IMAGE_REF') or os.environ.get('RELEASE', '')
+
+
+def get_version(key):
+    """Current value of the version counter stored under ``key``
+
+    Seeded from the clock so an evicted counter never falls back to a version
+    that older cache entries were stored under.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Increment the version counter under ``key``, invalidating everything keyed by it"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+        return cache.get(key)
+
+
+def job_board_key():
+    """Changes on every deploy and every JobPosting/Company change"""
+    from internships.cache import get_job_board_version
+
+    return f'{RELEASE}:{get_job_board_version()}'
+
+
+def _student_page_key(user_id):
+    return f'core:student_page:{user_id}'
+
+
+def bump_student_pages(user_ids):
+    """Change the ETag of these students' pages, after their profile or one of their applications changed
+
+    Deferred until the surrounding transaction commits, so a concurrent
+    request cannot tag the pre-commit page with the new version.
+    """
+    user_ids = set(user_ids)
+
+    def bump():
+        for user_id in user_ids:
+            bump_version(_student_page_key(user_id))
+
+    if user_ids:
+        transaction.on_commit(bump)
+
+
+def _digest(*parts):
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def has_pending_messages(request):
+    """Whether a flash message is waiting to be shown, checked without consuming it"""
+    return CookieStorage.cookie_name in request.COOKIES or SessionStorage.session_key in request.session
+
+
+def is_shared_anonymous(request):
+    """Anonymous visitor with no session and no flash messages: all of them get the same page"""
+    return (
+        not request.user.is_authenticated
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def anonymous_page_etag(request, *args, **kwargs):
+    """ETag for views wrapped in cache_anonymous_page (use with @condition)"""
+    if not is_shared_anonymous(request):
+        return None
+    return _digest('anonymous', request.get_full_path(), job_board_key())
+
+
+def student_page_etag(request, *parts):
+    """ETag for a student page showing the job board, or None when it cannot be revalidated
+
+    Covers everything the page shows besides the job board: the navbar
+    (name, unread count), the student's applications, the CSRF token in
+    forms, and ``parts`` from the view. Read from the cache only: profile
+    and application changes bump the student's page version instead.
+    """
+    from notifications.cache import get_unread_count
+
+    user = request.user
+    if not user.is_authenticated or user.role != 'STUDENT' or has_pending_messages(request):
+        return None
+    return _digest(
+        'student', request.get_full_path(), job_board_key(), user.pk, get_version(_student_page_key(user.pk)),
+        get_unread_count(user), request.COOKIES.get(settings.CSRF_COOKIE_NAME), *parts,
+    )
+
+
+def cache_anonymous_page(view):
+    """Serve the whole response from the cache to visitors for whom is_shared_anonymous holds
+
+    Keyed by path and job_board_key, so a posting or company change shows up
+    at once. Everyone else gets the view as usual. Combine with
+    @condition(etag_func=anonymous_page_etag) and @vary_on_cookie.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not is_shared_anonymous(request):
+            return view(request, *args, **kwargs)
+
+        key = f'page:anonymous:{_digest(request.get_full_path(), job_board_key())}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = view(request, *args, **kwargs)
+            # A response setting cookies (e.g. a CSRF token) is not the same for everyone
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(key, (response.content, response['Content-Type']), settings.PAGE_CACHE_TIMEOUT)
+        # Browsers revalidate with the ETag instead of showing a copy from before a job board change
+        patch_cache_control(response, no_cache=True)
+        return response
+    return wrapped
@@ -1,24 +1,31 @@
-from notifications.models import Notification
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 
+from core.cache import job_board_key
+from notifications.cache import get_unread_count, get_recent_notifications
 
-def notifications(request):
-    """Add notifications to context"""
-    if request.user.is_authenticated:
-        unread_notifications = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
 
-        recent_notifications = Notification.objects.filter(
-            recipient=request.user
-        ).order_by('-created_at')[:5]
+def notifications(request):
+    """Add notifications to context
 
+    Values are lazy so templates that never read them never touch the cache or the table.
+    """
+    if request.user.is_authenticated:
+        user = request.user
         return {
-            'unread_notifications_count': unread_notifications,
-            'recent_notifications': recent_notifications,
+            'unread_notifications_count': SimpleLazyObject(lambda: get_unread_count(user)),
+            'recent_notifications': SimpleLazyObject(lambda: get_recent_notifications(user)),
         }
 
     return {
         'unread_notifications_count': 0,
         'recent_notifications': [],
     }
+
+
+def page_cache(request):
+    """Key and timeout for {% cache %} fragments built from the job board"""
+    return {
+        'job_board_key': SimpleLazyObject(job_board_key),
+        'page_cache_timeout': settings.PAGE_CACHE_TIMEOUT,
+    }
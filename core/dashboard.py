@@ -0,0 +1,129 @@
+from collections import Counter
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import CohortSummary
+
+# metric -> (model, field whose value is the key); every metric counts rows per field value
+METRICS = {
+    'student_status': ('accounts.StudentProfile', 'status'),
+    'placement_status': ('internships.InternshipPlacement', 'status'),
+    'placement_industry': ('internships.InternshipPlacement', 'company_industry'),
+    'report_late': ('reports.MonthlyReport', 'is_late'),
+    'evaluation_status': ('evaluations.Evaluation', 'status'),
+}
+TRACKED_MODELS = sorted({model for model, _ in METRICS.values()})
+
+
+def metrics_for(model):
+    """(metric, field) pairs tracked for a model class"""
+    label = model._meta.label
+    return [(metric, field) for metric, (tracked, field) in METRICS.items() if tracked == label]
+
+
+def snapshot(instance):
+    """Metric keys a row counts towards, from its loaded field values; unloaded fields are skipped"""
+    return {
+        metric: str(instance.__dict__[field])
+        for metric, field in metrics_for(type(instance))
+        if field in instance.__dict__
+    }
+
+
+def stored_snapshot(instance, fields):
+    """Metric keys the database row of ``instance`` counts towards, for the given fields only"""
+    model = type(instance)
+    metrics = [(metric, field) for metric, field in metrics_for(model) if field in fields]
+    if not metrics or instance.pk is None:
+        return {}
+    stored = model._base_manager.filter(pk=instance.pk).values(*{field for _, field in metrics}).first()
+    if stored is None:
+        return {}
+    return {metric: str(stored[field]) for metric, field in metrics}
+
+
+def apply_deltas(deltas):
+    """Add the given {(metric, key): delta} changes to the summary rows"""
+    for (metric, key), delta in deltas.items():
+        if not delta:
+            continue
+        rows = CohortSummary.objects.filter(metric=metric, key=key)
+        if not rows.update(value=F('value') + delta):
+            CohortSummary.objects.bulk_create([CohortSummary(metric=metric, key=key)], ignore_conflicts=True)
+            rows.update(value=F('value') + delta)
+
+
+def record_changes(changes):
+    """Move the counts of many rows at once, given (old snapshot, new snapshot) pairs"""
+    deltas = Counter()
+    for old, new in changes:
+        for item in old.items():
+            deltas[item] -= 1
+        for item in new.items():
+            deltas[item] += 1
+    apply_deltas(deltas)
+
+
+def record_change(old, new):
+    """Move a row's counts from its old metric keys to its new ones"""
+    record_changes([(old, new)])
+
+
+def record_created(objects):
+    """Count rows inserted with ``bulk_create()``, which sends no signals"""
+    record_changes(({}, snapshot(instance)) for instance in objects)
+
+
+def update_counted(queryset, **updates):
+    """``queryset.update(**updates)`` that also moves the dashboard counts of the rows it changes
+
+    Counts the matching rows per tracked field value first, in the same
+    transaction, so it costs one grouped query on the rows being updated
+    rather than a recount of the whole table. Tracked fields must be set to
+    plain values, not expressions. Returns the number of rows updated.
+    """
+    metrics = [(metric, field) for metric, field in metrics_for(queryset.model) if field in updates]
+    if not metrics:
+        return queryset.update(**updates)
+
+    fields = [field for _, field in metrics]
+    with transaction.atomic():
+        groups = list(queryset.order_by().values_list(*fields).annotate(n=Count('pk')))
+        updated = queryset.update(**updates)
+        deltas = Counter()
+        for *values, n in groups:
+            for (metric, field), value in zip(metrics, values):
+                deltas[(metric, str(value))] -= n
+                deltas[(metric, str(updates[field]))] += n
+        apply_deltas(deltas)
+    return updated
+
+
+def reconcile(metrics=None):
+    """Recount the given metrics (all by default) from the source tables; returns rows written
+
+    A full GROUP BY over each table, so it only runs from the
+    reconcile_dashboard command. Code that bypasses signals keeps the counts
+    current with ``update_counted()``, ``record_created()`` and ``record_changes()``.
+    """
+    rows = []
+    for metric in metrics or METRICS:
+        model_label, field = METRICS[metric]
+        model = apps.get_model(model_label)
+        counts = model._default_manager.order_by().values_list(field).annotate(n=Count('pk'))
+        rows.extend(CohortSummary(metric=metric, key=str(key), value=n) for key, n in counts)
+
+    with transaction.atomic():
+        CohortSummary.objects.filter(metric__in=list(metrics or METRICS)).delete()
+        CohortSummary.objects.bulk_create(rows)
+    return len(rows)
+
+
+def get_dashboard():
+    """All summary counts with one query, as {metric: {key: value}}"""
+    dashboard = {metric: {} for metric in METRICS}
+    for metric, key, value in CohortSummary.objects.exclude(value=0).values_list('metric', 'key', 'value'):
+        dashboard.setdefault(metric, {})[key] = value
+    return dashboard
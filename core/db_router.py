@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+REPLICA = 'replica'
+
+# Set while a read-only view runs; a ContextVar so threads and ASGI tasks do not share it
+_use_replica = ContextVar('use_replica', default=False)
+
+# Cookie set by PinPrimaryMiddleware on a client that just submitted a form
+PIN_COOKIE = 'pin_primary'
+
+
+@contextmanager
+def use_replica():
+    """Send ORM reads in this block to the replica alias, when one is configured"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_reads(view):
+    """View decorator for read-only pages that can tolerate replication lag
+
+    Clients holding PIN_COOKIE read from the primary instead, so the page a
+    form redirects to shows the write it just made.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if PIN_COOKIE in request.COOKIES:
+            return view(request, *args, **kwargs)
+        with use_replica():
+            return view(request, *args, **kwargs)
+    return wrapped
+
+
+class ReplicaRouter:
+    """Reads go to the replica only inside ``use_replica``; writes and migrations always go to default"""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and REPLICA in settings.DATABASES:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or a row read from the replica would be saved back to it
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
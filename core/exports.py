@@ -0,0 +1,173 @@
+import csv
+from datetime import datetime
+
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: write() hands the line back instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def neutralize(value):
+    """Prefix text that a spreadsheet would run as a formula with ' so it is shown as typed"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def placement_rows(queryset=None):
+    """Every placement with its UTS/UAS ratings and monthly report history, one row each"""
+    from evaluations.models import Evaluation
+    from internships.models import InternshipPlacement
+    from reports.models import MonthlyReport
+
+    if queryset is None:
+        queryset = InternshipPlacement.objects.all()
+
+    def evaluation(evaluation_type, field):
+        return Subquery(
+            Evaluation.objects.filter(placement=OuterRef('pk'), evaluation_type=evaluation_type).values(field)[:1]
+        )
+
+    def report_count(**filters):
+        counts = (
+            MonthlyReport.objects.filter(placement=OuterRef('pk'), **filters)
+            .exclude(status='DRAFT')
+            .order_by().values('placement').annotate(n=Count('pk')).values('n')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    last_submitted = (
+        MonthlyReport.objects.filter(placement=OuterRef('pk'))
+        .order_by().values('placement').annotate(last=Max('submitted_at')).values('last')
+    )
+
+    header = [
+        'NIM', 'Nama', 'Program', 'Angkatan', 'Perusahaan', 'Industri', 'Posisi', 'Mulai', 'Selesai', 'Status',
+        'Supervisor', 'Email Supervisor', 'Rating UTS', 'Status UTS', 'Rating UAS', 'Status UAS',
+        'Laporan Disubmit', 'Laporan Terlambat', 'Laporan Direview', 'Laporan Terakhir',
+    ]
+    rows = (
+        queryset.order_by('pk')
+        .annotate(
+            uts_rating=evaluation('UTS', 'overall_rating'),
+            uts_status=evaluation('UTS', 'status'),
+            uas_rating=evaluation('UAS', 'overall_rating'),
+            uas_status=evaluation('UAS', 'status'),
+            reports_submitted=report_count(),
+            reports_late=report_count(is_late=True),
+            reports_reviewed=report_count(status='REVIEWED'),
+            last_report_at=Subquery(last_submitted),
+        )
+        .values_list(
+            'student__nim', 'student__full_name', 'student__program', 'student__angkatan',
+            'company_name', 'company_industry', 'position', 'start_date', 'end_date', 'status',
+            'supervisor_name', 'supervisor_email', 'uts_rating', 'uts_status', 'uas_rating', 'uas_status',
+            'reports_submitted', 'reports_late', 'reports_reviewed', 'last_report_at',
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return header, rows
+
+
+def report_rows(queryset=None):
+    """Monthly report submission history, one row per report"""
+    from reports.models import MonthlyReport
+
+    if queryset is None:
+        queryset = MonthlyReport.objects.all()
+    header = [
+        'NIM', 'Nama', 'Perusahaan', 'Bulan', 'Tahun', 'Status', 'Disubmit', 'Terlambat', 'Direview Oleh', 'Direview',
+    ]
+    rows = (
+        queryset.order_by('pk')
+        .values_list(
+            'placement__student__nim', 'placement__student__full_name', 'placement__company_name',
+            'month', 'year', 'status', 'submitted_at', 'is_late', 'reviewed_by__email', 'reviewed_at',
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return header, rows
+
+
+def evaluation_rows(queryset=None):
+    """Evaluations with every criterion score and the stored averages, one row per evaluation"""
+    from evaluations.models import Evaluation, RATING_CATEGORIES, RATING_FIELDS
+
+    if queryset is None:
+        queryset = Evaluation.objects.all()
+    average_columns = [column for column, _ in RATING_CATEGORIES.values()]
+    header = [
+        'NIM', 'Nama', 'Perusahaan', 'Supervisor', 'Tipe', 'Bulan Ke', 'Status', 'Deadline', 'Disubmit',
+        *RATING_FIELDS, *RATING_CATEGORIES, 'Overall Rating', 'Rekomendasi Lulus', 'Bersedia Terima Lagi',
+    ]
+    rows = (
+        queryset.order_by('pk')
+        .values_list(
+            'placement__student__nim', 'placement__student__full_name', 'placement__company_name',
+            'supervisor__full_name', 'evaluation_type', 'period_month', 'status', 'deadline', 'submitted_at',
+            *RATING_FIELDS, *average_columns, 'overall_rating', 'pass_recommendation', 'rehire_willingness',
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return header, rows
+
+
+EXPORTS = {
+    'placements': placement_rows,
+    'reports': report_rows,
+    'evaluations': evaluation_rows,
+}
+
+
+def iter_csv(header, rows, lines_per_chunk=500):
+    """CSV text in chunks of a few hundred lines, produced as rows arrive"""
+    writer = csv.writer(Echo())
+    lines = [writer.writerow(header)]
+    for row in rows:
+        lines.append(writer.writerow([neutralize(value) for value in row]))
+        if len(lines) >= lines_per_chunk:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def write_xlsx(header, rows, path):
+    """Write rows to an XLSX file in openpyxl's write-only (streaming) mode; returns the row count"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    count = 0
+    for row in rows:
+        # Excel has no time zones: write aware datetimes as naive local time
+        sheet.append([
+            timezone.make_naive(value) if isinstance(value, datetime) and timezone.is_aware(value)
+            else neutralize(value)
+            for value in row
+        ])
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def csv_response(name, queryset=None):
+    """StreamingHttpResponse for one of EXPORTS, built row by row with constant memory"""
+    header, rows = EXPORTS[name](queryset)
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type='text/csv')
+    filename = f'{name}-{timezone.localdate():%Y%m%d}.csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+# Collectors: each returns a queryset of rows that are safe to delete now.
+# Register new ones in settings.GC_COLLECTORS.
+
+def expired_sessions(now):
+    """Sessions past their expiry (what clearsessions removes)"""
+    from django.contrib.sessions.models import Session
+    return Session.objects.filter(expire_date__lt=now)
+
+
+def stale_login_tokens(now):
+    """Login links used, or expired, more than GC_LOGIN_TOKEN_DAYS ago"""
+    from accounts.models import LoginToken
+    cutoff = now - timedelta(days=settings.GC_LOGIN_TOKEN_DAYS)
+    return LoginToken.objects.filter(Q(expires_at__lt=cutoff) | Q(used_at__lt=cutoff))
+
+
+def delivered_emails(now):
+    """Outbox rows sent more than GC_OUTBOX_SENT_DAYS ago, or failed more than GC_OUTBOX_FAILED_DAYS ago
+
+    Their dedup keys are released with them; every key in use today belongs
+    to a one-off event (a registration, a reminder threshold) that does not recur.
+    """
+    from notifications.models import OutboundEmail
+    return OutboundEmail.objects.filter(
+        Q(status='SENT', sent_at__lt=now - timedelta(days=settings.GC_OUTBOX_SENT_DAYS))
+        | Q(status='FAILED', created_at__lt=now - timedelta(days=settings.GC_OUTBOX_FAILED_DAYS))
+    )
+
+
+def past_reminders(now):
+    """Reminder records of evaluations whose deadline passed more than GC_REMINDER_DAYS ago
+
+    send_due_reminders only looks at evaluations with a deadline from today on,
+    so these no longer prevent duplicate reminders.
+    """
+    from evaluations.models import EvaluationReminder
+    cutoff = now.date() - timedelta(days=settings.GC_REMINDER_DAYS)
+    return EvaluationReminder.objects.filter(evaluation__deadline__lt=cutoff)
+
+
+def finished_fanouts(now):
+    """Broadcast jobs done (or failed and not retried) more than GC_FANOUT_DAYS ago"""
+    from notifications.models import NotificationFanout
+    cutoff = now - timedelta(days=settings.GC_FANOUT_DAYS)
+    return NotificationFanout.objects.filter(status__in=['DONE', 'FAILED'], updated_at__lt=cutoff)
+
+
+def collect(queryset, batch_size, pause):
+    """Delete the rows of ``queryset`` in batches of ``batch_size``, pausing between batches; returns how many"""
+    model = queryset.model
+    ids_query = queryset.order_by().values_list('pk', flat=True)
+    deleted = 0
+    while True:
+        ids = list(ids_query[:batch_size])
+        if not ids:
+            return deleted
+        # One short transaction per batch; a single DELETE unless the model has cascades or signals
+        _, per_model = model._base_manager.filter(pk__in=ids).delete()
+        batch_deleted = per_model.get(model._meta.label, 0)
+        if not batch_deleted:
+            # The rows were matched but none could be deleted; selecting again would loop forever
+            return deleted
+        deleted += batch_deleted
+        # Let other writers in between batches
+        time.sleep(pause)
+
+
+def run(names=None, batch_size=None, pause=None, dry_run=False):
+    """Run the collectors in ``names`` (default: all of GC_COLLECTORS)
+
+    Returns [{'name', 'rows', 'seconds'}], where ``rows`` is what was deleted,
+    or with ``dry_run`` what would be.
+    """
+    batch_size = batch_size or settings.GC_BATCH_SIZE
+    pause = settings.GC_PAUSE_SECONDS if pause is None else pause
+    now = timezone.now()
+
+    results = []
+    for name in names or settings.GC_COLLECTORS:
+        queryset = import_string(settings.GC_COLLECTORS[name])(now)
+        started = time.perf_counter()
+        rows = queryset.count() if dry_run else collect(queryset, batch_size, pause)
+        results.append({'name': name, 'rows': rows, 'seconds': time.perf_counter() - started})
+    return results
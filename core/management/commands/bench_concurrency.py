@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+PROFILES = ['default', 'tuned']
+
+_start = None
+
+
+def _setup_worker(profile, start):
+    """Django in a spawned process, with the connection options of ``profile``"""
+    global _start
+    _start = start
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coop_prasetiya_mulya.settings')
+    django.setup()
+
+    from django.db import connection
+    connection.close()
+    # Keep a database write in every request, as before sessions were refreshed on an
+    # interval (see bench_session_writes), so the profiles are compared under write contention
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    settings.SESSION_SAVE_EVERY_REQUEST = True
+    if profile == 'default':
+        # SQLite as Django configures it out of the box: rollback journal, deferred transactions
+        connection.settings_dict['OPTIONS'] = {}
+
+
+def _run_client(args):
+    """One client: log in as ``user_id``, wait for the others, then fetch ``url`` for ``seconds``"""
+    user_id, url, seconds = args
+    from django.db import OperationalError
+    from django.test import Client
+    from accounts.models import User
+
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(User.objects.get(pk=user_id))
+    _start.wait()
+    deadline = time.time() + seconds
+    ok, locked, failed, latencies = 0, 0, 0, []
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            response = client.get(url)
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+        else:
+            if response.status_code == 200:
+                ok += 1
+            else:
+                failed += 1
+        latencies.append(time.perf_counter() - started)
+    return ok, locked, failed, latencies
+
+
+class Command(BaseCommand):
+    help = (
+        'Run N parallel clients (processes) against the student and supervisor dashboards and report '
+        'throughput, latency and "database is locked" errors, with SQLite as Django configures it by '
+        'default and with the pragmas from settings.SQLITE_PRAGMAS. Every request saves its (database) '
+        'session, so the clients contend for the write lock. Run on a copy of the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=15)
+        parser.add_argument('--profile', choices=PROFILES, action='append',
+                            help='Profile(s) to run (default: both)')
+
+    def handle(self, *args, **options):
+        from django.urls import reverse
+        from accounts.models import User
+
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark is for the SQLite database')
+
+        targets = []
+        for role, url in (('STUDENT', reverse('student:dashboard')), ('SUPERVISOR', reverse('supervisor:dashboard'))):
+            user_ids = list(User.objects.filter(role=role, is_active=True).values_list('pk', flat=True)[:options['clients']])
+            if not user_ids:
+                raise CommandError(f'No {role} user found. Run seed_data first.')
+            targets.append((user_ids, url))
+        clients = [
+            (targets[index % 2][0][index // 2 % len(targets[index % 2][0])], targets[index % 2][1])
+            for index in range(options['clients'])
+        ]
+
+        self.stdout.write(
+            f'{"Profile":<10}{"Requests":>10}{"Req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"Locked":>10}{"Failed":>10}'
+        )
+        for profile in options['profile'] or PROFILES:
+            self._set_journal_mode(profile)
+            context = multiprocessing.get_context('spawn')
+            # Every client blocks on the barrier until all have logged in, so each process runs one
+            start = context.Barrier(options['clients'])
+            with context.Pool(options['clients'], initializer=_setup_worker, initargs=(profile, start)) as pool:
+                results = pool.map(
+                    _run_client, [(user_id, url, options['seconds']) for user_id, url in clients], chunksize=1,
+                )
+
+            ok = sum(result[0] for result in results)
+            locked = sum(result[1] for result in results)
+            failed = sum(result[2] for result in results)
+            latencies = sorted(latency for result in results for latency in result[3])
+            p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+            self.stdout.write(
+                f'{profile:<10}{ok:>10}{ok / options["seconds"]:>10.1f}{p50:>10.0f}{p95:>10.0f}{locked:>10}{failed:>10}'
+            )
+
+        # Leave the file as the application expects it
+        self._set_journal_mode('tuned')
+
+    def _set_journal_mode(self, profile):
+        """journal_mode is stored in the database file, so switch it before the clients connect"""
+        connection.close()
+        mode = 'DELETE' if profile == 'default' else settings.SQLITE_PRAGMAS['journal_mode']
+        db = sqlite3.connect(settings.DATABASES['default']['NAME'])
+        try:
+            db.execute(f'PRAGMA journal_mode = {mode}')
+        finally:
+            db.close()
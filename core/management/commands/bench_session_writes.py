@@ -0,0 +1,94 @@
+import re
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+
+SLIDING = 'core.middleware.SlidingSessionMiddleware'
+
+# name: (session engine, save on every request)
+PROFILES = {
+    'every-request': ('django.contrib.sessions.backends.db', True),
+    'db': ('django.contrib.sessions.backends.db', False),
+    'cached_db': ('django.contrib.sessions.backends.cached_db', False),
+    'signed_cookies': ('django.contrib.sessions.backends.signed_cookies', False),
+}
+
+WRITE = re.compile(r'^\s*(INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+
+
+class Command(BaseCommand):
+    help = (
+        'Browse the student and supervisor pages as logged-in users for a few seconds and count the '
+        'database writes, saving the session on every request (the old setting) and with the sliding '
+        'refresh on each session engine. Run on a copy of the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Logged-in users per role')
+        parser.add_argument('--seconds', type=float, default=10, help='How long each profile runs')
+        parser.add_argument('--refresh-interval', type=int,
+                            help='Override SESSION_REFRESH_INTERVAL, e.g. 2 to see refreshes in a short run')
+        parser.add_argument('--profile', choices=list(PROFILES), action='append',
+                            help='Profile(s) to run (default: all)')
+
+    def handle(self, *args, **options):
+        pages = {
+            'STUDENT': [reverse('student:dashboard'), reverse('student:job_list')],
+            'SUPERVISOR': [reverse('supervisor:dashboard')],
+        }
+        users = []
+        for role in pages:
+            found = list(User.objects.filter(role=role, is_active=True)[:options['users']])
+            if not found:
+                raise CommandError(f'No {role} user found. Run seed_data first.')
+            users += found
+
+        interval = options['refresh_interval'] or settings.SESSION_REFRESH_INTERVAL
+        self.stdout.write(f'{len(users)} users, {options["seconds"]:g} s per profile, refresh interval {interval} s')
+        self.stdout.write(
+            f'{"Profile":<16}{"Requests":>10}{"Req/s":>10}{"Writes":>10}{"Session":>10}{"Writes/req":>12}'
+        )
+        for name in options['profile'] or PROFILES:
+            engine, every_request = PROFILES[name]
+            middleware = [m for m in settings.MIDDLEWARE if not (every_request and m == SLIDING)]
+            with override_settings(SESSION_ENGINE=engine, SESSION_SAVE_EVERY_REQUEST=every_request,
+                                   SESSION_REFRESH_INTERVAL=interval, MIDDLEWARE=middleware):
+                requests, writes, session_writes = self._run(users, pages, options['seconds'])
+            self.stdout.write(
+                f'{name:<16}{requests:>10}{requests / options["seconds"]:>10.1f}{writes:>10}'
+                f'{session_writes:>10}{writes / requests:>12.3f}'
+            )
+
+    def _run(self, users, pages, seconds):
+        """Round-robin over the users until ``seconds`` pass; returns requests, writes, session writes"""
+        clients = []
+        for user in users:
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+            clients.append((client, pages[user.role]))
+
+        requests = writes = session_writes = 0
+        deadline = time.time() + seconds
+        connection.force_debug_cursor = True
+        try:
+            while time.time() < deadline:
+                for client, urls in clients:
+                    url = urls[requests % len(urls)]
+                    connection.queries_log.clear()
+                    response = client.get(url)
+                    if response.status_code != 200:
+                        raise CommandError(f'{url} returned {response.status_code}')
+                    requests += 1
+                    for query in connection.queries:
+                        if WRITE.match(query['sql']):
+                            writes += 1
+                            session_writes += 'django_session' in query['sql']
+        finally:
+            connection.force_debug_cursor = False
+        return requests, writes, session_writes
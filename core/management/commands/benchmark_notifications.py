@@ -0,0 +1,87 @@
+import copy
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from notifications.models import Notification
+
+CACHED_PROCESSOR = 'core.context_processors.notifications'
+UNCACHED_PROCESSOR = 'core.management.commands.benchmark_notifications.uncached_notifications'
+
+
+def uncached_notifications(request):
+    """The context processor as it was before caching: both queries on every render"""
+    if request.user.is_authenticated:
+        return {
+            'unread_notifications_count': Notification.objects.filter(recipient=request.user, is_read=False).count(),
+            # The old navbar rendered the list on every page
+            'recent_notifications': list(
+                Notification.objects.filter(recipient=request.user).order_by('-created_at')[:5]
+            ),
+        }
+    return {'unread_notifications_count': 0, 'recent_notifications': []}
+
+
+def templates_with(processor):
+    """settings.TEMPLATES with the notification context processor swapped for ``processor``"""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    for engine in templates:
+        processors = engine.get('OPTIONS', {}).get('context_processors', [])
+        engine['OPTIONS']['context_processors'] = [
+            processor if name == CACHED_PROCESSOR else name for name in processors
+        ]
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure queries per request on the dashboards with the original uncached notification '
+        'context processor (before) and the cached one (after)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help='Requests per measurement')
+
+    def handle(self, *args, **options):
+        n = options['requests']
+        targets = [
+            ('Student dashboard', 'STUDENT', reverse('student:dashboard')),
+            ('Supervisor dashboard', 'SUPERVISOR', reverse('supervisor:dashboard')),
+        ]
+
+        self.stdout.write(f'{"Page":<24}{"Mode":<8}{"Queries/req":>14}{"Notification queries/req":>28}')
+        for label, role, url in targets:
+            user = User.objects.filter(role=role).first()
+            if user is None:
+                raise CommandError(f'No {role} user found. Run seed_data first.')
+
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+
+            with override_settings(TEMPLATES=templates_with(UNCACHED_PROCESSOR)):
+                before = self._measure(client, url, n)
+            # Warm the cache, then measure the steady state
+            client.get(url)
+            after = self._measure(client, url, n)
+
+            for mode, (total, notification) in (('before', before), ('after', after)):
+                self.stdout.write(f'{label:<24}{mode:<8}{total:>14.1f}{notification:>28.1f}')
+
+    def _measure(self, client, url, n):
+        total = 0
+        notification = 0
+        for _ in range(n):
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{url} returned {response.status_code}')
+            total += len(ctx.captured_queries)
+            notification += sum(
+                1 for query in ctx.captured_queries if 'notifications_notification' in query['sql']
+            )
+        return total / n, notification / n
@@ -0,0 +1,57 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.pagination import after_position
+
+from notifications.models import Notification
+from internships.models import JobPosting, Application, InternshipPlacement
+from evaluations.models import Evaluation
+
+# "SCAN table" without an index is a full table scan; "SCAN table USING [COVERING] INDEX" is not
+FULL_SCAN = re.compile(r'\bSCAN (?!CONSTANT ROW|SUBQUERY)(\w+)(?! USING)(?:\s|$)')
+
+
+def hot_queries(user_id=1, student_id=1, supervisor_id=1):
+    """The per-request queries behind the navbar, dashboards and listings"""
+    return [
+        ('Navbar: unread count', Notification.objects.filter(recipient_id=user_id, is_read=False).order_by().values('pk')),
+        ('Navbar: recent notifications', Notification.objects.filter(recipient_id=user_id).order_by('-created_at')[:5]),
+        ('Student dashboard: active placement', InternshipPlacement.objects.filter(student_id=student_id, status='ACTIVE')[:1]),
+        ('Student dashboard: applications', Application.objects.filter(student_id=student_id).order_by('-applied_at')[:5]),
+        ('Student: my applications', Application.objects.filter(student_id=student_id).order_by('-applied_at')),
+        ('Job board: first page', JobPosting.objects.open()[:21]),
+        ('Job board: next page', after_position(JobPosting.objects.open(), timezone.now(), 1)[:21]),
+        ('Supervisor dashboard: students', InternshipPlacement.objects.filter(supervisor_id=supervisor_id, status='ACTIVE').select_related('student')),
+        ('Supervisor dashboard: pending evaluations', Evaluation.objects.filter(supervisor_id=supervisor_id, status='PENDING').order_by().values('pk')),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN QUERY PLAN on the hot view queries and fail if any of them does a full table scan. '
+        'SQLite only; on PostgreSQL use EXPLAIN directly.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('EXPLAIN QUERY PLAN is only available on SQLite.')
+
+        failures = []
+        for label, queryset in hot_queries():
+            plan = queryset.explain()
+            scans = FULL_SCAN.findall(plan)
+
+            style = self.style.ERROR if scans else self.style.SUCCESS
+            self.stdout.write(style(f'{"FULL SCAN" if scans else "OK":<10}') + label)
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+
+            if scans:
+                failures.append(f'{label} ({", ".join(scans)})')
+
+        if failures:
+            raise CommandError('Full table scan in: ' + '; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('No full table scans.'))
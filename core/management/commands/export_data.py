@@ -0,0 +1,56 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import EXPORTS, iter_csv, write_xlsx
+
+
+class CountingIterator:
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self.rows)
+        self.count += 1
+        return row
+
+
+class Command(BaseCommand):
+    help = (
+        'Export placements (with UTS/UAS ratings and report history), monthly reports or evaluations '
+        'as CSV or XLSX. Rows are streamed from the database in chunks, so memory use stays flat.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=EXPORTS)
+        parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+        parser.add_argument('--output', '-o', help='Output file (default: stdout for CSV; required for XLSX)')
+
+    def handle(self, *args, **options):
+        header, rows = EXPORTS[options['dataset']]()
+        output = options['output']
+        started = time.perf_counter()
+
+        if options['format'] == 'xlsx':
+            if not output:
+                raise CommandError('--output is required for XLSX exports')
+            count = write_xlsx(header, rows, output)
+        else:
+            counted = CountingIterator(rows)
+            stream = open(output, 'w', newline='', encoding='utf-8') if output else sys.stdout
+            try:
+                for chunk in iter_csv(header, counted):
+                    stream.write(chunk)
+            finally:
+                if output:
+                    stream.close()
+            count = counted.count
+
+        if output:
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(f'Exported {count} {options["dataset"]} rows to {output} in {elapsed:.2f}s'))
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import gc
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions and aged auxiliary rows (login tokens, sent emails, old reminders, '
+        'finished broadcasts) with the collectors in settings.GC_COLLECTORS. Deletes in small batches '
+        'with pauses in between, so it can run (e.g. nightly) while the site is in use.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collector', action='append', dest='collectors',
+                            help='Collector to run, repeatable (default: all)')
+        parser.add_argument('--batch-size', type=int, default=settings.GC_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=settings.GC_PAUSE_SECONDS,
+                            help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted')
+
+    def handle(self, *args, **options):
+        unknown = set(options['collectors'] or []) - set(settings.GC_COLLECTORS)
+        if unknown:
+            raise CommandError(
+                f'Unknown collector(s): {", ".join(sorted(unknown))}. '
+                f'Available: {", ".join(settings.GC_COLLECTORS)}'
+            )
+
+        results = gc.run(options['collectors'], options['batch_size'], options['pause'], options['dry_run'])
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(f'{"Collector":<16}{verb:>14}{"Seconds":>10}')
+        for result in results:
+            self.stdout.write(f'{result["name"]:<16}{result["rows"]:>14}{result["seconds"]:>10.2f}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {sum(r["rows"] for r in results)} rows in {sum(r["seconds"] for r in results):.2f}s'
+        ))
@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+
+from .db_router import PIN_COOKIE, REPLICA
+
+# Session key holding when the session's expiry was last pushed forward (unix time)
+REFRESHED_AT = '_session_refreshed_at'
+
+
+class SlidingSessionMiddleware:
+    """Push the session expiry forward at most once per SESSION_REFRESH_INTERVAL seconds
+
+    Replaces SESSION_SAVE_EVERY_REQUEST, which writes the session on every
+    request. Marking the session modified here makes SessionMiddleware
+    (listed before this one, so it sees the response after) save it with a
+    fresh SESSION_COOKIE_AGE; other requests write nothing. The idle timeout
+    is therefore between SESSION_COOKIE_AGE - SESSION_REFRESH_INTERVAL and
+    SESSION_COOKIE_AGE after the last request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        session = request.session
+        # No session cookie, or one naming an expired or unknown session (loading it
+        # clears the key): nothing to keep alive, and no session to create
+        refreshed_at = session.get(REFRESHED_AT, 0)
+        if session.session_key is None or session.is_empty():
+            return response
+
+        now = int(time.time())
+        if session.modified or now - refreshed_at >= settings.SESSION_REFRESH_INTERVAL:
+            session[REFRESHED_AT] = now
+        return response
+
+
+class HealthCheckMiddleware:
+    """Answer /healthz before anything reads the Host header
+
+    Fly's health checker connects to the machine's private address, which
+    is not in ALLOWED_HOSTS; CommonMiddleware would reject it with a 400.
+    Listed first in MIDDLEWARE so no other middleware runs for the check.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path_info == '/healthz':
+            from .views import healthz
+            return healthz(request)
+        return self.get_response(request)
+
+
+class PinPrimaryMiddleware:
+    """Send a client's reads to the primary for REPLICA_PIN_SECONDS after it POSTs
+
+    Writes come from form submissions, which usually redirect to a
+    replica_reads page (confirm_internship to the student dashboard). A
+    lagging replica would show that page without the write; the cookie set
+    here makes replica_reads skip the replica until it expires.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and REPLICA in settings.DATABASES:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
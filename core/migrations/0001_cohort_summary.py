@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:08
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# A copy of core.dashboard.METRICS as it was when this migration was written
+METRICS = {
+    'student_status': ('accounts.StudentProfile', 'status'),
+    'placement_status': ('internships.InternshipPlacement', 'status'),
+    'placement_industry': ('internships.InternshipPlacement', 'company_industry'),
+    'report_late': ('reports.MonthlyReport', 'is_late'),
+    'evaluation_status': ('evaluations.Evaluation', 'status'),
+}
+
+
+def populate_summary(apps, schema_editor):
+    CohortSummary = apps.get_model('core', 'CohortSummary')
+    rows = []
+    for metric, (model_label, field) in METRICS.items():
+        counts = apps.get_model(model_label).objects.order_by().values_list(field).annotate(n=Count('pk'))
+        rows.extend(CohortSummary(metric=metric, key=str(key), value=n) for key, n in counts)
+    CohortSummary.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0002_skill_tokens'),
+        ('evaluations', '0004_rating_averages'),
+        ('internships', '0005_skill_tokens'),
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=100)),
+                ('value', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Cohort Summary',
+                'verbose_name_plural': 'Cohort Summary',
+                'ordering': ['metric', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='unique_cohort_metric_key')],
+            },
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
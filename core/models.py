@@ -1 +1,25 @@
 from django.db import models
+
+
+class CohortSummary(models.Model):
+    """Precomputed counts for the admin cohort dashboard, one row per (metric, key)
+
+    Kept current incrementally by signals (see core.dashboard) and rebuilt
+    by ``manage.py reconcile_dashboard``.
+    """
+
+    metric = models.CharField(max_length=50)
+    key = models.CharField(max_length=100)
+    value = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['metric', 'key']
+        verbose_name = 'Cohort Summary'
+        verbose_name_plural = 'Cohort Summary'
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'key'], name='unique_cohort_metric_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.key}] = {self.value}"
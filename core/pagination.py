@@ -0,0 +1,77 @@
+import base64
+from datetime import datetime
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset"""
+
+    def __init__(self, object_list, next_cursor, cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return bool(self.cursor)
+
+
+def _encode(created_at, pk):
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def encode_cursor(obj):
+    """Encode the (created_at, id) position of an object as an opaque URL-safe token"""
+    return _encode(obj.created_at, obj.pk)
+
+
+def decode_cursor(cursor):
+    """Decode a cursor back into (created_at, id); returns None for anything malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def normalize_cursor(cursor):
+    """The cursor as encode_cursor writes it, or None for a missing or malformed one
+
+    Every spelling of a position maps to one value, and anything that would
+    show the first page maps to None, so it is safe to use in cache keys.
+    """
+    position = decode_cursor(cursor) if cursor else None
+    return _encode(*position) if position else None
+
+
+def after_position(queryset, created_at, pk):
+    """Rows strictly after (created_at, pk) in ('-created_at', '-id') order, as an index range"""
+    return queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=pk)
+
+
+def paginate_keyset(queryset, cursor=None, per_page=20):
+    """Return the page after ``cursor`` of a queryset ordered by ('-created_at', '-id')
+
+    Each page is a range scan on the (created_at, id) index, so the cost does not
+    grow with the page number the way OFFSET does.
+    """
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        queryset = after_position(queryset, *position)
+    else:
+        cursor = None
+
+    objects = list(queryset[:per_page + 1])
+    next_cursor = encode_cursor(objects[per_page - 1]) if len(objects) > per_page else None
+    return KeysetPage(objects[:per_page], next_cursor, cursor)
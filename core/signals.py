@@ -0,0 +1,36 @@
+from django.db.models.signals import pre_save, post_save, pre_delete
+
+from .dashboard import TRACKED_MODELS, metrics_for, record_change, snapshot, stored_snapshot
+
+
+def remember_counts(sender, instance, update_fields=None, **kwargs):
+    """Read which dashboard keys the stored row counts towards before it is overwritten
+
+    Only the tracked fields this save writes are read: loaded ones, narrowed
+    further by ``update_fields``.
+    """
+    fields = {field for _, field in metrics_for(sender) if field in instance.__dict__}
+    if update_fields is not None:
+        fields &= set(update_fields)
+    instance._cohort_snapshot = stored_snapshot(instance, fields)
+
+
+def update_counts(sender, instance, created, **kwargs):
+    old = {} if created else getattr(instance, '_cohort_snapshot', {})
+    new = snapshot(instance)
+    if not created:
+        # Only the fields this save wrote can have moved
+        new = {metric: key for metric, key in new.items() if metric in old}
+    record_change(old, new)
+
+
+def remove_counts(sender, instance, **kwargs):
+    old = snapshot(instance)
+    missing = {field for metric, field in metrics_for(sender) if metric not in old}
+    record_change({**old, **stored_snapshot(instance, missing)}, {})
+
+
+for model in TRACKED_MODELS:
+    pre_save.connect(remember_counts, sender=model, dispatch_uid=f'cohort_pre_save_{model}')
+    post_save.connect(update_counts, sender=model, dispatch_uid=f'cohort_save_{model}')
+    pre_delete.connect(remove_counts, sender=model, dispatch_uid=f'cohort_delete_{model}')
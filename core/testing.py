@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+from unittest import TextTestResult
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from accounts.models import StudentProfile, SupervisorProfile, User
+from internships.models import InternshipPlacement, JobPosting
+
+# One in-memory cache per alias, so tests never read or write the cache files a
+# local server uses, and the sessions cache stays separate from the default one
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+    for alias in ('default', 'sessions')
+}
+
+
+class ClearCachesMixin:
+    """Start every test with empty caches
+
+    Primary keys are reused after a test's rollback, so an entry such as a
+    user's unread count would otherwise leak into the next test.
+    """
+
+    def startTest(self, test):
+        for cache in caches.all():
+            cache.clear()
+        super().startTest(test)
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner using TEST_CACHES, emptied before each test"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES=TEST_CACHES)
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def get_resultclass(self):
+        result_class = super().get_resultclass() or TextTestResult
+        return type(f'ClearCaches{result_class.__name__}', (ClearCachesMixin, result_class), {})
+
+
+# Factories shared by the apps' tests; keyword arguments override the defaults
+
+def make_student(email, **fields):
+    """Student (APPROVED unless ``status`` says otherwise) whose NIM is the email's local part"""
+    profile = {
+        'full_name': email, 'nim': email.split('@')[0], 'program': 'MN', 'angkatan': '2022', 'gender': 'L',
+        'whatsapp': '0812', **fields,
+    }
+    return StudentProfile.objects.create(user=User.objects.create_user(email=email, role='STUDENT'), **profile)
+
+
+def make_supervisor(email, **fields):
+    profile = {'full_name': 'Budi', 'company_name': 'PT Contoh', 'position': 'Manager', 'whatsapp': '0812', **fields}
+    return SupervisorProfile.objects.create(user=User.objects.create_user(email=email, role='SUPERVISOR'), **profile)
+
+
+def make_placement(student, supervisor=None, **fields):
+    """Placement at PT Contoh, linked to ``supervisor`` if given (its email is then the supervisor email)"""
+    placement = {
+        'company_name': 'PT Contoh', 'company_address': 'Jakarta', 'company_industry': 'TECH', 'position': 'Intern',
+        'start_date': date(2026, 1, 5), 'end_date': date(2026, 5, 5), 'supervisor_name': 'Budi',
+        'supervisor_email': supervisor.user.email if supervisor else 'budi@contoh.co.id',
+        'supervisor_whatsapp': '0812', 'supervisor_position': 'Manager', **fields,
+    }
+    return InternshipPlacement.objects.create(student=student, supervisor=supervisor, **placement)
+
+
+def make_job(company, title, **fields):
+    """Posting open for applications for another 30 days"""
+    job = {
+        'description': 'Magang', 'requirements': 'python', 'location': 'Jakarta',
+        'application_deadline': date.today() + timedelta(days=30), **fields,
+    }
+    return JobPosting.objects.create(company=company, title=title, **job)
@@ -1,3 +1,335 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import LoginToken, StudentProfile, User
+from evaluations.models import Evaluation, EvaluationReminder
+from internships.models import Company, JobPosting
+from notifications.models import NotificationFanout, OutboundEmail
+
+from . import db_router, gc
+from .dashboard import get_dashboard, reconcile, record_created, update_counted
+from .exports import iter_csv, neutralize, write_xlsx
+from .middleware import REFRESHED_AT
+from .pagination import decode_cursor, encode_cursor, normalize_cursor, paginate_keyset
+from .testing import make_job, make_placement, make_student, make_supervisor
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='PT Contoh', industry='TECH', address='Jakarta')
+        for i in range(7):
+            make_job(company, f'Job {i}')
+        # Several rows share a created_at, so the id tie-breaker decides their order
+        now = timezone.now()
+        JobPosting.objects.filter(title__in=['Job 2', 'Job 3', 'Job 4']).update(created_at=now)
+
+    def walk(self, per_page):
+        pages, cursor = [], None
+        while True:
+            page = paginate_keyset(JobPosting.objects.open(), cursor, per_page)
+            pages.append([job.pk for job in page])
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once_in_order(self):
+        expected = list(JobPosting.objects.open().values_list('pk', flat=True))
+        pages = self.walk(per_page=3)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([pk for page in pages for pk in page], expected)
+
+    def test_exact_multiple_has_no_empty_last_page(self):
+        JobPosting.objects.filter(title='Job 6').delete()
+        pages = self.walk(per_page=3)
+        self.assertEqual([len(page) for page in pages], [3, 3])
+
+    def test_first_page_has_no_previous(self):
+        page = paginate_keyset(JobPosting.objects.open(), None, 3)
+        self.assertFalse(page.has_previous)
+        self.assertTrue(paginate_keyset(JobPosting.objects.open(), page.next_cursor, 3).has_previous)
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        first = [job.pk for job in paginate_keyset(JobPosting.objects.open(), None, 3)]
+        for cursor in ['garbage', '!!!', 'bm90LWEtZGF0ZXwx']:
+            self.assertIsNone(decode_cursor(cursor))
+            page = paginate_keyset(JobPosting.objects.open(), cursor, 3)
+            self.assertEqual([job.pk for job in page], first)
+            self.assertFalse(page.has_previous)
+
+    def test_cursor_round_trip(self):
+        job = JobPosting.objects.first()
+        self.assertEqual(decode_cursor(encode_cursor(job)), (job.created_at, job.pk))
+
+    def test_normalized_cursor_has_one_spelling(self):
+        cursor = encode_cursor(JobPosting.objects.first())
+        self.assertEqual(normalize_cursor(cursor + '=' * (-len(cursor) % 4)), cursor)
+        for junk in [None, '', 'garbage', 'bm90LWEtZGF0ZXwx']:
+            self.assertIsNone(normalize_cursor(junk))
+
+
+class CohortDashboardTests(TestCase):
+    def setUp(self):
+        self.students = [make_student(f's{i}@student.prasetiyamulya.ac.id') for i in range(3)]
+
+    def student_counts(self):
+        return get_dashboard()['student_status']
+
+    def assertMatchesRecount(self):
+        counts = self.student_counts()
+        reconcile(['student_status'])
+        self.assertEqual(counts, self.student_counts())
+
+    def test_save_and_delete_move_counts(self):
+        student = self.students[0]
+        student.status = 'ACTIVE'
+        student.save()
+        self.assertEqual(self.student_counts(), {'APPROVED': 2, 'ACTIVE': 1})
+
+        student.delete()
+        self.assertEqual(self.student_counts(), {'APPROVED': 2})
+        self.assertMatchesRecount()
+
+    def test_save_without_the_tracked_field_leaves_counts(self):
+        student = StudentProfile.objects.get(pk=self.students[0].pk)
+        student.status = 'ACTIVE'
+        student.save(update_fields=['whatsapp'])
+        self.assertEqual(self.student_counts(), {'APPROVED': 3})
+        self.assertMatchesRecount()
+
+    def test_deferred_status_is_read_from_the_database(self):
+        StudentProfile.objects.filter(pk=self.students[0].pk).update(status='ACTIVE')
+        reconcile(['student_status'])
+
+        student = StudentProfile.objects.only('id', 'whatsapp').get(pk=self.students[0].pk)
+        student.whatsapp = '0813'
+        student.save()
+        student.delete()
+        self.assertEqual(self.student_counts(), {'APPROVED': 2})
+        self.assertMatchesRecount()
+
+    def test_update_counted_moves_exactly_the_updated_rows(self):
+        self.students[2].status = 'PENDING'
+        self.students[2].save()
+
+        updated = update_counted(StudentProfile.objects.exclude(pk=self.students[0].pk), status='AT_RISK')
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.student_counts(), {'APPROVED': 1, 'AT_RISK': 2})
+        self.assertMatchesRecount()
+
+    def test_record_created_counts_bulk_inserts(self):
+        users = User.objects.bulk_create([
+            User(email=f'b{i}@student.prasetiyamulya.ac.id', role='STUDENT') for i in range(2)
+        ])
+        profiles = StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, full_name='B', nim=f'b{i}', program='MN', angkatan='2022', gender='L',
+                           whatsapp='0812', status='PENDING')
+            for i, user in enumerate(users)
+        ])
+        record_created(profiles)
+        self.assertEqual(self.student_counts(), {'APPROVED': 3, 'PENDING': 2})
+        self.assertMatchesRecount()
+
+
+class ExportTests(TestCase):
+    ROWS = [('=HYPERLINK("http://x")', '+62812', '-1', '@SUM(A1)', '\tx', 'PT Contoh', -1, None)]
+
+    def test_formula_prefixes_are_neutralized(self):
+        self.assertEqual(
+            [neutralize(value) for value in self.ROWS[0]],
+            ["'=HYPERLINK(\"http://x\")", "'+62812", "'-1", "'@SUM(A1)", "'\tx", 'PT Contoh', -1, None],
+        )
+
+    def test_csv_cells_are_neutralized(self):
+        text = ''.join(iter_csv(['a'] * 8, iter(self.ROWS)))
+        self.assertIn("'=HYPERLINK", text)
+        self.assertNotIn(',=', text)
+
+    def test_xlsx_cells_are_text(self):
+        from openpyxl import load_workbook
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.xlsx')
+            self.assertEqual(write_xlsx(['a'] * 8, iter(self.ROWS), path), 1)
+            cells = [cell.value for cell in next(load_workbook(path).active.iter_rows(min_row=2))]
+        self.assertEqual(cells[0], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(cells[6], -1)
+
+
+class TokenLoginTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='budi@contoh.co.id', role='SUPERVISOR')
+        self.url = reverse('token_login', args=[LoginToken.issue_bulk([self.user.pk])[self.user.pk]])
+        self.client = Client(enforce_csrf_checks=True)
+
+    def test_get_only_asks_for_confirmation(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Lanjutkan')
+        self.assertIsNone(LoginToken.objects.get().used_at)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_post_needs_a_csrf_token(self):
+        self.assertEqual(self.client.post(self.url).status_code, 403)
+        self.assertIsNone(LoginToken.objects.get().used_at)
+
+    def test_confirmed_post_logs_in_once(self):
+        self.client.get(self.url)
+        csrf = {'csrfmiddlewaretoken': self.client.cookies['csrftoken'].value}
+
+        self.assertRedirects(self.client.post(self.url, csrf), reverse('set_password'), fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
+        self.client.logout()
+        self.client.get(self.url)
+        csrf = {'csrfmiddlewaretoken': self.client.cookies['csrftoken'].value}
+        self.assertRedirects(self.client.post(self.url, csrf), reverse('login'), fetch_redirect_response=False)
+
+
+class HealthCheckTests(TestCase):
+    def test_answers_on_an_unlisted_host(self):
+        response = self.client.get('/healthz', HTTP_HOST='172.19.0.2:8000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok', 'databases': {'default': 'ok'}})
+
+    def test_failure_details_are_logged_not_returned(self):
+        failing = mock.patch.object(connections['default'], 'cursor', side_effect=DatabaseError('password for db'))
+        with failing, self.assertLogs('core.views', 'ERROR'):
+            response = self.client.get('/healthz')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'status': 'error', 'databases': {'default': 'error'}})
+        self.assertNotIn(b'password', response.content)
+
+    def test_other_paths_still_check_the_host(self):
+        self.assertEqual(self.client.get('/', HTTP_HOST='172.19.0.2:8000').status_code, 400)
+
+
+class GarbageCollectionTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = User.objects.create_user(email='budi@contoh.co.id', role='SUPERVISOR')
+
+    def collected(self, name):
+        """Pks of the rows collector ``name`` selects now"""
+        return set(getattr(gc, name)(self.now).values_list('pk', flat=True))
+
+    def ago(self, days):
+        return self.now - timedelta(days=days)
+
+    def test_expired_sessions(self):
+        Session.objects.create(session_key='old', session_data='', expire_date=self.ago(1))
+        Session.objects.create(session_key='live', session_data='', expire_date=self.ago(-1))
+        self.assertEqual(self.collected('expired_sessions'), {'old'})
+
+    def test_stale_login_tokens(self):
+        LoginToken.issue_bulk([self.user.pk])
+        LoginToken.issue_bulk([self.user.pk])
+        LoginToken.issue_bulk([self.user.pk])
+        expired, used, fresh = LoginToken.objects.order_by('pk')
+        LoginToken.objects.filter(pk=expired.pk).update(expires_at=self.ago(8))
+        LoginToken.objects.filter(pk=used.pk).update(used_at=self.ago(8))
+        LoginToken.objects.filter(pk=fresh.pk).update(expires_at=self.ago(6), used_at=self.ago(6))
+        self.assertEqual(self.collected('stale_login_tokens'), {expired.pk, used.pk})
+
+    def test_delivered_emails(self):
+        emails = OutboundEmail.objects.bulk_create(
+            [OutboundEmail.build('a@contoh.co.id', 'Halo', 'Isi') for _ in range(4)],
+        )
+        OutboundEmail.objects.filter(pk=emails[0].pk).update(status='SENT', sent_at=self.ago(31))
+        OutboundEmail.objects.filter(pk=emails[1].pk).update(status='SENT', sent_at=self.ago(29))
+        OutboundEmail.objects.filter(pk=emails[2].pk).update(status='FAILED', created_at=self.ago(91))
+        OutboundEmail.objects.filter(pk=emails[3].pk).update(created_at=self.ago(91))
+        self.assertEqual(self.collected('delivered_emails'), {emails[0].pk, emails[2].pk})
+
+    def test_past_reminders(self):
+        supervisor = make_supervisor('sari@contoh.co.id')
+        placement = make_placement(make_student('s@student.prasetiyamulya.ac.id'), supervisor)
+        reminders = [
+            EvaluationReminder.objects.create(
+                evaluation=Evaluation.objects.create(
+                    placement=placement, supervisor=supervisor, evaluation_type=evaluation_type, period_month=2,
+                    deadline=self.ago(days).date(),
+                ),
+                days_before_deadline=1,
+            )
+            for evaluation_type, days in [('UTS', 181), ('UAS', 179)]
+        ]
+        self.assertEqual(self.collected('past_reminders'), {reminders[0].pk})
+
+    def test_finished_fanouts(self):
+        jobs = [
+            NotificationFanout.create_for(User.objects.all(), title='Halo', message='Isi') for _ in range(3)
+        ]
+        NotificationFanout.objects.filter(pk=jobs[0].pk).update(status='DONE', updated_at=self.ago(31))
+        NotificationFanout.objects.filter(pk=jobs[1].pk).update(status='FAILED', updated_at=self.ago(29))
+        NotificationFanout.objects.filter(pk=jobs[2].pk).update(updated_at=self.ago(31))
+        self.assertEqual(self.collected('finished_fanouts'), {jobs[0].pk})
+
+    def test_run_deletes_in_batches(self):
+        for i in range(5):
+            Session.objects.create(session_key=f'old{i}', session_data='', expire_date=self.ago(1))
+
+        self.assertEqual(gc.run(['sessions'], dry_run=True)[0]['rows'], 5)
+        self.assertEqual(Session.objects.count(), 5)
+        self.assertEqual(gc.run(['sessions'], batch_size=2, pause=0)[0]['rows'], 5)
+        self.assertFalse(Session.objects.exists())
+
+    def test_collect_stops_when_a_batch_deletes_nothing(self):
+        Session.objects.create(session_key='old', session_data='', expire_date=self.ago(1))
+        with mock.patch('django.db.models.query.QuerySet.delete', return_value=(0, {})) as delete:
+            self.assertEqual(gc.collect(Session.objects.all(), batch_size=10, pause=0), 0)
+        self.assertEqual(delete.call_count, 1)
+
+
+class SlidingSessionTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(email='budi@contoh.co.id', role='SUPERVISOR'))
+
+    def test_sessions_live_in_their_own_cache(self):
+        self.client.get('/')
+        key = self.client.session.cache_key
+        caches['default'].clear()
+        self.assertIsNotNone(caches['sessions'].get(key))
+
+    def test_expiry_is_refreshed_once_per_interval(self):
+        self.client.get('/')
+        refreshed_at = self.client.session[REFRESHED_AT]
+        with mock.patch('core.middleware.time.time', return_value=refreshed_at + 1):
+            self.client.get('/')
+        self.assertEqual(self.client.session[REFRESHED_AT], refreshed_at)
+
+    def test_unknown_session_is_not_created(self):
+        self.client.logout()
+        self.client.cookies['sessionid'] = 'unknown'
+        self.client.get('/')
+        self.assertFalse(self.client.cookies['sessionid'].value)
+
+
+class ReplicaPinTests(TestCase):
+    def test_post_pins_the_client_when_a_replica_is_configured(self):
+        self.assertNotIn(db_router.PIN_COOKIE, self.client.post(reverse('login')).cookies)
+        with mock.patch.dict(settings.DATABASES, {db_router.REPLICA: settings.DATABASES['default']}):
+            self.assertNotIn(db_router.PIN_COOKIE, self.client.get(reverse('login')).cookies)
+            cookie = self.client.post(reverse('login')).cookies[db_router.PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+
+    def test_pinned_client_skips_the_replica(self):
+        @db_router.replica_reads
+        def view(request):
+            return HttpResponse(str(db_router._use_replica.get()))
+
+        factory = RequestFactory()
+        self.assertEqual(view(factory.get('/')).content, b'True')
+        factory.cookies[db_router.PIN_COOKIE] = '1'
+        self.assertEqual(view(factory.get('/')).content, b'False')
@@ -1,14 +1,39 @@
+import logging
+
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.forms import SetPasswordForm
 from django.contrib import messages
+from django.views.decorators.http import condition, require_http_methods
+from django.views.decorators.vary import vary_on_cookie
+from accounts.models import LoginToken, SupervisorProfile
 from internships.models import JobPosting
+from core.cache import anonymous_page_etag, cache_anonymous_page
+
+logger = logging.getLogger(__name__)
+
+
+def redirect_to_dashboard(user):
+    """Redirect based on role"""
+    if user.role == 'STUDENT':
+        return redirect('student:dashboard')
+    elif user.role == 'SUPERVISOR':
+        return redirect('supervisor:dashboard')
+    elif user.role == 'ADMIN':
+        return redirect('/admin/')
+    return redirect('home')
 
 
+@vary_on_cookie
+@condition(etag_func=anonymous_page_etag)
+@cache_anonymous_page
 def home(request):
     """Landing page"""
-    # Show featured job postings
-    featured_jobs = JobPosting.objects.filter(status='OPEN').order_by('-created_at')[:6]
+    # Show featured job postings (lazy: only read when the template fragment is not cached)
+    featured_jobs = JobPosting.objects.open()[:6]
 
     context = {
         'featured_jobs': featured_jobs,
@@ -16,6 +41,25 @@ def home(request):
     return render(request, 'core/home.html', context)
 
 
+def healthz(request):
+    """Health check for the load balancer: 503 when any configured database does not answer
+
+    Served by HealthCheckMiddleware before the Host header is validated.
+    The response only says which alias failed; the error itself is logged.
+    """
+    databases = {}
+    for alias in connections:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+            databases[alias] = 'ok'
+        except DatabaseError:
+            logger.exception('Health check: database %r is unavailable', alias)
+            databases[alias] = 'error'
+    healthy = all(status == 'ok' for status in databases.values())
+    return JsonResponse({'status': 'ok' if healthy else 'error', 'databases': databases}, status=200 if healthy else 503)
+
+
 def login_view(request):
     """Login page"""
     if request.user.is_authenticated:
@@ -31,13 +75,9 @@ def login_view(request):
             login(request, user)
             messages.success(request, f'Selamat datang, {user.email}!')
 
-            # Redirect based on role
-            if user.role == 'STUDENT':
-                return redirect('student:dashboard')
-            elif user.role == 'SUPERVISOR':
-                return redirect('supervisor:dashboard')
-            elif user.role == 'ADMIN':
-                return redirect('/admin/')
+            if user.force_password_change:
+                return redirect('set_password')
+            return redirect_to_dashboard(user)
         else:
             messages.error(request, 'Email atau password salah.')
 
@@ -50,3 +90,40 @@ def logout_view(request):
     logout(request)
     messages.success(request, 'Anda telah logout.')
     return redirect('home')
+
+
+@require_http_methods(['GET', 'POST'])
+def token_login(request, token):
+    """Log in with a one-time link (e.g. new supervisor accounts) and ask for a password
+
+    GET only shows a confirmation button: link scanners and previews that
+    fetch the URL must not use up the token. The CSRF-protected POST redeems it.
+    """
+    if request.method != 'POST':
+        return render(request, 'core/token_login.html')
+
+    user = LoginToken.redeem(token)
+    if user is None:
+        messages.error(request, 'Tautan login tidak valid, sudah digunakan, atau sudah kedaluwarsa.')
+        return redirect('login')
+
+    login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+    messages.success(request, f'Selamat datang, {user.email}! Silakan buat password Anda.')
+    return redirect('set_password')
+
+
+@login_required
+def set_password(request):
+    """Choose a password after logging in with a one-time link"""
+    form = SetPasswordForm(request.user, request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        user = form.save(commit=False)
+        user.force_password_change = False
+        user.save()
+        if user.role == 'SUPERVISOR':
+            SupervisorProfile.objects.filter(user=user).update(is_first_login=False)
+        update_session_auth_hash(request, user)
+        messages.success(request, 'Password berhasil disimpan.')
+        return redirect_to_dashboard(user)
+
+    return render(request, 'core/set_password.html', {'form': form})
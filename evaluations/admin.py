@@ -1,7 +1,10 @@
 from django.contrib import admin
+from django.template.response import TemplateResponse
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.safestring import mark_safe
+from core.dashboard import update_counted
+from .cache import bump_analytics_version
 from .models import Evaluation, EvaluationReminder
 
 
@@ -12,6 +15,7 @@ class EvaluationAdmin(admin.ModelAdmin):
     search_fields = ['placement__student__full_name', 'placement__student__nim', 'supervisor__full_name', 'placement__company_name']
     ordering = ['-created_at']
     date_hierarchy = 'deadline'
+    change_list_template = 'admin/evaluations/evaluation/change_list.html'
 
     fieldsets = (
         ('Evaluation Info', {
@@ -49,6 +53,13 @@ class EvaluationAdmin(admin.ModelAdmin):
             'fields': ('achievements_description', 'strengths', 'improvements_needed', 'career_recommendation'),
             'classes': ('collapse',)
         }),
+        ('Rata-rata Kategori', {
+            'fields': (
+                'quality_average', 'productivity_average', 'knowledge_average', 'discipline_average',
+                'teamwork_average', 'communication_average', 'professionalism_average',
+            ),
+            'classes': ('collapse',)
+        }),
         ('Penilaian Akhir', {
             'fields': ('overall_rating', 'pass_recommendation', 'rehire_willingness')
         }),
@@ -57,7 +68,35 @@ class EvaluationAdmin(admin.ModelAdmin):
         }),
     )
 
-    readonly_fields = ['submitted_at', 'created_at']
+    readonly_fields = [
+        'submitted_at', 'created_at',
+        'quality_average', 'productivity_average', 'knowledge_average', 'discipline_average',
+        'teamwork_average', 'communication_average', 'professionalism_average',
+    ]
+
+    def get_urls(self):
+        return [
+            path(
+                'analytics/',
+                self.admin_site.admin_view(self.analytics_view),
+                name='evaluations_evaluation_analytics',
+            ),
+        ] + super().get_urls()
+
+    def analytics_view(self, request):
+        """Category means, pass/rehire rates and distributions of submitted evaluations"""
+        from .analytics import get_summary
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Evaluation Analytics',
+            'opts': self.model._meta,
+            'summary': get_summary(),
+        }
+        return TemplateResponse(request, 'admin/evaluations/evaluation/analytics.html', context)
+
+    def save_model(self, request, obj, form, change):
+        obj.calculate_overall_rating()
+        super().save_model(request, obj, form, change)
 
     def student_name(self, obj):
         return obj.placement.student.full_name
@@ -96,42 +135,48 @@ class EvaluationAdmin(admin.ModelAdmin):
             return format_html('<span style="color: gray;">{} days</span>', delta)
     days_remaining.short_description = 'Time Remaining'
 
-    actions = ['calculate_ratings', 'mark_submitted', 'send_reminder']
+    actions = ['calculate_ratings', 'mark_submitted', 'send_reminder', 'export_csv']
 
     def calculate_ratings(self, request, queryset):
-        updated = 0
-        for evaluation in queryset:
-            evaluation.calculate_overall_rating()
-            updated += 1
+        updated = queryset.recompute_ratings()
         self.message_user(request, f'{updated} evaluations calculated.')
     calculate_ratings.short_description = 'Calculate overall ratings'
 
     def mark_submitted(self, request, queryset):
         from django.utils import timezone
-        updated = queryset.filter(status='DRAFT').update(
+        updated = update_counted(
+            queryset.filter(status='DRAFT'),
             status='SUBMITTED',
             submitted_at=timezone.now()
         )
+        bump_analytics_version()
         self.message_user(request, f'{updated} evaluations marked as submitted.')
     mark_submitted.short_description = 'Mark as submitted'
 
     def send_reminder(self, request, queryset):
-        """Send reminder notification to supervisors"""
-        from notifications.models import Notification
-        count = 0
-        for evaluation in queryset.filter(status__in=['PENDING', 'DRAFT']):
-            Notification.send_to_user(
-                user=evaluation.supervisor.user,
-                title=f'Reminder: Evaluasi {evaluation.get_evaluation_type_display()}',
-                message=f'Anda memiliki evaluasi yang perlu diselesaikan untuk mahasiswa {evaluation.placement.student.full_name}. Deadline: {evaluation.deadline.strftime("%d %B %Y")}',
-                notification_type='WARNING',
-                category='EVALUATION',
-                link=f'/supervisor/evaluations/{evaluation.id}/'
+        """Send reminder notification and email to supervisors"""
+        from notifications.models import Notification, OutboundEmail
+        from .reminders import build_reminder, build_reminder_email
+        notifications, emails = [], []
+        for evaluation in queryset.filter(status__in=['PENDING', 'DRAFT']).select_related('supervisor__user'):
+            args = (
+                evaluation.id,
+                evaluation.get_evaluation_type_display(),
+                evaluation.deadline,
+                evaluation.placement.student.full_name,
             )
-            count += 1
-        self.message_user(request, f'{count} reminder(s) sent to supervisors.')
+            notifications.append(build_reminder(*args, evaluation.supervisor.user_id))
+            emails.append(build_reminder_email(*args, evaluation.supervisor.user.email))
+        Notification.send_bulk(notifications)
+        OutboundEmail.enqueue_bulk(emails)
+        self.message_user(request, f'{len(notifications)} reminder(s) sent to supervisors.')
     send_reminder.short_description = 'Send reminder to supervisors'
 
+    def export_csv(self, request, queryset):
+        from core.exports import csv_response
+        return csv_response('evaluations', queryset)
+    export_csv.short_description = 'Export CSV'
+
     def get_queryset(self, request):
         """Optimize queryset with select_related"""
         qs = super().get_queryset(request)
@@ -140,7 +185,7 @@ class EvaluationAdmin(admin.ModelAdmin):
 
 @admin.register(EvaluationReminder)
 class EvaluationReminderAdmin(admin.ModelAdmin):
-    list_display = ['evaluation', 'days_before_deadline', 'sent_at']
+    list_display = ['evaluation', 'days_before_deadline', 'sent_at', 'run_id']
     list_filter = ['days_before_deadline', 'sent_at']
     search_fields = ['evaluation__placement__student__full_name']
     ordering = ['-sent_at']
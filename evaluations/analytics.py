@@ -0,0 +1,146 @@
+import time
+
+import numpy as np
+from django.core.cache import cache
+
+from accounts.models import StudentProfile
+from .cache import get_analytics_version
+from .models import Evaluation, RATING_CATEGORIES, RATING_FIELDS
+
+CACHE_TIMEOUT = 60 * 15
+COMPANY_LIMIT = 50
+
+GROUPINGS = {
+    'company': ('Perusahaan', 'placement__company_name'),
+    'program': ('Program Studi', 'placement__student__program'),
+    'angkatan': ('Angkatan', 'placement__student__angkatan'),
+}
+RATING_BINS = [1, 2, 3, 4, 5]
+
+
+CATEGORY_COLUMNS = [column for column, _ in RATING_CATEGORIES.values()]
+
+
+def load_arrays(queryset=None):
+    """Scores and group labels of submitted evaluations, fetched with one values_list query
+
+    Returns ``(scores, categories, overall, passed, rehired, labels)``: an
+    (n, 23) float array of criterion scores, the stored (n, 7) category
+    averages and overall ratings, all with NaN for blanks, two boolean arrays
+    and a label array per grouping.
+    """
+    if queryset is None:
+        queryset = Evaluation.objects.filter(status='SUBMITTED')
+    group_fields = [field for _, field in GROUPINGS.values()]
+    rows = list(
+        queryset.order_by().values_list(
+            *RATING_FIELDS, *CATEGORY_COLUMNS, 'overall_rating', 'pass_recommendation', 'rehire_willingness',
+            *group_fields,
+        )
+    )
+
+    width = len(RATING_FIELDS)
+    averages = width + len(CATEGORY_COLUMNS)
+    data = np.array(rows, dtype=object).reshape(len(rows), averages + 3 + len(group_fields))
+    scores = data[:, :width].astype(float)
+    categories = data[:, width:averages].astype(float)
+    overall = data[:, averages].astype(float)
+    passed = data[:, averages + 1].astype(bool)
+    rehired = data[:, averages + 2].astype(bool)
+    labels = {
+        grouping: data[:, averages + 3 + index].astype(str)
+        for index, grouping in enumerate(GROUPINGS)
+    }
+    return scores, categories, overall, passed, rehired, labels
+
+
+def group_means(inverse, size, values):
+    """Mean of ``values`` per group index, ignoring NaN"""
+    valid = ~np.isnan(values)
+    totals = np.bincount(inverse[valid], weights=values[valid], minlength=size)
+    counts = np.bincount(inverse[valid], minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return totals / counts
+
+
+def _rounded(value, digits=2):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def summarize(scores, categories, overall, passed, rehired, labels):
+    """Category means, pass/rehire rates and distributions, overall and per grouping"""
+    total = len(scores)
+
+    summary = {
+        'total': total,
+        'categories': list(RATING_CATEGORIES),
+        'overall': {
+            'categories': [_rounded(np.nanmean(column)) if total else None for column in categories.T],
+            'rating': _rounded(np.nanmean(overall)) if total else None,
+            'pass_rate': _rounded(passed.mean() * 100, 1) if total else None,
+            'rehire_rate': _rounded(rehired.mean() * 100, 1) if total else None,
+        },
+    }
+
+    rated = overall[~np.isnan(overall)]
+    counts, _ = np.histogram(rated, bins=RATING_BINS)
+    summary['rating_distribution'] = [
+        {
+            'label': f'{low} – {high}',
+            'count': int(count),
+            'percent': round(float(count) * 100 / len(rated), 1) if len(rated) else 0,
+        }
+        for low, high, count in zip(RATING_BINS, RATING_BINS[1:], counts)
+    ]
+
+    # How often each score (1-5) was given, per category
+    columns = {field: index for index, field in enumerate(RATING_FIELDS)}
+    summary['score_distribution'] = []
+    for category, (_, fields) in RATING_CATEGORIES.items():
+        values = scores[:, [columns[field] for field in fields]].ravel()
+        values = values[~np.isnan(values)].astype(int)
+        counts = np.bincount(values, minlength=6)[1:6]
+        summary['score_distribution'].append({'category': category, 'counts': counts.tolist()})
+
+    summary['groups'] = {}
+    for grouping, (title, _) in GROUPINGS.items():
+        program_labels = dict(StudentProfile.PROGRAM_CHOICES) if grouping == 'program' else {}
+        names, inverse = np.unique(labels[grouping], return_inverse=True)
+        size = len(names)
+        sizes = np.bincount(inverse, minlength=size)
+        category_means = np.column_stack([group_means(inverse, size, column) for column in categories.T]) \
+            if size else np.empty((0, len(RATING_CATEGORIES)))
+        overall_means = group_means(inverse, size, overall)
+        pass_rates = np.bincount(inverse, weights=passed, minlength=size) / np.maximum(sizes, 1) * 100
+        rehire_rates = np.bincount(inverse, weights=rehired, minlength=size) / np.maximum(sizes, 1) * 100
+
+        order = np.argsort(-sizes, kind='stable')
+        if grouping == 'company':
+            order = order[:COMPANY_LIMIT]
+        summary['groups'][grouping] = {
+            'title': title,
+            'rows': [
+                {
+                    'name': program_labels.get(str(names[index]), str(names[index])),
+                    'count': int(sizes[index]),
+                    'categories': [_rounded(value) for value in category_means[index]],
+                    'rating': _rounded(overall_means[index]),
+                    'pass_rate': _rounded(pass_rates[index], 1),
+                    'rehire_rate': _rounded(rehire_rates[index], 1),
+                }
+                for index in order
+            ],
+        }
+    return summary
+
+
+def get_summary():
+    """Analytics summary of submitted evaluations, recomputed only when evaluations change"""
+    key = f'evaluations:analytics:{get_analytics_version()}'
+    summary = cache.get(key)
+    if summary is None:
+        started = time.perf_counter()
+        summary = summarize(*load_arrays())
+        summary['computed_in'] = time.perf_counter() - started
+        cache.set(key, summary, CACHE_TIMEOUT)
+    return summary
@@ -0,0 +1,12 @@
+from core.cache import bump_version, get_version
+
+ANALYTICS_VERSION_KEY = 'evaluations:analytics_version'
+
+
+def get_analytics_version():
+    """Version number of the evaluation data, bumped whenever evaluations change"""
+    return get_version(ANALYTICS_VERSION_KEY)
+
+
+def bump_analytics_version():
+    return bump_version(ANALYTICS_VERSION_KEY)
@@ -118,7 +118,7 @@ class EvaluationForm(forms.ModelForm):
 
     def save(self, commit=True):
         evaluation = super().save(commit=False)
-        # Auto-calculate overall rating
+        # Auto-calculate overall rating and category averages, stored by the same save
         evaluation.calculate_overall_rating()
         if commit:
             evaluation.save()
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from evaluations.models import Evaluation
+
+
+class Command(BaseCommand):
+    help = 'Recalculate overall_rating and the category averages of every evaluation with a single UPDATE'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = Evaluation.objects.recompute_ratings()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Recomputed ratings for {updated} evaluations in {elapsed:.2f}s'))
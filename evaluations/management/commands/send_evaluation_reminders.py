@@ -0,0 +1,24 @@
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from evaluations.reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Remind supervisors about PENDING/DRAFT evaluations at the configured days-before-deadline '
+        'thresholds (EVALUATION_REMINDER_DAYS). Meant to run daily; safe to run repeatedly and concurrently.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='Run as if today were this date (YYYY-MM-DD)')
+        parser.add_argument('--days', type=int, nargs='+', help=f'Override thresholds (default: {settings.EVALUATION_REMINDER_DAYS})')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        sent = send_due_reminders(today=options['date'], thresholds=options['days'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} evaluation reminders in {elapsed:.2f}s'))
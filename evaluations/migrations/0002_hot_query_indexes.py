@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('evaluations', '0001_initial'),
+        ('internships', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['supervisor', 'status'], name='evaluation_sup_status_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationreminder',
+            name='run_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Scheduler run that created this reminder', max_length=32),
+        ),
+        migrations.AddConstraint(
+            model_name='evaluationreminder',
+            constraint=models.UniqueConstraint(fields=('evaluation', 'days_before_deadline'), name='unique_reminder_per_threshold'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:05
+
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, NullIf, Round
+
+# A copy of the rating categories and averaging as they were when this
+# migration was written (see evaluations.models)
+RATING_CATEGORIES = {
+    'quality_average': ['accuracy', 'neatness', 'task_completion', 'creativity'],
+    'productivity_average': ['work_quantity', 'work_speed', 'consistency'],
+    'knowledge_average': ['task_understanding', 'technical_skills', 'theory_application', 'learning_willingness'],
+    'discipline_average': ['punctuality', 'rule_compliance', 'responsibility'],
+    'teamwork_average': ['teamwork', 'discussion_contribution', 'respect_opinions'],
+    'communication_average': ['verbal_communication', 'written_communication', 'presentation_skills'],
+    'professionalism_average': ['appearance', 'ethics', 'accept_criticism'],
+}
+
+
+def average_expression(fields):
+    total = sum((Case(When(**{f'{field}__isnull': False}, then=F(field)), default=Value(0)) for field in fields), Value(0))
+    count = sum((Case(When(**{f'{field}__isnull': False}, then=Value(1)), default=Value(0)) for field in fields), Value(0))
+    return Round(Cast(total, FloatField()) / NullIf(Cast(count, FloatField()), Value(0.0)), 2)
+
+
+def recompute_ratings(apps, schema_editor):
+    Evaluation = apps.get_model('evaluations', 'Evaluation')
+    updates = {column: average_expression(fields) for column, fields in RATING_CATEGORIES.items()}
+    updates['overall_rating'] = average_expression(
+        [field for fields in RATING_CATEGORIES.values() for field in fields]
+    )
+    Evaluation.objects.update(**updates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0003_reminder_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluation',
+            name='communication_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Komunikasi'),
+        ),
+        migrations.AddField(
+            model_name='evaluation',
+            name='discipline_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Kedisiplinan'),
+        ),
+        migrations.AddField(
+            model_name='evaluation',
+            name='knowledge_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Pengetahuan'),
+        ),
+        migrations.AddField(
+            model_name='evaluation',
+            name='productivity_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Produktivitas'),
+        ),
+        migrations.AddField(
+            model_name='evaluation',
+            name='professionalism_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Sikap Profesional'),
+        ),
+        migrations.AddField(
+            model_name='evaluation',
+            name='quality_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Kualitas Kerja'),
+        ),
+        migrations.AddField(
+            model_name='evaluation',
+            name='teamwork_average',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Auto-calculated', max_digits=3, null=True, verbose_name='Kerjasama'),
+        ),
+        migrations.RunPython(recompute_ratings, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,72 @@
+from decimal import Decimal, ROUND_HALF_UP
+
 from django.db import models
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, NullIf, Round
 from django.core.validators import MinValueValidator, MaxValueValidator
 from internships.models import InternshipPlacement
 from accounts.models import SupervisorProfile, User
 
 
+# Category label -> (stored average column, criteria fields)
+RATING_CATEGORIES = {
+    'Kualitas Kerja': ('quality_average', ['accuracy', 'neatness', 'task_completion', 'creativity']),
+    'Produktivitas': ('productivity_average', ['work_quantity', 'work_speed', 'consistency']),
+    'Pengetahuan': ('knowledge_average', ['task_understanding', 'technical_skills', 'theory_application', 'learning_willingness']),
+    'Kedisiplinan': ('discipline_average', ['punctuality', 'rule_compliance', 'responsibility']),
+    'Kerjasama': ('teamwork_average', ['teamwork', 'discussion_contribution', 'respect_opinions']),
+    'Komunikasi': ('communication_average', ['verbal_communication', 'written_communication', 'presentation_skills']),
+    'Sikap Profesional': ('professionalism_average', ['appearance', 'ethics', 'accept_criticism']),
+}
+RATING_FIELDS = [field for _, fields in RATING_CATEGORIES.values() for field in fields]
+
+
+def average_score(scores):
+    """Mean of the given scores ignoring blanks, rounded to 2 places; None when all are blank"""
+    valid_scores = [score for score in scores if score is not None]
+    if not valid_scores:
+        return None
+    return (Decimal(sum(valid_scores)) / len(valid_scores)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def average_expression(fields):
+    """SQL equivalent of ``average_score`` over the given columns"""
+    total = sum((Case(When(**{f'{field}__isnull': False}, then=F(field)), default=Value(0)) for field in fields), Value(0))
+    count = sum((Case(When(**{f'{field}__isnull': False}, then=Value(1)), default=Value(0)) for field in fields), Value(0))
+    return Round(
+        Cast(total, FloatField()) / NullIf(Cast(count, FloatField()), Value(0.0)),
+        2,
+    )
+
+
+def rating_updates():
+    """Column -> expression mapping for ``update()``, recomputing every stored rating"""
+    updates = {column: average_expression(fields) for column, fields in RATING_CATEGORIES.values()}
+    updates['overall_rating'] = average_expression(RATING_FIELDS)
+    return updates
+
+
+class EvaluationQuerySet(models.QuerySet):
+    def recompute_ratings(self):
+        """Recalculate overall and category ratings for every row with a single UPDATE"""
+        from .cache import bump_analytics_version
+        updated = self.update(**rating_updates())
+        bump_analytics_version()
+        return updated
+
+
+def average_field(verbose_name):
+    return models.DecimalField(
+        verbose_name,
+        max_digits=3,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Auto-calculated",
+    )
+
+
 class Evaluation(models.Model):
     """UTS and UAS evaluations by supervisors"""
 
@@ -188,6 +251,15 @@ class Evaluation(models.Model):
         help_text="Bersedia terima mahasiswa lagi?"
     )
 
+    # Category averages (auto-calculated with overall_rating)
+    quality_average = average_field('Kualitas Kerja')
+    productivity_average = average_field('Produktivitas')
+    knowledge_average = average_field('Pengetahuan')
+    discipline_average = average_field('Kedisiplinan')
+    teamwork_average = average_field('Kerjasama')
+    communication_average = average_field('Komunikasi')
+    professionalism_average = average_field('Sikap Profesional')
+
     # Status and metadata
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     deadline = models.DateField()
@@ -196,42 +268,26 @@ class Evaluation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EvaluationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ['placement', 'evaluation_type']
         verbose_name = 'Evaluation'
         verbose_name_plural = 'Evaluations'
+        indexes = [
+            models.Index(fields=['supervisor', 'status'], name='evaluation_sup_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.evaluation_type} - {self.placement.student.full_name}"
 
     def calculate_overall_rating(self):
-        """Calculate overall rating from all criteria"""
-        criteria = [
-            # Kualitas Kerja
-            self.accuracy, self.neatness, self.task_completion, self.creativity,
-            # Produktivitas
-            self.work_quantity, self.work_speed, self.consistency,
-            # Pengetahuan
-            self.task_understanding, self.technical_skills, self.theory_application, self.learning_willingness,
-            # Kedisiplinan
-            self.punctuality, self.rule_compliance, self.responsibility,
-            # Kerjasama
-            self.teamwork, self.discussion_contribution, self.respect_opinions,
-            # Komunikasi
-            self.verbal_communication, self.written_communication, self.presentation_skills,
-            # Sikap Profesional
-            self.appearance, self.ethics, self.accept_criticism,
-        ]
-
-        # Filter out None values
-        valid_scores = [score for score in criteria if score is not None]
-
-        if valid_scores:
-            self.overall_rating = sum(valid_scores) / len(valid_scores)
-            self.save()
-            return self.overall_rating
-        return None
+        """Set overall_rating and the category averages from all criteria; the caller saves"""
+        for column, fields in RATING_CATEGORIES.values():
+            setattr(self, column, average_score(getattr(self, field) for field in fields))
+        self.overall_rating = average_score(getattr(self, field) for field in RATING_FIELDS)
+        return self.overall_rating
 
     def is_passing(self):
         """Check if student passes (minimum 3.0)"""
@@ -241,26 +297,11 @@ class Evaluation(models.Model):
 
     def get_category_averages(self):
         """Get average scores by category"""
-        categories = {
-            'Kualitas Kerja': [self.accuracy, self.neatness, self.task_completion, self.creativity],
-            'Produktivitas': [self.work_quantity, self.work_speed, self.consistency],
-            'Pengetahuan': [self.task_understanding, self.technical_skills, self.theory_application, self.learning_willingness],
-            'Kedisiplinan': [self.punctuality, self.rule_compliance, self.responsibility],
-            'Kerjasama': [self.teamwork, self.discussion_contribution, self.respect_opinions],
-            'Komunikasi': [self.verbal_communication, self.written_communication, self.presentation_skills],
-            'Sikap Profesional': [self.appearance, self.ethics, self.accept_criticism],
+        return {
+            category: average_score(getattr(self, field) for field in fields)
+            for category, (_, fields) in RATING_CATEGORIES.items()
         }
 
-        averages = {}
-        for category, scores in categories.items():
-            valid_scores = [s for s in scores if s is not None]
-            if valid_scores:
-                averages[category] = sum(valid_scores) / len(valid_scores)
-            else:
-                averages[category] = None
-
-        return averages
-
 
 class EvaluationReminder(models.Model):
     """Track reminders sent to supervisors"""
@@ -268,9 +309,13 @@ class EvaluationReminder(models.Model):
     evaluation = models.ForeignKey(Evaluation, on_delete=models.CASCADE, related_name='reminders')
     sent_at = models.DateTimeField(auto_now_add=True)
     days_before_deadline = models.IntegerField()
+    run_id = models.CharField(max_length=32, blank=True, db_index=True, help_text="Scheduler run that created this reminder")
 
     class Meta:
         ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(fields=['evaluation', 'days_before_deadline'], name='unique_reminder_per_threshold'),
+        ]
 
     def __str__(self):
         return f"Reminder for {self.evaluation} ({self.days_before_deadline} days before)"
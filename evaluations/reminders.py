@@ -0,0 +1,108 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from notifications.models import Notification, OutboundEmail
+from .models import Evaluation, EvaluationReminder
+
+
+def build_reminder(evaluation_id, evaluation_type_display, deadline, student_name, recipient_id):
+    """Unsaved reminder notification for a supervisor"""
+    return Notification(
+        recipient_id=recipient_id,
+        title=f'Reminder: Evaluasi {evaluation_type_display}',
+        message=f'Anda memiliki evaluasi yang perlu diselesaikan untuk mahasiswa {student_name}. Deadline: {deadline.strftime("%d %B %Y")}',
+        notification_type='WARNING',
+        category='EVALUATION',
+        link=reverse('supervisor:evaluation_form', args=[evaluation_id]),
+    )
+
+
+def build_reminder_email(evaluation_id, evaluation_type_display, deadline, student_name, email, dedup_key=None):
+    """Unsaved outbox email with the same reminder, linking to the evaluation form"""
+    link = settings.SITE_URL.rstrip('/') + reverse('supervisor:evaluation_form', args=[evaluation_id])
+    return OutboundEmail.build(
+        email,
+        f'Reminder: Evaluasi {evaluation_type_display} - {student_name}',
+        f'Anda memiliki evaluasi {evaluation_type_display} yang perlu diselesaikan untuk mahasiswa {student_name}.\n'
+        f'Deadline: {deadline.strftime("%d %B %Y")}\n\n{link}\n',
+        dedup_key=dedup_key,
+    )
+
+
+def due_threshold(days_left, thresholds):
+    """Tightest threshold that has been reached, e.g. 2 days left with [7, 3, 1] -> 3"""
+    reached = [threshold for threshold in thresholds if days_left <= threshold]
+    return min(reached) if reached else None
+
+
+def send_due_reminders(today=None, thresholds=None, batch_size=1000):
+    """Remind supervisors about PENDING/DRAFT evaluations that crossed a reminder threshold
+
+    Idempotent and safe to run from several machines at once: the
+    (evaluation, days_before_deadline) unique constraint lets only one run
+    insert a given reminder, and notifications are created only for the
+    reminder rows this run actually inserted (matched by ``run_id``).
+    Each reminder is also queued as an email, deduplicated per threshold.
+    Returns the number of reminders sent.
+    """
+    today = today or timezone.localdate()
+    thresholds = sorted(thresholds or settings.EVALUATION_REMINDER_DAYS)
+    type_labels = dict(Evaluation.TYPE_CHOICES)
+
+    candidates = list(
+        Evaluation.objects.filter(
+            status__in=['PENDING', 'DRAFT'],
+            deadline__gte=today,
+            deadline__lte=today + timedelta(days=max(thresholds)),
+        ).values_list(
+            'id', 'evaluation_type', 'deadline', 'placement__student__full_name',
+            'supervisor__user_id', 'supervisor__user__email',
+        )
+    )
+    if not candidates:
+        return 0
+
+    already_sent = set(
+        EvaluationReminder.objects.filter(
+            evaluation_id__in=[row[0] for row in candidates],
+        ).values_list('evaluation_id', 'days_before_deadline')
+    )
+
+    due = {}
+    for evaluation_id, evaluation_type, deadline, student_name, user_id, email in candidates:
+        threshold = due_threshold((deadline - today).days, thresholds)
+        if threshold is not None and (evaluation_id, threshold) not in already_sent:
+            due[evaluation_id] = (threshold, evaluation_type, deadline, student_name, user_id, email)
+    if not due:
+        return 0
+
+    run_id = uuid.uuid4().hex
+    with transaction.atomic():
+        EvaluationReminder.objects.bulk_create(
+            [
+                EvaluationReminder(evaluation_id=evaluation_id, days_before_deadline=threshold, run_id=run_id)
+                for evaluation_id, (threshold, *_) in due.items()
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        inserted = EvaluationReminder.objects.filter(run_id=run_id).values_list('evaluation_id', flat=True)
+
+        notifications, emails = [], []
+        for evaluation_id in inserted:
+            threshold, evaluation_type, deadline, student_name, user_id, email = due[evaluation_id]
+            label = type_labels[evaluation_type]
+            notifications.append(build_reminder(evaluation_id, label, deadline, student_name, user_id))
+            emails.append(build_reminder_email(
+                evaluation_id, label, deadline, student_name, email,
+                dedup_key=f'evaluation-reminder:{evaluation_id}:{threshold}',
+            ))
+        Notification.send_bulk(notifications, batch_size=batch_size)
+        OutboundEmail.enqueue_bulk(emails)
+
+    return len(notifications)
@@ -1,3 +1,95 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
 
-# Create your tests here.
+from core.testing import make_placement, make_student, make_supervisor
+from notifications.models import Notification, OutboundEmail
+
+from .analytics import get_summary
+from .models import RATING_FIELDS, Evaluation, EvaluationReminder
+from .reminders import due_threshold, send_due_reminders
+
+TODAY = date(2026, 3, 1)
+
+
+def make_evaluation(deadline, status='PENDING'):
+    student = make_student(f's{deadline:%m%d}{status}@student.prasetiyamulya.ac.id')
+    supervisor = make_supervisor(f'sup{deadline:%m%d}{status}@contoh.co.id')
+    placement = make_placement(
+        student, supervisor, start_date=TODAY, end_date=TODAY + timedelta(days=120), status='ACTIVE',
+    )
+    return Evaluation.objects.create(
+        placement=placement, supervisor=supervisor, evaluation_type='UTS', period_month=2,
+        deadline=deadline, status=status,
+    )
+
+
+class DueThresholdTests(TestCase):
+    def test_tightest_reached_threshold(self):
+        self.assertEqual(due_threshold(2, [1, 3, 7]), 3)
+        self.assertEqual(due_threshold(7, [1, 3, 7]), 7)
+        self.assertEqual(due_threshold(0, [1, 3, 7]), 1)
+        self.assertIsNone(due_threshold(8, [1, 3, 7]))
+
+
+class SendDueRemindersTests(TestCase):
+    def setUp(self):
+        self.due = make_evaluation(TODAY + timedelta(days=2))
+        self.later = make_evaluation(TODAY + timedelta(days=20))
+        self.submitted = make_evaluation(TODAY + timedelta(days=2), status='SUBMITTED')
+        self.overdue = make_evaluation(TODAY - timedelta(days=1))
+
+    def test_reminds_only_due_open_evaluations(self):
+        self.assertEqual(send_due_reminders(today=TODAY, thresholds=[1, 3, 7]), 1)
+
+        reminder = EvaluationReminder.objects.get()
+        self.assertEqual((reminder.evaluation, reminder.days_before_deadline), (self.due, 3))
+        self.assertEqual(Notification.objects.get().recipient, self.due.supervisor.user)
+        self.assertEqual(OutboundEmail.objects.get().dedup_key, f'evaluation-reminder:{self.due.pk}:3')
+
+    def test_rerunning_sends_nothing_new(self):
+        send_due_reminders(today=TODAY, thresholds=[1, 3, 7])
+        self.assertEqual(send_due_reminders(today=TODAY, thresholds=[1, 3, 7]), 0)
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_next_threshold_sends_again(self):
+        send_due_reminders(today=TODAY, thresholds=[1, 3, 7])
+        self.assertEqual(send_due_reminders(today=TODAY + timedelta(days=1), thresholds=[1, 3, 7]), 1)
+        self.assertEqual(
+            sorted(EvaluationReminder.objects.values_list('days_before_deadline', flat=True)), [1, 3],
+        )
+
+    def test_reminder_recorded_by_another_run_is_not_sent_twice(self):
+        EvaluationReminder.objects.create(evaluation=self.due, days_before_deadline=3, run_id='other')
+        self.assertEqual(send_due_reminders(today=TODAY, thresholds=[1, 3, 7]), 0)
+        self.assertFalse(Notification.objects.exists())
+
+
+class AnalyticsSummaryTests(TestCase):
+    def submit(self, evaluation, score, **fields):
+        for field in RATING_FIELDS:
+            setattr(evaluation, field, fields.get(field, score))
+        evaluation.status = 'SUBMITTED'
+        evaluation.pass_recommendation = score >= 3
+        evaluation.calculate_overall_rating()
+        evaluation.save()
+
+    def test_summary_uses_stored_averages(self):
+        self.submit(make_evaluation(TODAY), 4, accuracy=None)
+        self.submit(make_evaluation(TODAY + timedelta(days=1)), 2)
+        make_evaluation(TODAY + timedelta(days=2))
+
+        summary = get_summary()
+
+        self.assertEqual(summary['total'], 2)
+        self.assertEqual(summary['overall']['categories'][0], 3.0)
+        self.assertEqual(summary['overall']['rating'], 3.0)
+        self.assertEqual(summary['overall']['pass_rate'], 50.0)
+        self.assertEqual(summary['groups']['company']['rows'][0]['count'], 2)
+
+    def test_saving_an_evaluation_refreshes_the_summary(self):
+        evaluation = make_evaluation(TODAY)
+        self.assertEqual(get_summary()['total'], 0)
+        self.submit(evaluation, 5)
+        self.assertEqual(get_summary()['overall']['rating'], 5.0)
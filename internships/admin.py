@@ -1,6 +1,9 @@
-from django.contrib import admin
+import time
+
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from .models import Company, JobPosting, Application, InternshipPlacement
+from core.cache import bump_student_pages
 
 
 @admin.register(Company)
@@ -94,16 +97,19 @@ class ApplicationAdmin(admin.ModelAdmin):
     actions = ['mark_under_review', 'mark_accepted', 'mark_rejected']
 
     def mark_under_review(self, request, queryset):
+        bump_student_pages(queryset.values_list('student__user_id', flat=True))
         updated = queryset.update(status='UNDER_REVIEW')
         self.message_user(request, f'{updated} applications marked as under review.')
     mark_under_review.short_description = 'Mark as under review'
 
     def mark_accepted(self, request, queryset):
+        bump_student_pages(queryset.values_list('student__user_id', flat=True))
         updated = queryset.update(status='ACCEPTED')
         self.message_user(request, f'{updated} applications marked as accepted.')
     mark_accepted.short_description = 'Mark as accepted'
 
     def mark_rejected(self, request, queryset):
+        bump_student_pages(queryset.values_list('student__user_id', flat=True))
         updated = queryset.update(status='REJECTED')
         self.message_user(request, f'{updated} applications marked as rejected.')
     mark_rejected.short_description = 'Mark as rejected'
@@ -154,37 +160,45 @@ class InternshipPlacementAdmin(admin.ModelAdmin):
         )
     status_badge.short_description = 'Status'
 
-    actions = ['confirm_placement', 'complete_placement']
+    actions = ['confirm_placement', 'complete_placement', 'export_csv']
 
     def confirm_placement(self, request, queryset):
-        from django.utils import timezone
-        updated = 0
-        for placement in queryset.filter(status='PENDING_CONFIRMATION'):
-            placement.status = 'ACTIVE'
-            placement.confirmed_by = request.user
-            placement.confirmed_at = timezone.now()
-            placement.save()
-
-            # Update student status
-            placement.student.status = 'ACTIVE'
-            placement.student.save()
-
-            updated += 1
-
-        self.message_user(request, f'{updated} placements confirmed.')
+        from .services import activate_placements
+        started = time.perf_counter()
+        summary = activate_placements(
+            queryset.filter(status='PENDING_CONFIRMATION').values_list('pk', flat=True),
+            confirmed_by=request.user,
+            notify=True,
+        )
+        self.message_user(
+            request,
+            f"{summary['placements']} placements confirmed, "
+            f"{summary['supervisors_created']} supervisor accounts, "
+            f"{summary['evaluations_created']} evaluations and "
+            f"{summary['notifications']} notifications created in {time.perf_counter() - started:.2f}s."
+        )
+        if summary['supervisor_conflicts']:
+            self.message_user(
+                request,
+                f"{len(summary['supervisor_conflicts'])} placements have a supervisor email that belongs to "
+                f"a non-supervisor account and were left without a supervisor: "
+                f"{', '.join(map(str, summary['supervisor_conflicts']))}.",
+                level=messages.WARNING,
+            )
     confirm_placement.short_description = 'Confirm placement'
 
     def complete_placement(self, request, queryset):
-        updated = 0
-        for placement in queryset.filter(status='ACTIVE'):
-            placement.status = 'COMPLETED'
-            placement.save()
-
-            # Update student status
-            placement.student.status = 'COMPLETED'
-            placement.student.save()
-
-            updated += 1
-
-        self.message_user(request, f'{updated} placements completed.')
+        from .services import complete_placements
+        started = time.perf_counter()
+        summary = complete_placements(queryset.filter(status='ACTIVE').values_list('pk', flat=True))
+        self.message_user(
+            request,
+            f"{summary['placements']} placements and {summary['students']} students completed, "
+            f"{summary['notifications']} notifications sent in {time.perf_counter() - started:.2f}s."
+        )
     complete_placement.short_description = 'Mark as completed'
+
+    def export_csv(self, request, queryset):
+        from core.exports import csv_response
+        return csv_response('placements', queryset)
+    export_csv.short_description = 'Export CSV (with ratings and reports)'
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+
+from core.cache import bump_version, get_version
+
+JOB_BOARD_VERSION_KEY = 'internships:job_board_version'
+
+
+def get_job_board_version():
+    """Version number of the set of job postings, bumped on any JobPosting/Company change"""
+    return get_version(JOB_BOARD_VERSION_KEY)
+
+
+def bump_job_board_version():
+    return bump_version(JOB_BOARD_VERSION_KEY)
+
+
+def get_job_posting(job_id):
+    """JobPosting with its company, cached until the next job board change; None if there is none"""
+    from .models import JobPosting
+
+    key = f'internships:job:{job_id}:{get_job_board_version()}'
+    job = cache.get(key)
+    if job is None:
+        job = JobPosting.objects.select_related('company').filter(pk=job_id).first()
+        if job is not None:
+            cache.set(key, job, 60 * 60 * 24)
+    return job
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from internships import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the full-text job search index from all open job postings. Run it after bulk '
+        'changes that skip model signals, such as QuerySet.update() on JobPosting or Company.'
+    )
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('The job search index requires SQLite FTS5.')
+
+        started = time.perf_counter()
+        indexed = search.rebuild_index()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} job postings in {elapsed:.2f}s'))
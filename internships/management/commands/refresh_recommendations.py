@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import StudentProfile
+from internships.recommendations import recommend_for_students
+
+
+class Command(BaseCommand):
+    help = 'Score every student against the open job postings in batch and warm the recommendation cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        students = StudentProfile.objects.exclude(skill_tokens=[]).only('id', 'skill_tokens').order_by('id')
+        scored = 0
+        batch = []
+        for student in students.iterator(chunk_size=batch_size):
+            batch.append(student)
+            if len(batch) == batch_size:
+                recommend_for_students(batch)
+                scored += len(batch)
+                batch = []
+        if batch:
+            recommend_for_students(batch)
+            scored += len(batch)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Scored {scored} students in {elapsed:.2f}s'))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('internships', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['student', '-applied_at'], name='app_student_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipplacement',
+            index=models.Index(fields=['student', 'status'], name='placement_student_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipplacement',
+            index=models.Index(fields=['supervisor', 'status'], name='placement_sup_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='jobposting_open_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# Inlined rather than imported from internships.search, so later changes to that
+# module cannot alter what this migration does
+CREATE_INDEX = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS internships_jobposting_fts USING fts5(
+        title, description, requirements, location, company_name,
+        tokenize = "unicode61 remove_diacritics 2",
+        prefix = '2 3'
+    )
+'''
+POPULATE_INDEX = '''
+    INSERT INTO internships_jobposting_fts (rowid, title, description, requirements, location, company_name)
+    SELECT j.id, j.title, j.description, j.requirements, j.location, c.name
+    FROM internships_jobposting j
+    JOIN internships_company c ON c.id = j.company_id
+    WHERE j.status = 'OPEN'
+'''
+DROP_INDEX = 'DROP TABLE IF EXISTS internships_jobposting_fts'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CREATE_INDEX)
+        cursor.execute(POPULATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
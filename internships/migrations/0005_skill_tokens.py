@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:59
+
+import re
+
+from django.db import migrations, models
+
+# A copy of the tokenizer as it was when this migration was written (see accounts.skills)
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'of', 'on', 'or',
+    'the', 'to', 'with', 'background', 'familiar', 'knowledge', 'student', 'students', 'skills',
+    'dan', 'atau', 'di', 'ke', 'dari', 'yang', 'untuk', 'dengan', 'mahasiswa',
+}
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize_skills(text):
+    return sorted({token for token in TOKEN_RE.findall((text or '').lower()) if token not in STOPWORDS})
+
+
+def populate_skill_tokens(apps, schema_editor):
+    JobPosting = apps.get_model('internships', 'JobPosting')
+    rows = list(JobPosting.objects.only('id', 'requirements'))
+    for row in rows:
+        row.skill_tokens = tokenize_skills(row.requirements)
+    JobPosting.objects.bulk_update(rows, ['skill_tokens'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0004_jobposting_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='skill_tokens',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Tokenized requirements (auto-generated)'),
+        ),
+        migrations.RunPython(populate_skill_tokens, migrations.RunPython.noop),
+    ]
@@ -35,6 +35,12 @@ class Company(models.Model):
         return self.name
 
 
+class JobPostingQuerySet(models.QuerySet):
+    def open(self):
+        """Open postings, newest first, with the company joined for listings"""
+        return self.filter(status='OPEN').select_related('company').order_by('-created_at', '-id')
+
+
 class JobPosting(models.Model):
     """Internship job postings"""
 
@@ -54,6 +60,7 @@ class JobPosting(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     requirements = models.TextField()
+    skill_tokens = models.JSONField(default=list, blank=True, editable=False, help_text="Tokenized requirements (auto-generated)")
     benefits = models.TextField(blank=True)
     work_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='ONSITE')
     location = models.CharField(max_length=255)
@@ -65,10 +72,15 @@ class JobPosting(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = JobPostingQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Job Posting'
         verbose_name_plural = 'Job Postings'
+        indexes = [
+            models.Index(fields=['status', '-created_at', '-id'], name='jobposting_open_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company.name}"
@@ -101,6 +113,9 @@ class Application(models.Model):
     class Meta:
         ordering = ['-applied_at']
         unique_together = ['student', 'job_posting']  # One application per student per job
+        indexes = [
+            models.Index(fields=['student', '-applied_at'], name='app_student_applied_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.full_name} → {self.job_posting.title}"
@@ -165,6 +180,10 @@ class InternshipPlacement(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Internship Placement'
         verbose_name_plural = 'Internship Placements'
+        indexes = [
+            models.Index(fields=['student', 'status'], name='placement_student_status_idx'),
+            models.Index(fields=['supervisor', 'status'], name='placement_sup_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.full_name} at {self.company_name}"
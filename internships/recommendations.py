@@ -0,0 +1,132 @@
+import hashlib
+import threading
+
+import numpy as np
+from scipy import sparse
+from django.core.cache import cache
+
+from .cache import get_job_board_version
+
+TOP_K = 20
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class JobMatrix:
+    """TF-IDF matrix of open postings: one L2-normalised row per posting, one column per token
+
+    Sparse (CSR, float32): a posting mentions a handful of tokens out of a
+    free-text vocabulary that grows with the board, so memory follows the
+    number of (posting, token) pairs rather than postings x vocabulary. Scoring
+    a batch is one sparse x sparse product that only touches postings sharing
+    a token with some student.
+    """
+
+    def __init__(self, rows):
+        self.job_ids = np.array([job_id for job_id, _ in rows], dtype=np.int64)
+        self.vocabulary = {}
+        for _, tokens in rows:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        presence = self._presence([tokens for _, tokens in rows])
+        document_frequency = np.bincount(presence.indices, minlength=len(self.vocabulary))
+        idf = (np.log((1 + len(rows)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.idf = sparse.diags(idf, format='csr')
+        self.matrix = _normalise(presence @ self.idf)
+
+    def _presence(self, token_lists):
+        """0/1 CSR matrix with a row per token list, ignoring tokens outside the vocabulary"""
+        indptr, indices = [0], []
+        for tokens in token_lists:
+            indices.extend(sorted({self.vocabulary[token] for token in tokens if token in self.vocabulary}))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(token_lists), len(self.vocabulary)))
+
+    def score_many(self, token_lists, k=TOP_K):
+        """Top-k (job_id, cosine similarity) pairs per token list, from one sparse matrix product"""
+        if not len(self.job_ids) or not token_lists:
+            return [[] for _ in token_lists]
+
+        queries = _normalise(self._presence(token_lists) @ self.idf)
+        scores = (queries @ self.matrix.T).tocsr()
+
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            columns, row_scores = scores.indices[start:end], scores.data[start:end]
+            if len(row_scores) > k:
+                # Top k without sorting every matching posting
+                top = np.argpartition(-row_scores, k - 1)[:k]
+                columns, row_scores = columns[top], row_scores[top]
+            # Best score first; ties in posting order, so results do not depend on the partition
+            order = np.lexsort((columns, -row_scores))
+            results.append([
+                (int(self.job_ids[column]), float(score))
+                for column, score in zip(columns[order], row_scores[order]) if score > 0
+            ])
+        return results
+
+
+def _normalise(matrix):
+    """Scale each row of a CSR matrix to unit length; empty rows stay empty"""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags((1 / norms).astype(np.float32)) @ matrix).tocsr()
+
+
+# The matrix for the current job board version, kept in memory by each process
+_matrix = (None, None)
+_matrix_lock = threading.Lock()
+
+
+def get_job_matrix():
+    """The job matrix for the current job board, rebuilt only when postings change"""
+    from .models import JobPosting
+
+    global _matrix
+    version = get_job_board_version()
+    with _matrix_lock:
+        if _matrix[0] != version:
+            rows = list(JobPosting.objects.filter(status='OPEN').order_by('id').values_list('id', 'skill_tokens'))
+            _matrix = (version, JobMatrix(rows))
+        return _matrix[1]
+
+
+def _student_key(student, version):
+    digest = hashlib.md5(','.join(student.skill_tokens).encode()).hexdigest()
+    return f'recommendations:student:{student.pk}:{version}:{digest}'
+
+
+def recommend_for_students(students, k=TOP_K):
+    """Top-k (job_id, score) pairs for many students, reusing cached results
+
+    A student's entry is keyed by the job board version and a digest of
+    their skill tokens, so it is recomputed only when either changes. All
+    students missing from the cache are scored in one matrix product.
+    """
+    version = get_job_board_version()
+    keys = {student.pk: _student_key(student, version) for student in students}
+    cached = cache.get_many(keys.values())
+
+    results = {student.pk: cached[keys[student.pk]] for student in students if keys[student.pk] in cached}
+    missing = [student for student in students if student.pk not in results]
+    if missing:
+        scored = get_job_matrix().score_many([student.skill_tokens for student in missing], k)
+        for student, ranked in zip(missing, scored):
+            results[student.pk] = ranked
+        cache.set_many({keys[student.pk]: ranked for student, ranked in zip(missing, scored)}, CACHE_TIMEOUT)
+    return results
+
+
+def recommend_jobs(student, limit=5, exclude_ids=()):
+    """Recommended open postings for one student, best match first, as (job, score) pairs"""
+    from .models import JobPosting
+
+    exclude_ids = set(exclude_ids)
+    ranked = [
+        (job_id, score) for job_id, score in recommend_for_students([student])[student.pk]
+        if job_id not in exclude_ids
+    ][:limit]
+    jobs = JobPosting.objects.open().in_bulk([job_id for job_id, _ in ranked])
+    return [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
@@ -0,0 +1,209 @@
+import re
+
+from django.db import connection
+from django.db.models import Count, Q
+
+from .models import Company, JobPosting
+
+# Holds OPEN postings only. Created by migration 0004_jobposting_search_index and kept
+# in sync by the JobPosting/Company signals in internships.signals, so writes that skip
+# signals (QuerySet.update(), bulk_create(), raw SQL) leave it stale until
+# manage.py rebuild_job_index runs. SQLite only: other backends have no index and
+# JobSearch falls back to icontains filters.
+FTS_TABLE = 'internships_jobposting_fts'
+
+# bm25() column weights, in FTS column order: title, description, requirements, location, company_name
+BM25_WEIGHTS = (10.0, 1.0, 2.0, 3.0, 5.0)
+
+FACET_COLUMNS = {
+    'work_type': 'j.work_type',
+    'industry': 'c.industry',
+    'location': 'j.location',
+}
+FACET_FIELDS = {
+    'work_type': 'work_type',
+    'industry': 'company__industry',
+    'location': 'location',
+}
+LOCATION_FACET_LIMIT = 10
+
+_INDEX_SELECT = f'''
+    INSERT INTO {FTS_TABLE} (rowid, title, description, requirements, location, company_name)
+    SELECT j.id, j.title, j.description, j.requirements, j.location, c.name
+    FROM internships_jobposting j
+    JOIN internships_company c ON c.id = j.company_id
+    WHERE j.status = 'OPEN'
+'''
+
+
+def is_available():
+    """The FTS5 index only exists on SQLite; other backends fall back to icontains"""
+    return connection.vendor == 'sqlite'
+
+
+def populate_index(cursor):
+    cursor.execute(_INDEX_SELECT)
+
+
+def index_jobs(job_ids):
+    """Re-index the given postings; postings that are not OPEN are only removed"""
+    job_ids = list(job_ids)
+    if not job_ids or not is_available():
+        return
+    placeholders = ', '.join(['%s'] * len(job_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', job_ids)
+        cursor.execute(f'{_INDEX_SELECT} AND j.id IN ({placeholders})', job_ids)
+
+
+def remove_jobs(job_ids):
+    job_ids = list(job_ids)
+    if not job_ids or not is_available():
+        return
+    placeholders = ', '.join(['%s'] * len(job_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', job_ids)
+
+
+def rebuild_index():
+    """Repopulate the whole index with one INSERT ... SELECT; returns the number of rows indexed"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        populate_index(cursor)
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def build_match_query(query):
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix"""
+    terms = [f'"{term}"' for term in re.findall(r'\w+', query.lower())]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class JobSearch:
+    """Ranked, faceted search over open postings
+
+    Behaves like a sequence (``count()`` and slicing), so it can be handed
+    straight to ``django.core.paginator.Paginator``.
+    """
+
+    def __init__(self, query='', filters=None):
+        self.query = query.strip()
+        self.match = build_match_query(self.query)
+        self.filters = {facet: value for facet, value in (filters or {}).items() if facet in FACET_COLUMNS and value}
+        self.use_fts = bool(self.match) and is_available()
+        self._count = None
+
+    # Full-text path (SQLite FTS5)
+
+    def _sql(self, exclude=None):
+        """FROM/WHERE for the match plus every filter except ``exclude``
+
+        Only OPEN postings are in the index, so postings are joined only when a
+        facet filter or facet count needs their columns. CROSS JOIN pins the
+        join order; SQLite would otherwise scan postings and re-run the MATCH
+        for each one.
+        """
+        clauses = [f'{FTS_TABLE} MATCH %s']
+        params = [self.match]
+        for facet, value in self.filters.items():
+            if facet != exclude:
+                clauses.append(f'{FACET_COLUMNS[facet]} = %s')
+                params.append(value)
+
+        source = FTS_TABLE
+        if len(clauses) > 1 or exclude:
+            source = f'''{FTS_TABLE}
+                CROSS JOIN internships_jobposting j ON j.id = {FTS_TABLE}.rowid
+                CROSS JOIN internships_company c ON c.id = j.company_id'''
+        return f'FROM {source} WHERE {" AND ".join(clauses)}', params
+
+    # ORM path (no query text, or a backend without FTS5)
+
+    def _queryset(self, exclude=None):
+        queryset = JobPosting.objects.open()
+        if self.query and not self.use_fts:
+            for term in self.query.split():
+                queryset = queryset.filter(
+                    Q(title__icontains=term) | Q(description__icontains=term)
+                    | Q(requirements__icontains=term) | Q(location__icontains=term)
+                    | Q(company__name__icontains=term)
+                )
+        for facet, value in self.filters.items():
+            if facet != exclude:
+                queryset = queryset.filter(**{FACET_FIELDS[facet]: value})
+        return queryset
+
+    def count(self):
+        if self._count is None:
+            if self.use_fts:
+                sql, params = self._sql()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'SELECT COUNT(*) {sql}', params)
+                    self._count = cursor.fetchone()[0]
+            else:
+                self._count = self._queryset().count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        offset = key.start or 0
+        limit = (key.stop if key.stop is not None else self.count()) - offset
+
+        if not self.use_fts:
+            return list(self._queryset()[offset:offset + limit])
+
+        sql, params = self._sql()
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {FTS_TABLE}.rowid {sql} ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s OFFSET %s',
+                params + [limit, offset],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        jobs = JobPosting.objects.select_related('company').in_bulk(ids)
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+    def facets(self):
+        """Counts per work type, industry and location; each facet ignores its own filter"""
+        labels = {
+            'work_type': dict(JobPosting.TYPE_CHOICES),
+            'industry': dict(Company.INDUSTRY_CHOICES),
+            'location': {},
+        }
+        facets = {}
+        for facet in FACET_COLUMNS:
+            limit = LOCATION_FACET_LIMIT if facet == 'location' else None
+            if self.use_fts:
+                sql, params = self._sql(exclude=facet)
+                sql = (
+                    f'SELECT {FACET_COLUMNS[facet]}, COUNT(*) AS n {sql} '
+                    f'GROUP BY {FACET_COLUMNS[facet]} ORDER BY n DESC'
+                )
+                if limit:
+                    sql += f' LIMIT {limit}'
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    rows = cursor.fetchall()
+            else:
+                field = FACET_FIELDS[facet]
+                rows = self._queryset(exclude=facet).order_by().values_list(field).annotate(n=Count('id')).order_by('-n')
+                if limit:
+                    rows = rows[:limit]
+            facets[facet] = [
+                {
+                    'value': value,
+                    'label': labels[facet].get(value, value),
+                    'count': count,
+                    'selected': self.filters.get(facet) == value,
+                }
+                for value, count in rows
+            ]
+        return facets
@@ -0,0 +1,243 @@
+import calendar
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.credentials import queue_credentials
+from accounts.models import User, StudentProfile, SupervisorProfile
+from core.dashboard import record_changes, record_created, snapshot, update_counted
+from notifications.models import Notification
+from .models import InternshipPlacement
+
+# UTS is due at the end of the second month, UAS at the end of the placement
+UTS_MONTH = 2
+
+
+def add_months(day, months):
+    """Same day ``months`` later, clamped to the end of shorter months"""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def provision_supervisors(placements, batch_size=500):
+    """Link placements to supervisor accounts, creating missing ones from supervisor_email
+
+    Emails are matched case-insensitively. New accounts get an unusable
+    password (no hashing in the request path); credentials are issued
+    separately. Placements whose email belongs to a user that is not a
+    supervisor are left unlinked. Uses a fixed number of queries regardless
+    of how many placements are passed in. Returns the ids of the accounts
+    created and of the placements left unlinked.
+    """
+    result = {'created': [], 'conflicts': []}
+    pending = [placement for placement in placements if placement.supervisor_id is None]
+    if not pending:
+        return result
+
+    def email_of(placement):
+        return placement.supervisor_email.strip().lower()
+
+    emails = {email_of(placement) for placement in pending}
+    users = {
+        user.email.lower(): user
+        for user in User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails)
+        .select_related('supervisorprofile')
+    }
+
+    first_placement = {}
+    for placement in pending:
+        first_placement.setdefault(email_of(placement), placement)
+
+    new_users = User.objects.bulk_create(
+        [
+            User(email=email, role='SUPERVISOR', password=make_password(None), force_password_change=True)
+            for email in emails if email not in users
+        ],
+        batch_size=batch_size,
+    )
+    new_emails = {user.email for user in new_users}
+    users.update({user.email: user for user in new_users})
+
+    # Existing supervisor users without a profile get one too
+    new_profiles = []
+    for email, user in users.items():
+        if user.role != 'SUPERVISOR':
+            continue
+        if email in new_emails or not hasattr(user, 'supervisorprofile'):
+            placement = first_placement[email]
+            user.supervisorprofile = SupervisorProfile(
+                user=user,
+                full_name=placement.supervisor_name,
+                company_name=placement.company_name,
+                position=placement.supervisor_position,
+                whatsapp=placement.supervisor_whatsapp,
+            )
+            new_profiles.append(user.supervisorprofile)
+    SupervisorProfile.objects.bulk_create(new_profiles, batch_size=batch_size)
+
+    for placement in pending:
+        user = users[email_of(placement)]
+        if user.role == 'SUPERVISOR':
+            placement.supervisor = user.supervisorprofile
+        else:
+            result['conflicts'].append(placement.pk)
+
+    result['created'] = [user.pk for user in new_users]
+    return result
+
+
+def build_evaluations(placement):
+    """Unsaved UTS (month 2) and UAS (final month) evaluations for a placement"""
+    from evaluations.models import Evaluation
+
+    final_month = max(placement.get_duration_months(), UTS_MONTH)
+    return [
+        Evaluation(
+            placement=placement,
+            supervisor=placement.supervisor,
+            evaluation_type='UTS',
+            period_month=UTS_MONTH,
+            status='PENDING',
+            deadline=min(add_months(placement.start_date, UTS_MONTH), placement.end_date),
+        ),
+        Evaluation(
+            placement=placement,
+            supervisor=placement.supervisor,
+            evaluation_type='UAS',
+            period_month=final_month,
+            status='PENDING',
+            deadline=placement.end_date,
+        ),
+    ]
+
+
+def notify_students(user_ids, title, message, notification_type='SUCCESS', batch_size=1000):
+    """One batched placement notification per student user; returns how many were sent"""
+    link = reverse('student:dashboard')
+    Notification.send_bulk(
+        [
+            Notification(
+                recipient_id=user_id,
+                title=title,
+                message=message,
+                notification_type=notification_type,
+                category='PLACEMENT',
+                link=link,
+            )
+            for user_id in user_ids
+        ],
+        batch_size=batch_size,
+    )
+    return len(user_ids)
+
+
+def activate_placements(placement_ids, confirmed_by=None, notify=False, batch_size=500):
+    """Move placements to ACTIVE with everything that has to happen alongside
+
+    In one transaction: create missing supervisor accounts, mark placements
+    and their students ACTIVE, create the UTS/UAS evaluations and, with
+    ``notify``, tell the students. The number of queries does not depend on
+    the number of placements. Returns a summary dict.
+    """
+    from evaluations.models import Evaluation
+
+    now = timezone.now()
+    summary = {
+        'placements': 0, 'supervisors_created': 0, 'supervisor_conflicts': [], 'evaluations_created': 0,
+        'notifications': 0,
+    }
+    with transaction.atomic():
+        placements = list(
+            InternshipPlacement.objects.select_for_update()
+            .filter(pk__in=placement_ids)
+            .exclude(status__in=['ACTIVE', 'COMPLETED', 'TERMINATED'])
+        )
+        if not placements:
+            return summary
+
+        supervisors = provision_supervisors(placements, batch_size=batch_size)
+        summary['supervisors_created'] = len(supervisors['created'])
+        summary['supervisor_conflicts'] = supervisors['conflicts']
+
+        before = [snapshot(placement) for placement in placements]
+        for placement in placements:
+            placement.status = 'ACTIVE'
+            placement.confirmed_by = confirmed_by
+            placement.confirmed_at = now
+            placement.updated_at = now
+        InternshipPlacement.objects.bulk_update(
+            placements,
+            ['status', 'confirmed_by', 'confirmed_at', 'supervisor', 'updated_at'],
+            batch_size=batch_size,
+        )
+        record_changes(zip(before, map(snapshot, placements)))
+        summary['placements'] = len(placements)
+
+        student_ids = {placement.student_id for placement in placements}
+        update_counted(StudentProfile.objects.filter(pk__in=student_ids), status='ACTIVE', updated_at=now)
+
+        # The placements are locked, so no other request adds their evaluations meanwhile
+        existing = set(
+            Evaluation.objects.filter(placement__in=placements).values_list('placement_id', 'evaluation_type')
+        )
+        evaluations = [
+            evaluation
+            for placement in placements if placement.supervisor_id
+            for evaluation in build_evaluations(placement)
+            if (placement.pk, evaluation.evaluation_type) not in existing
+        ]
+        Evaluation.objects.bulk_create(evaluations, batch_size=batch_size)
+        record_created(evaluations)
+        summary['evaluations_created'] = len(evaluations)
+
+        # Login links go to the outbox and are sent by the send_emails worker
+        queue_credentials(supervisors['created'])
+
+        if notify:
+            user_ids = StudentProfile.objects.filter(pk__in=student_ids).values_list('user_id', flat=True)
+            summary['notifications'] = notify_students(
+                list(user_ids),
+                'Magang Dikonfirmasi',
+                'Penempatan magang Anda telah dikonfirmasi. Anda sudah bisa membuat laporan bulanan.',
+            )
+
+    return summary
+
+
+def complete_placements(placement_ids, notify=True, batch_size=1000):
+    """Mark ACTIVE placements and their students COMPLETED with two UPDATEs in one transaction"""
+    now = timezone.now()
+    summary = {'placements': 0, 'students': 0, 'notifications': 0}
+    with transaction.atomic():
+        rows = list(
+            InternshipPlacement.objects.select_for_update()
+            .filter(pk__in=placement_ids, status='ACTIVE')
+            .values_list('id', 'student_id', 'student__user_id')
+        )
+        if not rows:
+            return summary
+
+        summary['placements'] = update_counted(
+            InternshipPlacement.objects.filter(pk__in=[placement_id for placement_id, _, _ in rows]),
+            status='COMPLETED', updated_at=now,
+        )
+        summary['students'] = update_counted(
+            StudentProfile.objects.filter(pk__in={student_id for _, student_id, _ in rows}),
+            status='COMPLETED', updated_at=now,
+        )
+
+        if notify:
+            summary['notifications'] = notify_students(
+                list({user_id for _, _, user_id in rows}),
+                'Magang Selesai',
+                'Penempatan magang Anda telah ditandai selesai. Terima kasih atas partisipasi Anda.',
+                batch_size=batch_size,
+            )
+
+    return summary
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from accounts.models import StudentProfile
+from accounts.skills import tokenize_skills
+from core.cache import bump_student_pages
+from .models import Application, Company, JobPosting
+from .cache import bump_job_board_version
+from . import search
+
+
+@receiver(pre_save, sender=JobPosting)
+def tokenize_job_requirements(sender, instance, **kwargs):
+    instance.skill_tokens = tokenize_skills(instance.requirements)
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def job_board_changed(sender, **kwargs):
+    # On commit, or a request in between could cache the old postings under the new version
+    transaction.on_commit(bump_job_board_version)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def application_changed(sender, instance, **kwargs):
+    """Job detail shows the student's application"""
+    bump_student_pages(StudentProfile.objects.filter(pk=instance.student_id).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=JobPosting)
+def index_job_posting(sender, instance, **kwargs):
+    """Keep the full-text index in sync; non-OPEN postings drop out of it"""
+    search.index_jobs([instance.pk])
+
+
+@receiver(post_delete, sender=JobPosting)
+def unindex_job_posting(sender, instance, **kwargs):
+    search.remove_jobs([instance.pk])
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_postings(sender, instance, created, **kwargs):
+    """The company name is part of every posting's document"""
+    if not created:
+        search.index_jobs(instance.job_postings.values_list('id', flat=True))
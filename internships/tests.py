@@ -1,3 +1,183 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import SupervisorProfile, User
+from core.dashboard import get_dashboard, reconcile
+from core.testing import make_job, make_placement, make_student, make_supervisor
+from evaluations.models import Evaluation
+
+from .cache import get_job_board_version
+from .models import Company, InternshipPlacement, JobPosting
+from .recommendations import JobMatrix, recommend_jobs
+from .search import JobSearch
+from .services import activate_placements
+
+
+class JobSearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='PT Contoh', industry='TECH', address='Jakarta')
+
+    def titles(self, query):
+        return [job.title for job in JobSearch(query)[0:20]]
+
+    def test_saved_postings_are_indexed(self):
+        make_job(self.company, 'Data Analyst')
+        make_job(self.company, 'Backend Engineer')
+        self.assertEqual(self.titles('analyst'), ['Data Analyst'])
+        self.assertEqual(self.titles('anal'), ['Data Analyst'])
+
+    def test_closing_a_posting_removes_it(self):
+        job = make_job(self.company, 'Data Analyst')
+        job.status = 'CLOSED'
+        job.save()
+        self.assertEqual(self.titles('analyst'), [])
+
+    def test_company_rename_reindexes_postings(self):
+        make_job(self.company, 'Data Analyst')
+        self.company.name = 'Bank Nusantara'
+        self.company.save()
+        self.assertEqual(self.titles('nusantara'), ['Data Analyst'])
+
+    def test_rebuild_picks_up_updates_that_skip_signals(self):
+        make_job(self.company, 'Data Analyst')
+        JobPosting.objects.update(title='Product Designer')
+        self.assertEqual(self.titles('designer'), [])
+
+        call_command('rebuild_job_index', stdout=StringIO())
+        self.assertEqual(self.titles('designer'), ['Product Designer'])
+
+
+class JobMatrixTests(TestCase):
+    def test_scores_rank_by_cosine_similarity(self):
+        matrix = JobMatrix([(1, ['python', 'sql']), (2, ['excel', 'sql']), (3, ['design'])])
+        python, sql_excel, unknown = matrix.score_many([['python'], ['sql', 'excel'], ['cobol']])
+        self.assertEqual([job_id for job_id, _ in python], [1])
+        self.assertEqual([job_id for job_id, _ in sql_excel], [2, 1])
+        self.assertAlmostEqual(sql_excel[0][1], 1.0, places=5)
+        self.assertEqual(unknown, [])
+
+    def test_k_limits_results(self):
+        matrix = JobMatrix([(job_id, ['sql']) for job_id in range(10)])
+        self.assertEqual(len(matrix.score_many([['sql']], k=3)[0]), 3)
+
+    def test_empty_board(self):
+        self.assertEqual(JobMatrix([]).score_many([['sql']]), [[]])
+
+    def test_stores_only_the_tokens_each_posting_has(self):
+        matrix = JobMatrix([(1, ['python', 'sql', 'sql']), (2, ['excel']), (3, [])])
+        self.assertEqual(matrix.matrix.nnz, 3)
+        self.assertEqual(matrix.score_many([[]]), [[]])
+
+
+class JobBoardVersionTests(TestCase):
+    def test_changes_only_when_the_transaction_commits(self):
+        company = Company.objects.create(name='PT Contoh', industry='TECH', address='Jakarta')
+        version = get_job_board_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                make_job(company, 'Data Analyst')
+                company.name = 'Bank Nusantara'
+                company.save()
+                self.assertEqual(get_job_board_version(), version)
+            self.assertEqual(get_job_board_version(), version)
+        self.assertNotEqual(get_job_board_version(), version)
+
+
+class RecommendJobsTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name='PT Contoh', industry='TECH', address='Jakarta')
+        self.data = make_job(company, 'Data Analyst', requirements='Python, SQL, statistics')
+        self.design = make_job(company, 'Designer', requirements='Figma, illustration')
+
+    def test_skills_are_tokenized_on_save(self):
+        student = make_student('a@example.com', skills='Python and SQL')
+        self.assertEqual(student.skill_tokens, ['python', 'sql'])
+        self.assertEqual(self.data.skill_tokens, ['python', 'sql', 'statistics'])
+
+    def test_recommends_matching_jobs_and_skips_excluded(self):
+        student = make_student('a@example.com', skills='python, sql')
+        self.assertEqual([job for job, _ in recommend_jobs(student)], [self.data])
+        self.assertEqual(recommend_jobs(student, exclude_ids=[self.data.pk]), [])
+
+    def test_new_posting_shows_up(self):
+        student = make_student('a@example.com', skills='figma')
+        self.assertEqual([job for job, _ in recommend_jobs(student)], [self.design])
+        with self.captureOnCommitCallbacks(execute=True):
+            other = make_job(self.design.company, 'UI Designer', requirements='Figma')
+        self.assertEqual({job for job, _ in recommend_jobs(student)}, {self.design, other})
+
+
+class ActivatePlacementsTests(TestCase):
+    def test_supervisor_emails_match_case_insensitively(self):
+        first = make_placement(
+            make_student('a@student.prasetiyamulya.ac.id'), supervisor_email='Budi.Santoso@Contoh.co.id',
+        )
+        second = make_placement(
+            make_student('b@student.prasetiyamulya.ac.id'), supervisor_email='budi.santoso@contoh.co.id ',
+        )
+
+        summary = activate_placements([first.pk, second.pk])
+
+        self.assertEqual(summary['supervisors_created'], 1)
+        supervisor = SupervisorProfile.objects.get()
+        self.assertEqual(supervisor.user.email, 'budi.santoso@contoh.co.id')
+        self.assertEqual(
+            set(InternshipPlacement.objects.values_list('supervisor', flat=True)), {supervisor.pk},
+        )
+
+    def test_existing_supervisor_with_different_case_is_reused(self):
+        user = User.objects.create_user(email='Budi@contoh.co.id', role='SUPERVISOR')
+        placement = make_placement(
+            make_student('a@student.prasetiyamulya.ac.id'), supervisor_email='budi@contoh.co.id',
+        )
+
+        summary = activate_placements([placement.pk])
+
+        self.assertEqual(summary['supervisors_created'], 0)
+        self.assertEqual(User.objects.filter(role='SUPERVISOR').count(), 1)
+        placement.refresh_from_db()
+        self.assertEqual(placement.supervisor.user, user)
+
+    def test_email_of_non_supervisor_is_reported(self):
+        student = make_student('a@student.prasetiyamulya.ac.id')
+        placement = make_placement(student, supervisor_email=student.user.email)
+
+        summary = activate_placements([placement.pk])
+
+        self.assertEqual(summary['supervisor_conflicts'], [placement.pk])
+        self.assertEqual(summary['evaluations_created'], 0)
+        placement.refresh_from_db()
+        self.assertIsNone(placement.supervisor)
+
+    def test_evaluations_created_counts_inserted_rows(self):
+        supervisor = make_supervisor('budi@contoh.co.id')
+        placement = make_placement(make_student('a@student.prasetiyamulya.ac.id'), supervisor)
+        Evaluation.objects.create(
+            placement=placement, supervisor=supervisor, evaluation_type='UTS', period_month=2,
+            deadline=date(2026, 3, 5),
+        )
+
+        summary = activate_placements([placement.pk])
+
+        self.assertEqual(summary['evaluations_created'], 1)
+        self.assertEqual(Evaluation.objects.filter(placement=placement).count(), 2)
+
+    def test_dashboard_counts_follow_without_a_recount(self):
+        placements = [
+            make_placement(
+                make_student(f'{name}@student.prasetiyamulya.ac.id'), supervisor_email=f'{name}@contoh.co.id',
+            )
+            for name in ('a', 'b')
+        ]
+        activate_placements([placement.pk for placement in placements])
+
+        counts = get_dashboard()
+        self.assertEqual(counts['placement_status'], {'ACTIVE': 2})
+        self.assertEqual(counts['evaluation_status'], {'PENDING': 4})
+        reconcile()
+        self.assertEqual(get_dashboard(), counts)
@@ -1,10 +1,42 @@
+from django import forms
 from django.contrib import admin
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
-from .models import Notification
+from accounts.models import User, StudentProfile
+from .models import Notification, NotificationArchive, NotificationFanout, OutboundEmail
+from .cache import invalidate
+
+
+class BroadcastForm(forms.Form):
+    role = forms.ChoiceField(label='Penerima', choices=[('', 'Semua pengguna aktif')] + User.ROLE_CHOICES, required=False)
+    student_status = forms.ChoiceField(
+        label='Status mahasiswa', choices=[('', 'Semua')] + StudentProfile.STATUS_CHOICES, required=False,
+    )
+    angkatan = forms.CharField(label='Angkatan', max_length=4, required=False)
+    title = forms.CharField(max_length=255)
+    message = forms.CharField(widget=forms.Textarea)
+    notification_type = forms.ChoiceField(choices=Notification.TYPE_CHOICES, initial='INFO')
+    category = forms.ChoiceField(choices=Notification.CATEGORY_CHOICES, initial='SYSTEM')
+    link = forms.CharField(max_length=500, required=False)
+
+    def recipients(self):
+        """Queryset of the selected users (not evaluated)"""
+        data = self.cleaned_data
+        users = User.objects.filter(is_active=True)
+        if data['role']:
+            users = users.filter(role=data['role'])
+        if data['student_status']:
+            users = users.filter(studentprofile__status=data['student_status'])
+        if data['angkatan']:
+            users = users.filter(studentprofile__angkatan=data['angkatan'])
+        return users
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/notifications/notification/change_list.html'
     list_display = ['title', 'recipient', 'notification_type_badge', 'category', 'is_read', 'created_at']
     list_filter = ['notification_type', 'category', 'is_read', 'created_at']
     search_fields = ['title', 'message', 'recipient__email']
@@ -24,6 +56,40 @@ class NotificationAdmin(admin.ModelAdmin):
 
     readonly_fields = ['read_at', 'created_at']
 
+    def get_urls(self):
+        return [
+            path(
+                'broadcast/',
+                self.admin_site.admin_view(self.broadcast_view),
+                name='notifications_notification_broadcast',
+            ),
+        ] + super().get_urls()
+
+    def broadcast_view(self, request):
+        """Notify a whole group of users; the inserts run as a background job"""
+        form = BroadcastForm(request.POST or None)
+        if request.method == 'POST' and form.is_valid():
+            data = form.cleaned_data
+            job = Notification.fanout(
+                form.recipients(),
+                data['title'],
+                data['message'],
+                notification_type=data['notification_type'],
+                category=data['category'],
+                link=data['link'],
+                created_by=request.user,
+            )
+            self.message_user(request, f'Broadcast to {job.total} users started.')
+            return redirect(reverse('admin:notifications_notificationfanout_change', args=[job.pk]))
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Broadcast Notification',
+            'opts': self.model._meta,
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/notifications/notification/broadcast.html', context)
+
     def notification_type_badge(self, obj):
         colors = {
             'INFO': '#0d6efd',
@@ -43,14 +109,81 @@ class NotificationAdmin(admin.ModelAdmin):
 
     def mark_as_read(self, request, queryset):
         from django.utils import timezone
-        updated = queryset.filter(is_read=False).update(
+        queryset = queryset.filter(is_read=False)
+        recipient_ids = list(queryset.values_list('recipient_id', flat=True).distinct())
+        updated = queryset.update(
             is_read=True,
             read_at=timezone.now()
         )
+        invalidate(recipient_ids)
         self.message_user(request, f'{updated} notifications marked as read.')
     mark_as_read.short_description = 'Mark as read'
 
     def mark_as_unread(self, request, queryset):
+        recipient_ids = list(queryset.values_list('recipient_id', flat=True).distinct())
         updated = queryset.update(is_read=False, read_at=None)
+        invalidate(recipient_ids)
         self.message_user(request, f'{updated} notifications marked as unread.')
     mark_as_unread.short_description = 'Mark as unread'
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['title', 'recipient', 'category', 'reason', 'created_at', 'read_at', 'archived_at']
+    list_filter = ['reason', 'category', 'archived_at']
+    search_fields = ['title', 'recipient__email']
+    ordering = ['-archived_at']
+    change_list_template = 'admin/notifications/notificationarchive/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        from .retention import retention_stats
+        extra_context = {**(extra_context or {}), 'stats': retention_stats()}
+        return super().changelist_view(request, extra_context)
+
+
+@admin.register(NotificationFanout)
+class NotificationFanoutAdmin(admin.ModelAdmin):
+    list_display = ['title', 'category', 'status', 'progress_display', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'category', 'created_at']
+    search_fields = ['title', 'message']
+    ordering = ['-created_at']
+    fields = [
+        'title', 'message', 'notification_type', 'category', 'link', 'created_by',
+        'status', 'progress_display', 'total', 'sent', 'error', 'created_at', 'started_at', 'finished_at',
+    ]
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def progress_display(self, obj):
+        return f'{obj.progress}% ({obj.sent}/{obj.total})'
+    progress_display.short_description = 'Progress'
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'to_email', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['to_email', 'subject', 'dedup_key']
+    ordering = ['-created_at']
+    readonly_fields = ['attempts', 'claimed_at', 'last_error', 'created_at', 'sent_at']
+
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        from django.utils import timezone
+        updated = queryset.filter(status__in=['PENDING', 'FAILED']).update(
+            status='PENDING', attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} emails queued for the next send_emails run.')
+    retry_now.short_description = 'Retry now'
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_TIMEOUT = 60 * 60 * 24
+RECENT_LIMIT = 5
+
+
+def _unread_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _recent_key(user_id):
+    return f'notifications:recent:{user_id}'
+
+
+def get_unread_count(user):
+    """Return the unread notification count for a user, cached until invalidated"""
+    key = _unread_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        from .models import Notification
+        count = Notification.objects.filter(recipient=user, is_read=False).count()
+        cache.set(key, count, CACHE_TIMEOUT)
+    return count
+
+
+def get_recent_notifications(user):
+    """Return the latest notifications for a user, cached until invalidated"""
+    key = _recent_key(user.pk)
+    recent = cache.get(key)
+    if recent is None:
+        from .models import Notification
+        recent = list(
+            Notification.objects.filter(recipient=user).order_by('-created_at')[:RECENT_LIMIT]
+        )
+        cache.set(key, recent, CACHE_TIMEOUT)
+    return recent
+
+
+def invalidate(user_ids):
+    """Drop cached notification data for the given user ids
+
+    Deferred until the surrounding transaction commits, so a concurrent
+    request cannot re-cache the pre-commit state.
+    """
+    keys = []
+    for user_id in set(user_ids):
+        keys.append(_unread_key(user_id))
+        keys.append(_recent_key(user_id))
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+
+
+class Broker:
+    """In-process pub/sub waking the SSE streams of users who got new notifications
+
+    Subscribers are asyncio queues living on the server's event loop;
+    publishers may be any thread (sync views, fan-out jobs), so wake-ups go
+    through ``call_soon_threadsafe``. Only a wake-up is sent: the stream
+    reads the new rows itself, so a stream that missed wake-ups while its
+    queue was full still catches up. Publishers in other processes (other
+    server workers, management commands) are picked up by
+    notifications.sse.relay_notifications.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers[user_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers:
+                subscribers.difference_update({entry for entry in subscribers if entry[1] is queue})
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_ids):
+        with self._lock:
+            targets = [entry for user_id in set(user_ids) for entry in self._subscribers.get(user_id, ())]
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(_wake, queue)
+            except RuntimeError:
+                # The loop is closed (server shutting down)
+                pass
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def _wake(queue):
+    if queue.empty():
+        queue.put_nowait(True)
+
+
+broker = Broker()
+
+
+def publish(user_ids):
+    """Wake the given users' streams once the current transaction commits"""
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: broker.publish(user_ids))
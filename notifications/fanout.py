@@ -0,0 +1,100 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from accounts.models import User
+from .cache import invalidate
+from .events import publish
+from .models import Notification, NotificationFanout
+
+logger = logging.getLogger(__name__)
+
+
+def claim_job(job_id):
+    """Mark a job RUNNING for this worker; False if another worker holds it or it has finished
+
+    A RUNNING job whose progress has not moved for
+    NOTIFICATION_FANOUT_STALE_SECONDS is treated as abandoned and taken over.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.NOTIFICATION_FANOUT_STALE_SECONDS)
+    return bool(
+        NotificationFanout.objects.filter(pk=job_id)
+        .filter(Q(status='PENDING') | Q(status='RUNNING', updated_at__lt=stale))
+        .update(status='RUNNING', started_at=now, updated_at=now)
+    )
+
+
+def run_job(job_id, chunk_size=None):
+    """Insert a job's notifications chunk by chunk, recording progress after each chunk
+
+    The stored recipient ids are taken ``chunk_size`` at a time after the
+    cursor; each chunk's inserts and the cursor update share one
+    transaction, so a resumed job never notifies a user twice. Users
+    deleted since the job was created are skipped.
+    Returns the number of notifications this call inserted.
+    """
+    chunk_size = chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    if not claim_job(job_id):
+        return 0
+
+    job = NotificationFanout.objects.get(pk=job_id)
+    inserted = 0
+    try:
+        while True:
+            chunk = job.pending_recipient_ids(chunk_size)
+            if not chunk:
+                break
+            # Read outside the transaction so it opens with a write: on SQLite a read
+            # transaction that later writes fails at once if another connection is writing
+            user_ids = list(User.objects.filter(pk__in=chunk).order_by('pk').values_list('pk', flat=True))
+            with transaction.atomic():
+                Notification.objects.bulk_create(
+                    [
+                        Notification(
+                            recipient_id=user_id,
+                            title=job.title,
+                            message=job.message,
+                            notification_type=job.notification_type,
+                            category=job.category,
+                            link=job.link,
+                        )
+                        for user_id in user_ids
+                    ],
+                    batch_size=settings.NOTIFICATION_FANOUT_BATCH_SIZE,
+                )
+                invalidate(user_ids)
+                publish(user_ids)
+                job.last_recipient_id = chunk[-1]
+                NotificationFanout.objects.filter(pk=job.pk).update(
+                    sent=F('sent') + len(user_ids), last_recipient_id=job.last_recipient_id, updated_at=timezone.now(),
+                )
+                inserted += len(user_ids)
+    except Exception as e:
+        NotificationFanout.objects.filter(pk=job.pk).update(status='FAILED', error=f'{type(e).__name__}: {e}')
+        raise
+
+    NotificationFanout.objects.filter(pk=job.pk).update(status='DONE', finished_at=timezone.now())
+    return inserted
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    except Exception:
+        # The job is left FAILED with its cursor, so process_fanout_jobs --retry-failed can resume it
+        logger.exception('Notification fan-out job %s failed', job_id)
+    finally:
+        connection.close()
+
+
+def run_in_background(job_id):
+    """Run a job in a daemon thread once the current transaction commits"""
+    transaction.on_commit(
+        lambda: threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True).start()
+    )
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.retention import archive_expired, cap_unread, retention_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Move read notifications older than NOTIFICATION_RETENTION_DAYS, and unread ones beyond '
+        'NOTIFICATION_MAX_UNREAD per user, to the archive table. Works in short chunked transactions '
+        'with pauses in between, so it can run (e.g. nightly) while the site is in use.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+        parser.add_argument('--max-unread', type=int, default=settings.NOTIFICATION_MAX_UNREAD)
+        parser.add_argument('--chunk-size', type=int, default=settings.NOTIFICATION_ARCHIVE_CHUNK_SIZE)
+        parser.add_argument('--pause', type=float, default=settings.NOTIFICATION_ARCHIVE_PAUSE_SECONDS,
+                            help='Seconds to sleep between chunks')
+        parser.add_argument('--stats', action='store_true', help='Only print retention stats')
+
+    def handle(self, *args, **options):
+        if not options['stats']:
+            started = time.perf_counter()
+            expired = archive_expired(options['days'], options['chunk_size'], options['pause'])
+            overflow = cap_unread(options['max_unread'], options['chunk_size'], options['pause'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'Archived {expired} expired and {overflow} over-cap notifications in {elapsed:.2f}s'
+            ))
+
+        for key, value in retention_stats(options['days'], options['max_unread']).items():
+            self.stdout.write(f'{key}: {value}')
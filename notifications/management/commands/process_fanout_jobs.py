@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.fanout import run_job
+from notifications.models import NotificationFanout
+
+
+class Command(BaseCommand):
+    help = (
+        'Run notification broadcast jobs that are pending or whose background thread died, '
+        'resuming each from its last completed chunk.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also resume FAILED jobs')
+        parser.add_argument('--chunk-size', type=int, default=settings.NOTIFICATION_FANOUT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            NotificationFanout.objects.filter(status='FAILED').update(status='PENDING', error='')
+
+        stale = timezone.now() - timedelta(seconds=settings.NOTIFICATION_FANOUT_STALE_SECONDS)
+        job_ids = list(
+            NotificationFanout.objects.filter(Q(status='PENDING') | Q(status='RUNNING', updated_at__lt=stale))
+            .order_by('created_at').values_list('pk', flat=True)
+        )
+
+        started = time.perf_counter()
+        inserted = 0
+        for job_id in job_ids:
+            inserted += run_job(job_id, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {len(job_ids)} broadcast jobs, {inserted} notifications in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import drain
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued emails from the outbox in batches over one persistent SMTP connection, '
+        'rate limited, retrying failures with exponential backoff. Runs until stopped, or once with --once. '
+        'To test locally: python -m aiosmtpd -n -l localhost:1025, then run with EMAIL_HOST=localhost EMAIL_PORT=1025.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain what is due now and exit')
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument('--rate', type=float, default=settings.EMAIL_OUTBOX_RATE_PER_SECOND,
+                            help='Max emails per second (0 = unlimited)')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to wait when the outbox is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            summary = drain(batch_size=options['batch_size'], rate=options['rate'])
+            if summary['batches'] or options['once']:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {summary['sent']} emails ({summary['retried']} to retry, {summary['failed']} failed) "
+                    f"in {summary['batches']} batches, {elapsed:.2f}s"
+                ))
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_outbound_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationFanout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('notification_type', models.CharField(choices=[('INFO', 'Information'), ('WARNING', 'Warning'), ('SUCCESS', 'Success'), ('DANGER', 'Danger/Urgent')], default='INFO', max_length=20)),
+                ('category', models.CharField(choices=[('REGISTRATION', 'Registration Status'), ('APPLICATION', 'Application Status'), ('REPORT', 'Report Reminder/Status'), ('EVALUATION', 'Evaluation Reminder/Status'), ('PLACEMENT', 'Internship Placement'), ('AT_RISK', 'At Risk Alert'), ('SYSTEM', 'System Notification')], default='SYSTEM', max_length=30)),
+                ('link', models.CharField(blank=True, max_length=500)),
+                ('recipient_ids', models.JSONField(default=list, help_text='Sorted ids of the recipient users')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('last_recipient_id', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notification_fanouts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notification Broadcast',
+                'verbose_name_plural': 'Notification Broadcasts',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='fanout_status_updated_idx')],
+            },
+        ),
+    ]
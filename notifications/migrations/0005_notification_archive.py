@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_fanout'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_id', models.BigIntegerField(help_text='Primary key the notification had')),
+                ('notification_type', models.CharField(choices=[('INFO', 'Information'), ('WARNING', 'Warning'), ('SUCCESS', 'Success'), ('DANGER', 'Danger/Urgent')], max_length=20)),
+                ('category', models.CharField(choices=[('REGISTRATION', 'Registration Status'), ('APPLICATION', 'Application Status'), ('REPORT', 'Report Reminder/Status'), ('EVALUATION', 'Evaluation Reminder/Status'), ('PLACEMENT', 'Internship Placement'), ('AT_RISK', 'At Risk Alert'), ('SYSTEM', 'System Notification')], max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('reason', models.CharField(choices=[('EXPIRED', 'Read and past retention'), ('OVERFLOW', 'Over the unread cap')], max_length=10)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Notification',
+                'verbose_name_plural': 'Archived Notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
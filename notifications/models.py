@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from accounts.models import User
 
 
@@ -38,6 +39,10 @@ class Notification(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
+        indexes = [
+            models.Index(fields=['recipient', 'is_read'], name='notif_recipient_read_idx'),
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} → {self.recipient.email}"
@@ -52,7 +57,7 @@ class Notification(models.Model):
 
     @classmethod
     def send_to_user(cls, user, title, message, notification_type='INFO', category='SYSTEM', link=''):
-        """Helper method to create and send notification"""
+        """Helper method to create and send notification (cache is invalidated by post_save)"""
         return cls.objects.create(
             recipient=user,
             title=title,
@@ -62,9 +67,49 @@ class Notification(models.Model):
             link=link
         )
 
+    @classmethod
+    def send_bulk(cls, notifications, batch_size=1000):
+        """Insert prepared (unsaved) notifications in batches, refresh the recipients' badges and streams"""
+        created = cls.objects.bulk_create(notifications, batch_size=batch_size)
+
+        from .cache import invalidate
+        from .events import publish
+        recipient_ids = {notification.recipient_id for notification in created}
+        invalidate(recipient_ids)
+        publish(recipient_ids)
+        return created
+
+    @classmethod
+    def fanout(cls, recipients, title, message, notification_type='INFO', category='SYSTEM', link='',
+               created_by=None, background=True):
+        """Notify every user in the ``recipients`` queryset through a NotificationFanout job
+
+        Only the job row, with the recipients' ids, is written here. With
+        ``background`` the job runs in a thread once the surrounding
+        transaction commits (and process_fanout_jobs picks it up if that
+        thread dies); otherwise it runs before returning. Returns the job, whose progress is stored.
+        """
+        job = NotificationFanout.create_for(
+            recipients, title=title, message=message, notification_type=notification_type,
+            category=category, link=link, created_by=created_by,
+        )
+        from .fanout import run_job, run_in_background
+        if background:
+            run_in_background(job.pk)
+        else:
+            run_job(job.pk)
+            job.refresh_from_db()
+        return job
+
     @classmethod
     def send_to_multiple(cls, users, title, message, notification_type='INFO', category='SYSTEM', link=''):
-        """Send notification to multiple users"""
+        """Send notification to multiple users; returns how many were sent
+
+        A queryset of users is fanned out in chunks of ids (see ``fanout``);
+        a list is inserted directly.
+        """
+        if isinstance(users, models.QuerySet):
+            return cls.fanout(users, title, message, notification_type, category, link, background=False).sent
         notifications = [
             cls(
                 recipient=user,
@@ -76,4 +121,193 @@ class Notification(models.Model):
             )
             for user in users
         ]
-        return cls.objects.bulk_create(notifications)
+        # bulk_create skips post_save, so send_bulk drops the cached badges explicitly
+        return len(cls.send_bulk(notifications))
+
+
+class NotificationArchive(models.Model):
+    """Compact copy of a notification removed from the live table by the retention job"""
+
+    REASON_CHOICES = [
+        ('EXPIRED', 'Read and past retention'),
+        ('OVERFLOW', 'Over the unread cap'),
+    ]
+
+    notification_id = models.BigIntegerField(help_text="Primary key the notification had")
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    notification_type = models.CharField(max_length=20, choices=Notification.TYPE_CHOICES)
+    category = models.CharField(max_length=30, choices=Notification.CATEGORY_CHOICES)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    reason = models.CharField(max_length=10, choices=REASON_CHOICES)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Notification'
+        verbose_name_plural = 'Archived Notifications'
+
+    def __str__(self):
+        return f"{self.title} → {self.recipient_id}"
+
+
+class NotificationFanout(models.Model):
+    """One notification broadcast to a set of users, inserted chunk by chunk
+
+    The recipients' ids are stored, sorted, when the job is created and
+    walked in order; ``last_recipient_id`` is advanced in the same
+    transaction as each chunk's inserts, so an interrupted job resumes
+    without duplicates.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    notification_type = models.CharField(max_length=20, choices=Notification.TYPE_CHOICES, default='INFO')
+    category = models.CharField(max_length=30, choices=Notification.CATEGORY_CHOICES, default='SYSTEM')
+    link = models.CharField(max_length=500, blank=True)
+    recipient_ids = models.JSONField(default=list, help_text="Sorted ids of the recipient users")
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='notification_fanouts'
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    last_recipient_id = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Notification Broadcast'
+        verbose_name_plural = 'Notification Broadcasts'
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='fanout_status_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.sent}/{self.total})"
+
+    @classmethod
+    def create_for(cls, recipients, **fields):
+        """Save a job for a User queryset, snapshotting the recipients' ids with one query"""
+        recipient_ids = list(recipients.order_by('pk').values_list('pk', flat=True).distinct())
+        return cls.objects.create(recipient_ids=recipient_ids, total=len(recipient_ids), **fields)
+
+    def pending_recipient_ids(self, limit):
+        """The next ``limit`` recipient ids after ``last_recipient_id``"""
+        from bisect import bisect_right
+        start = bisect_right(self.recipient_ids, self.last_recipient_id)
+        return self.recipient_ids[start:start + limit]
+
+    @property
+    def progress(self):
+        """Percentage of recipients notified so far"""
+        return round(self.sent * 100 / self.total, 1) if self.total else 100.0
+
+
+class OutboundEmail(models.Model):
+    """Outbox row for one email, delivered by the send_emails worker
+
+    An email for ``login_user`` carries LOGIN_LINK in its body instead of a
+    one-time login link; the worker issues the token and fills in the link
+    when it sends the email, so no usable token is ever stored.
+    """
+
+    LOGIN_LINK = '[[login_link]]'
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True, help_text="Empty uses DEFAULT_FROM_EMAIL")
+    login_user = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name='+',
+        help_text="Gets a one-time login link in place of [[login_link]] when sent",
+    )
+    dedup_key = models.CharField(
+        max_length=255, unique=True, null=True, blank=True,
+        help_text="Enqueuing the same key twice sends one email",
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {self.to_email}"
+
+    @classmethod
+    def build(cls, to_email, subject, body, dedup_key=None, from_email='', login_user_id=None):
+        """Unsaved outbox row (for enqueue_bulk)"""
+        return cls(
+            to_email=to_email, subject=subject, body=body, dedup_key=dedup_key, from_email=from_email or '',
+            login_user_id=login_user_id,
+        )
+
+    @classmethod
+    def enqueue(cls, to_email, subject, body, dedup_key=None, from_email=''):
+        """Queue one email with a single INSERT; a repeated dedup_key is ignored"""
+        return cls.enqueue_bulk([cls.build(to_email, subject, body, dedup_key, from_email)])
+
+    @classmethod
+    def enqueue_bulk(cls, emails, batch_size=500):
+        """Queue prepared (unsaved) emails in batches, skipping dedup keys already queued
+
+        Known keys are filtered out up front instead of with INSERT OR
+        IGNORE, which would also hide unrelated constraint violations. If
+        another process queues one of the keys in between, the INSERT fails
+        and the filter runs once more. Returns the number of emails queued.
+        """
+        from django.db import IntegrityError, transaction
+
+        for attempt in range(2):
+            keys = {email.dedup_key for email in emails if email.dedup_key is not None}
+            seen = set(cls.objects.filter(dedup_key__in=keys).values_list('dedup_key', flat=True)) if keys else set()
+            new = []
+            for email in emails:
+                if email.dedup_key is not None:
+                    if email.dedup_key in seen:
+                        continue
+                    seen.add(email.dedup_key)
+                new.append(email)
+            try:
+                with transaction.atomic():
+                    cls.objects.bulk_create(new, batch_size=batch_size)
+            except IntegrityError:
+                if attempt:
+                    raise
+            else:
+                return len(new)
@@ -0,0 +1,130 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base, ... capped at EMAIL_OUTBOX_MAX_BACKOFF_SECONDS"""
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def claim_batch(batch_size):
+    """Claim up to ``batch_size`` due emails for this worker; returns the claimed rows
+
+    Rows left in SENDING by a worker that died are reclaimed after
+    EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS. The conditional UPDATE makes the
+    claim safe with several workers: each row goes to whichever UPDATE
+    matches it first, identified by its claimed_at stamp.
+    """
+    now = timezone.now()
+    due = (
+        Q(status='PENDING', next_attempt_at__lte=now)
+        | Q(status='SENDING', claimed_at__lt=now - timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS))
+    )
+    ids = list(
+        OutboundEmail.objects.filter(due).order_by('next_attempt_at', 'pk').values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    OutboundEmail.objects.filter(due, pk__in=ids).update(status='SENDING', claimed_at=now)
+    return list(OutboundEmail.objects.filter(pk__in=ids, status='SENDING', claimed_at=now).order_by('pk'))
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart (no limit when rate is 0)"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = 0
+
+    def wait(self):
+        if self.interval:
+            now = time.monotonic()
+            if now < self.next_at:
+                time.sleep(self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+
+
+def deliver_batch(emails, connection, limiter=None):
+    """Send claimed emails over an open connection and record the outcome of each
+
+    A failed send closes the connection (the next send reopens it) and
+    reschedules the email with exponential backoff, or marks it FAILED
+    after EMAIL_OUTBOX_MAX_ATTEMPTS. Login links are issued here, for the
+    whole batch; a link in an email that fails to send is never used and
+    expires. Returns ``(sent, retried, failed)``.
+    """
+    login_user_ids = {email.login_user_id for email in emails if email.login_user_id}
+    links = {}
+    if login_user_ids:
+        from accounts.credentials import issue_login_links
+        links = issue_login_links(login_user_ids)
+
+    sent_ids, retried, failed = [], [], []
+    for email in emails:
+        if limiter:
+            limiter.wait()
+        body = email.body
+        if email.login_user_id:
+            body = body.replace(OutboundEmail.LOGIN_LINK, links[email.login_user_id])
+        message = EmailMessage(
+            email.subject, body, email.from_email or None, [email.to_email], connection=connection,
+        )
+        try:
+            # No-op while the connection is up; reconnects after a failure closed it
+            connection.open()
+            message.send()
+        except Exception as e:
+            connection.close()
+            email.attempts += 1
+            email.last_error = f'{type(e).__name__}: {e}'[:2000]
+            email.claimed_at = None
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = 'FAILED'
+                failed.append(email)
+            else:
+                email.status = 'PENDING'
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                retried.append(email)
+        else:
+            sent_ids.append(email.pk)
+
+    if sent_ids:
+        OutboundEmail.objects.filter(pk__in=sent_ids).update(status='SENT', sent_at=timezone.now(), claimed_at=None)
+    if retried or failed:
+        OutboundEmail.objects.bulk_update(
+            retried + failed, ['status', 'attempts', 'last_error', 'claimed_at', 'next_attempt_at'],
+        )
+    return len(sent_ids), len(retried), len(failed)
+
+
+def drain(batch_size=None, rate=None, max_batches=None):
+    """Send due emails batch by batch over one persistent connection until none are due
+
+    Returns a summary dict with sent/retried/failed counts and batches.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    limiter = RateLimiter(settings.EMAIL_OUTBOX_RATE_PER_SECOND if rate is None else rate)
+    summary = {'batches': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+
+    connection = get_connection(fail_silently=False)
+    try:
+        while max_batches is None or summary['batches'] < max_batches:
+            emails = claim_batch(batch_size)
+            if not emails:
+                break
+            sent, retried, failed = deliver_batch(emails, connection, limiter)
+            summary['batches'] += 1
+            summary['sent'] += sent
+            summary['retried'] += retried
+            summary['failed'] += failed
+    finally:
+        connection.close()
+    return summary
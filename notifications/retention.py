@@ -0,0 +1,127 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import Notification, NotificationArchive
+
+ARCHIVED_FIELDS = ['id', 'recipient_id', 'notification_type', 'category', 'title', 'message', 'created_at', 'read_at']
+
+
+def _archive_chunk(rows, reason):
+    """Copy rows to the archive and delete them, in one short transaction"""
+    with transaction.atomic():
+        # Insert first so the transaction opens with a write (see notifications.fanout)
+        NotificationArchive.objects.bulk_create([
+            NotificationArchive(
+                notification_id=row['id'],
+                recipient_id=row['recipient_id'],
+                notification_type=row['notification_type'],
+                category=row['category'],
+                title=row['title'],
+                message=row['message'],
+                created_at=row['created_at'],
+                read_at=row['read_at'],
+                reason=reason,
+            )
+            for row in rows
+        ])
+        # Plain DELETE: QuerySet.delete() would load every row to send post_delete,
+        # whose per-row cache invalidation is done here for the whole chunk instead
+        ids = [row['id'] for row in rows]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Notification._meta.db_table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids
+            )
+        invalidate(row['recipient_id'] for row in rows)
+    return len(rows)
+
+
+def _archive(queryset, reason, chunk_size, pause, limit=None):
+    """Archive every row of ``queryset`` in chunks walked by primary key, pausing between chunks"""
+    archived, cursor = 0, 0
+    while limit is None or archived < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - archived)
+        rows = list(queryset.filter(pk__gt=cursor).order_by('pk').values(*ARCHIVED_FIELDS)[:size])
+        if not rows:
+            break
+        archived += _archive_chunk(rows, reason)
+        cursor = rows[-1]['id']
+        # Let other writers (requests saving sessions, new notifications) in between chunks
+        time.sleep(pause)
+    return archived
+
+
+def archive_expired(days=None, chunk_size=None, pause=None):
+    """Archive read notifications created more than ``days`` ago; returns how many"""
+    days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    return _archive(
+        Notification.objects.filter(is_read=True, created_at__lt=cutoff),
+        'EXPIRED',
+        chunk_size or settings.NOTIFICATION_ARCHIVE_CHUNK_SIZE,
+        settings.NOTIFICATION_ARCHIVE_PAUSE_SECONDS if pause is None else pause,
+    )
+
+
+def users_over_cap(max_unread=None):
+    """{user_id: unread count} for users with more than ``max_unread`` unread notifications"""
+    max_unread = settings.NOTIFICATION_MAX_UNREAD if max_unread is None else max_unread
+    return dict(
+        Notification.objects.filter(is_read=False)
+        .values('recipient').annotate(unread=Count('pk')).filter(unread__gt=max_unread)
+        .values_list('recipient', 'unread')
+    )
+
+
+def cap_unread(max_unread=None, chunk_size=None, pause=None):
+    """Archive each user's oldest unread notifications beyond the newest ``max_unread``; returns how many"""
+    max_unread = settings.NOTIFICATION_MAX_UNREAD if max_unread is None else max_unread
+    chunk_size = chunk_size or settings.NOTIFICATION_ARCHIVE_CHUNK_SIZE
+    pause = settings.NOTIFICATION_ARCHIVE_PAUSE_SECONDS if pause is None else pause
+
+    archived = 0
+    for user_id, unread in users_over_cap(max_unread).items():
+        # The oldest rows have the lowest ids, so walking by pk archives exactly the overflow
+        archived += _archive(
+            Notification.objects.filter(recipient_id=user_id, is_read=False),
+            'OVERFLOW', chunk_size, pause, limit=unread - max_unread,
+        )
+    return archived
+
+
+def retention_stats(days=None, max_unread=None):
+    """Sizes of the live and archive tables and what the next run would archive"""
+    days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+    max_unread = settings.NOTIFICATION_MAX_UNREAD if max_unread is None else max_unread
+    cutoff = timezone.now() - timedelta(days=days)
+
+    live = Notification.objects.aggregate(
+        total=Count('pk'),
+        unread=Count('pk', filter=Q(is_read=False)),
+        expired=Count('pk', filter=Q(is_read=True, created_at__lt=cutoff)),
+        oldest=Min('created_at'),
+    )
+    over_cap = users_over_cap(max_unread)
+    archive = NotificationArchive.objects.aggregate(
+        total=Count('pk'),
+        expired=Count('pk', filter=Q(reason='EXPIRED')),
+        overflow=Count('pk', filter=Q(reason='OVERFLOW')),
+    )
+    return {
+        'retention_days': days,
+        'max_unread': max_unread,
+        'live_total': live['total'],
+        'live_unread': live['unread'],
+        'live_oldest': live['oldest'],
+        'due_expired': live['expired'],
+        'users_over_cap': len(over_cap),
+        'due_overflow': sum(over_cap.values()) - max_unread * len(over_cap),
+        'archive_total': archive['total'],
+        'archive_expired': archive['expired'],
+        'archive_overflow': archive['overflow'],
+    }
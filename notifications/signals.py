@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Notification
+from .cache import invalidate
+from .events import publish
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_cache(sender, instance, **kwargs):
+    """Keep the cached badge and dropdown in sync with single-row writes"""
+    invalidate([instance.recipient_id])
+
+
+@receiver(post_save, sender=Notification)
+def publish_notification(sender, instance, created, **kwargs):
+    """Push single new notifications (send_to_user) to the recipient's open streams"""
+    if created:
+        publish([instance.recipient_id])
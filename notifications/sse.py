@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.db.models import Max
+from django.http import HttpRequest
+
+from .cache import get_unread_count
+from .events import broker
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+# Notifications sent per database read when a stream catches up
+STREAM_BATCH = 50
+
+
+def run_sync(func):
+    """``func`` as a coroutine function running on the event loop's shared thread pool
+
+    Database work never gets a thread per connection. Like Django around
+    each request, the pool thread's connection is closed before and after
+    the call when it is broken or past CONN_MAX_AGE.
+    """
+    def call(*args):
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False)
+
+
+def _authenticate(cookie_header):
+    """The user of the session in the Cookie header (AnonymousUser if none), via Django's own checks"""
+    cookies = SimpleCookie()
+    cookies.load(cookie_header)
+    morsel = cookies.get(settings.SESSION_COOKIE_NAME)
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(morsel.value if morsel else None)
+    return get_user(request)
+
+
+def _latest_id(user_id=None):
+    notifications = Notification.objects.all() if user_id is None else Notification.objects.filter(recipient_id=user_id)
+    return notifications.aggregate(latest=Max('id'))['latest'] or 0
+
+
+def _recipients_since(after_id):
+    """Users with notifications newer than ``after_id``, and the newest id seen"""
+    rows = list(
+        Notification.objects.filter(id__gt=after_id).order_by()
+        .values_list('recipient_id').annotate(latest=Max('id'))
+    )
+    return [user_id for user_id, _ in rows], max((latest for _, latest in rows), default=after_id)
+
+
+async def relay_notifications(interval):
+    """Wake this process's streams for notifications created by any process
+
+    The broker only sees publishes from its own process; with several
+    server processes (and management commands) one cheap query per
+    ``interval`` on the primary key finds the other recipients. Runs for
+    the lifetime of the process, one per event loop.
+    """
+    last_id = await run_sync(_latest_id)()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if broker.connection_count():
+                user_ids, last_id = await run_sync(_recipients_since)(last_id)
+                broker.publish(user_ids)
+            else:
+                last_id = await run_sync(_latest_id)()
+        except Exception:
+            logger.exception('Notification relay failed; retrying')
+
+
+_relays = {}
+
+
+def ensure_relay():
+    """Start relay_notifications on the running event loop unless it already runs there"""
+    loop = asyncio.get_running_loop()
+    task = _relays.get(loop)
+    if task is None or task.done():
+        _relays[loop] = loop.create_task(relay_notifications(settings.SSE_RELAY_SECONDS))
+
+
+def _new_notifications(user, after_id):
+    """Notifications newer than ``after_id`` (oldest first) and the unread count"""
+    rows = list(
+        Notification.objects.filter(recipient_id=user.pk, id__gt=after_id)
+        .order_by('id')
+        .values('id', 'title', 'message', 'link', 'notification_type', 'created_at')[:STREAM_BATCH]
+    )
+    return rows, get_unread_count(user) if rows else None
+
+
+def _payload(row):
+    return {**row, 'created_at': row['created_at'].isoformat()}
+
+
+def _event(name, data, event_id):
+    return f'id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n'
+
+
+async def event_stream(user, last_id, cookie_header=''):
+    """SSE messages for one connection: new notifications, unread counts and heartbeats
+
+    An idle connection costs a queue and a sleeping coroutine; the database
+    is read only when a publish wakes the stream, or every
+    SSE_RESYNC_SECONDS as a fallback. On that same timer the session is
+    checked again, and the stream ends once it no longer belongs to
+    ``user`` (logout, expiry, password change).
+    """
+    queue = broker.subscribe(user.pk)
+    try:
+        if last_id is None:
+            last_id = await run_sync(_latest_id)(user.pk)
+        yield f'retry: {settings.SSE_RETRY_MILLISECONDS}\n\n'
+
+        loop = asyncio.get_running_loop()
+        next_resync = loop.time() + settings.SSE_RESYNC_SECONDS
+        check = True
+        while True:
+            if loop.time() >= next_resync:
+                current = await run_sync(_authenticate)(cookie_header)
+                if current.pk != user.pk:
+                    return
+                next_resync = loop.time() + settings.SSE_RESYNC_SECONDS
+                check = True
+            if check:
+                rows, unread_count = await run_sync(_new_notifications)(user, last_id)
+                for row in rows:
+                    last_id = row['id']
+                    yield _event('notification', _payload(row), last_id)
+                if rows:
+                    yield _event('unread', {'unread_count': unread_count}, last_id)
+                if len(rows) == STREAM_BATCH:
+                    continue
+            try:
+                timeout = min(settings.SSE_HEARTBEAT_SECONDS, max(next_resync - loop.time(), 0))
+                await asyncio.wait_for(queue.get(), timeout=timeout)
+                check = True
+            except asyncio.TimeoutError:
+                check = False
+                if loop.time() < next_resync:
+                    yield ': ping\n\n'
+    finally:
+        broker.unsubscribe(user.pk, queue)
+
+
+async def _send_stream(send, user, last_id, cookie_header):
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    async for message in event_stream(user, last_id, cookie_header):
+        await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream_app(scope, receive, send):
+    """Bare ASGI app for the notification stream, bypassing Django's (sync) middleware
+
+    Going through the middleware stack would hold a thread, a database
+    connection and a session write per open stream; here authentication is
+    one session read (repeated every SSE_RESYNC_SECONDS) and the connection
+    then only holds a coroutine. Reconnects resume after Last-Event-ID.
+    """
+    ensure_relay()
+    headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+    cookie_header = headers.get('cookie', '')
+    user = await run_sync(_authenticate)(cookie_header)
+    if not user.is_authenticated:
+        # 204 tells EventSource to stop reconnecting
+        await send({'type': 'http.response.start', 'status': 204, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    last_id = headers.get('last-event-id', '')
+    last_id = int(last_id) if last_id.isdigit() else None
+
+    sender = asyncio.ensure_future(_send_stream(send, user, last_id, cookie_header))
+    watcher = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        await asyncio.wait([sender, watcher], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (sender, watcher):
+            task.cancel()
+        await asyncio.gather(sender, watcher, return_exceptions=True)
+    if not sender.cancelled() and sender.exception():
+        raise sender.exception()
+
+
+def route_stream(django_app, path):
+    """ASGI app sending HTTP requests for ``path`` to stream_app and everything else to Django"""
+    async def application(scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == path:
+            return await stream_app(scope, receive, send)
+        return await django_app(scope, receive, send)
+    return application
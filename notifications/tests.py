@@ -1,3 +1,159 @@
-from django.test import TestCase
+import asyncio
+import re
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core import mail
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from accounts.credentials import queue_credentials
+from accounts.models import LoginToken, SupervisorProfile, User
+
+from .fanout import run_job
+from .models import Notification, NotificationFanout, OutboundEmail
+from .outbox import claim_batch, deliver_batch, drain
+from .sse import _recipients_since, event_stream
+
+
+class FailingConnection:
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP down')
+
+
+@override_settings(EMAIL_OUTBOX_RATE_PER_SECOND=0)
+class OutboxTests(TestCase):
+    def test_enqueue_bulk_counts_only_new_dedup_keys(self):
+        OutboundEmail.enqueue('a@contoh.co.id', 'Halo', 'Isi', dedup_key='reminder:1')
+        queued = OutboundEmail.enqueue_bulk([
+            OutboundEmail.build('a@contoh.co.id', 'Halo', 'Isi', dedup_key='reminder:1'),
+            OutboundEmail.build('b@contoh.co.id', 'Halo', 'Isi', dedup_key='reminder:2'),
+            OutboundEmail.build('b@contoh.co.id', 'Halo', 'Isi', dedup_key='reminder:2'),
+            OutboundEmail.build('c@contoh.co.id', 'Halo', 'Isi'),
+        ])
+        self.assertEqual(queued, 2)
+        self.assertEqual(OutboundEmail.objects.count(), 3)
+
+    def test_drain_sends_due_emails_once(self):
+        OutboundEmail.enqueue('a@contoh.co.id', 'Halo', 'Isi')
+        summary = drain()
+        self.assertEqual((summary['sent'], summary['failed']), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboundEmail.objects.get().status, 'SENT')
+        self.assertEqual(drain()['sent'], 0)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failed_sends_back_off_then_fail(self):
+        OutboundEmail.enqueue('a@contoh.co.id', 'Halo', 'Isi')
+
+        self.assertEqual(deliver_batch(claim_batch(10), FailingConnection()), (0, 1, 0))
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ('PENDING', 1))
+        self.assertIn('SMTP down', email.last_error)
+        self.assertEqual(claim_batch(10), [])
+
+        OutboundEmail.objects.update(next_attempt_at=email.created_at)
+        self.assertEqual(deliver_batch(claim_batch(10), FailingConnection()), (0, 0, 1))
+        self.assertEqual(OutboundEmail.objects.get().status, 'FAILED')
+
+    def test_credentials_emails_store_no_token(self):
+        user = User.objects.create_user(email='budi@contoh.co.id', role='SUPERVISOR')
+        SupervisorProfile.objects.create(
+            user=user, full_name='Budi', company_name='PT Contoh', position='Manager', whatsapp='0812',
+        )
+        self.assertEqual(queue_credentials([user.pk]), 1)
+
+        queued = OutboundEmail.objects.get()
+        self.assertIn(OutboundEmail.LOGIN_LINK, queued.body)
+        self.assertFalse(LoginToken.objects.exists())
+
+        drain()
+        token = re.search(r'/login/token/([^/]+)/', mail.outbox[0].body).group(1)
+        self.assertEqual(LoginToken.redeem(token), user)
+        self.assertNotIn(token, OutboundEmail.objects.get().body)
+
+
+class FanoutTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(email=f'u{i}@contoh.co.id', role='SUPERVISOR') for i in range(5)]
+
+    def test_notifies_every_recipient_once(self):
+        job = Notification.fanout(User.objects.filter(role='SUPERVISOR'), 'Halo', 'Isi', background=False)
+        self.assertEqual((job.status, job.total, job.sent), ('DONE', 5, 5))
+        self.assertEqual(
+            sorted(Notification.objects.values_list('recipient_id', flat=True)), [user.pk for user in self.users],
+        )
+
+    def test_recipients_are_fixed_when_the_job_is_created(self):
+        job = NotificationFanout.create_for(User.objects.filter(role='SUPERVISOR'), title='Halo', message='Isi')
+        User.objects.create_user(email='late@contoh.co.id', role='SUPERVISOR')
+        self.users[0].delete()
+
+        self.assertEqual(run_job(job.pk, chunk_size=2), 4)
+        self.assertEqual(set(Notification.objects.values_list('recipient_id', flat=True)),
+                         {user.pk for user in self.users[1:]})
+
+    def test_interrupted_job_resumes_after_its_cursor(self):
+        job = NotificationFanout.create_for(User.objects.filter(role='SUPERVISOR'), title='Halo', message='Isi')
+        NotificationFanout.objects.filter(pk=job.pk).update(last_recipient_id=self.users[1].pk, sent=2)
+
+        self.assertEqual(run_job(job.pk, chunk_size=2), 3)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.sent), ('DONE', 5))
+        self.assertEqual(run_job(job.pk), 0)
+
+    def test_send_to_multiple_returns_the_count(self):
+        self.assertEqual(Notification.send_to_multiple(self.users[:2], 'Halo', 'Isi'), 2)
+        self.assertEqual(Notification.send_to_multiple(User.objects.filter(pk=self.users[4].pk), 'Halo', 'Isi'), 1)
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.db',
+    SSE_RESYNC_SECONDS=0.05,
+    SSE_HEARTBEAT_SECONDS=0.05,
+)
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='budi@contoh.co.id', role='SUPERVISOR')
+        self.client.force_login(self.user)
+        self.cookie = f'{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    def read(self, count):
+        """The first ``count`` messages of a stream, or fewer if it ends"""
+        async def collect():
+            messages = []
+            stream = event_stream(self.user, 0, self.cookie)
+            try:
+                async for message in stream:
+                    messages.append(message)
+                    if len(messages) == count:
+                        break
+            finally:
+                await stream.aclose()
+            return messages
+        return async_to_sync(asyncio.wait_for)(collect(), timeout=5)
+
+    def test_streams_new_notifications(self):
+        Notification.send_to_user(self.user, 'Halo', 'Isi')
+        messages = self.read(3)
+        self.assertTrue(messages[0].startswith('retry:'))
+        self.assertIn('event: notification', messages[1])
+        self.assertIn('"unread_count": 1', messages[2])
+
+    def test_stream_ends_when_the_session_is_gone(self):
+        self.client.logout()
+        messages = self.read(10)
+        self.assertLess(len(messages), 10)
+        self.assertTrue(all('notification' not in message for message in messages))
+
+    def test_relay_finds_recipients_of_new_notifications(self):
+        other = User.objects.create_user(email='sari@contoh.co.id', role='SUPERVISOR')
+        Notification.send_to_multiple([self.user, other], 'Halo', 'Isi')
+        user_ids, latest = _recipients_since(0)
+        self.assertEqual(sorted(user_ids), sorted([self.user.pk, other.pk]))
+        self.assertEqual(_recipients_since(latest), ([], latest))
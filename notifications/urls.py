@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'notifications'
+
+urlpatterns = [
+    path('recent/', views.recent, name='recent'),
+    path('stream/', views.stream, name='stream'),
+]
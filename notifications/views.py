@@ -0,0 +1,34 @@
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, JsonResponse
+from .cache import get_unread_count, get_recent_notifications
+
+
+@login_required
+def recent(request):
+    """Recent notifications as JSON, fetched when the navbar dropdown opens"""
+    notifications = [
+        {
+            'id': notification.id,
+            'title': notification.title,
+            'link': notification.link,
+            'notification_type': notification.notification_type,
+            'is_read': notification.is_read,
+            'created_at': notification.created_at.isoformat(),
+        }
+        for notification in get_recent_notifications(request.user)
+    ]
+    return JsonResponse({
+        'unread_count': get_unread_count(request.user),
+        'notifications': notifications,
+    })
+
+
+def stream(request):
+    """Fallback for the notification stream when not served by the ASGI app
+
+    Under ASGI, coop_prasetiya_mulya.asgi routes this path to
+    notifications.sse before Django's middleware. Anything reaching this
+    view (WSGI, e.g. runserver) gets 204, which tells EventSource not to
+    reconnect; the badge rendered with the page is used instead.
+    """
+    return HttpResponse(status=204)
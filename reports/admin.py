@@ -1,3 +1,5 @@
+import time
+
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import MonthlyReport, ReportFeedback
@@ -65,25 +67,38 @@ class MonthlyReportAdmin(admin.ModelAdmin):
         )
     status_badge.short_description = 'Status'
 
-    actions = ['mark_reviewed', 'request_revision']
+    actions = ['mark_reviewed', 'request_revision', 'export_csv']
 
     def mark_reviewed(self, request, queryset):
-        from django.utils import timezone
-        updated = 0
-        for report in queryset.filter(status='SUBMITTED'):
-            report.status = 'REVIEWED'
-            report.reviewed_by = request.user
-            report.reviewed_at = timezone.now()
-            report.save()
-            updated += 1
-        self.message_user(request, f'{updated} reports marked as reviewed.')
+        from .services import mark_reports_reviewed
+        started = time.perf_counter()
+        summary = mark_reports_reviewed(
+            queryset.filter(status='SUBMITTED').values_list('pk', flat=True),
+            reviewed_by=request.user,
+        )
+        self.message_user(
+            request,
+            f"{summary['reports']} reports marked as reviewed, "
+            f"{summary['notifications']} notifications sent in {time.perf_counter() - started:.2f}s."
+        )
     mark_reviewed.short_description = 'Mark as reviewed'
 
     def request_revision(self, request, queryset):
-        updated = queryset.filter(status='SUBMITTED').update(status='REVISION_REQUESTED')
-        self.message_user(request, f'{updated} reports need revision.')
+        from .services import request_revisions
+        started = time.perf_counter()
+        summary = request_revisions(queryset.filter(status='SUBMITTED').values_list('pk', flat=True))
+        self.message_user(
+            request,
+            f"{summary['reports']} reports need revision, {summary['emails']} emails queued "
+            f"in {time.perf_counter() - started:.2f}s."
+        )
     request_revision.short_description = 'Request revision'
 
+    def export_csv(self, request, queryset):
+        from core.exports import csv_response
+        return csv_response('reports', queryset)
+    export_csv.short_description = 'Export CSV'
+
 
 @admin.register(ReportFeedback)
 class ReportFeedbackAdmin(admin.ModelAdmin):
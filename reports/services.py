@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from notifications.models import Notification, OutboundEmail
+from .models import MonthlyReport
+
+
+def mark_reports_reviewed(report_ids, reviewed_by, notify=True, batch_size=1000):
+    """Mark SUBMITTED reports REVIEWED with one UPDATE and notify the students in one batch"""
+    now = timezone.now()
+    summary = {'reports': 0, 'notifications': 0}
+    with transaction.atomic():
+        rows = list(
+            MonthlyReport.objects.select_for_update()
+            .filter(pk__in=report_ids, status='SUBMITTED')
+            .values_list('id', 'month', 'year', 'placement__student__user_id')
+        )
+        if not rows:
+            return summary
+
+        summary['reports'] = MonthlyReport.objects.filter(
+            pk__in=[row[0] for row in rows]
+        ).update(status='REVIEWED', reviewed_by=reviewed_by, reviewed_at=now, updated_at=now)
+
+        if notify:
+            month_labels = dict(MonthlyReport.MONTH_CHOICES)
+            created = Notification.send_bulk(
+                [
+                    Notification(
+                        recipient_id=user_id,
+                        title='Laporan Telah Direview',
+                        message=f'Laporan {month_labels.get(month, month)} {year} Anda telah direview.',
+                        notification_type='SUCCESS',
+                        category='REPORT',
+                        link=reverse('reports:view_report', args=[report_id]),
+                    )
+                    for report_id, month, year, user_id in rows
+                ],
+                batch_size=batch_size,
+            )
+            summary['notifications'] = len(created)
+
+    return summary
+
+
+def request_revisions(report_ids, notify=True, batch_size=1000):
+    """Send SUBMITTED reports back for revision with one UPDATE, notifying and emailing the students"""
+    now = timezone.now()
+    summary = {'reports': 0, 'notifications': 0, 'emails': 0}
+    with transaction.atomic():
+        rows = list(
+            MonthlyReport.objects.select_for_update()
+            .filter(pk__in=report_ids, status='SUBMITTED')
+            .values_list('id', 'month', 'year', 'placement__student__user_id', 'placement__student__user__email')
+        )
+        if not rows:
+            return summary
+
+        summary['reports'] = MonthlyReport.objects.filter(
+            pk__in=[row[0] for row in rows]
+        ).update(status='REVISION_REQUESTED', updated_at=now)
+
+        if notify:
+            month_labels = dict(MonthlyReport.MONTH_CHOICES)
+            notifications, emails = [], []
+            for report_id, month, year, user_id, email in rows:
+                period = f'{month_labels.get(month, month)} {year}'
+                link = reverse('reports:view_report', args=[report_id])
+                notifications.append(Notification(
+                    recipient_id=user_id,
+                    title='Laporan Perlu Revisi',
+                    message=f'Laporan {period} Anda perlu direvisi. Silakan perbaiki dan submit ulang.',
+                    notification_type='WARNING',
+                    category='REPORT',
+                    link=link,
+                ))
+                emails.append(OutboundEmail.build(
+                    email,
+                    f'Laporan {period} Perlu Revisi',
+                    f'Laporan bulanan {period} Anda perlu direvisi. Silakan perbaiki dan submit ulang melalui:\n\n'
+                    f"{settings.SITE_URL.rstrip('/')}{link}\n",
+                    dedup_key=f'report-revision:{report_id}:{now:%Y%m%d%H%M%S}',
+                ))
+            summary['notifications'] = len(Notification.send_bulk(notifications, batch_size=batch_size))
+            summary['emails'] = OutboundEmail.enqueue_bulk(emails)
+
+    return summary